@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# Copyright 2025 NXP
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Benchmark of the package archive formats.
+
+Writes the same package content as zip, tar.zst and tar.xz with each
+compression preset through PackageCreator's archive backends, and reports
+archive size and time. The content is a real board package created with
+'west update_board ... -o package.zip' (extracted with its symbolic links), a
+directory, or a synthetic workspace from package_benchmark.py.
+
+Usage:
+  west update_board --set board frdmmcxw71 -o frdmmcxw71.zip --no-update
+  python scripts/benchmarks/archive_benchmark.py --package frdmmcxw71.zip
+  python scripts/benchmarks/archive_benchmark.py --source path/to/dir --presets balanced
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'west_commands'))
+
+from utilities import PackageCreator  # noqa: E402
+from utilities.archive_writer import check_archive_backend  # noqa: E402
+from utilities.compression_policy import COMPRESSION_PRESETS, CompressionPolicy  # noqa: E402
+
+FORMATS = {'zip': '.zip', 'tar.zst': '.tar.zst', 'tar.xz': '.tar.xz'}
+
+
+def extract_package(package_path: str, dest_dir: str) -> None:
+    """Extract a zip package, recreating its symbolic links."""
+    with zipfile.ZipFile(package_path) as zipf:
+        for info in zipf.infolist():
+            target = os.path.join(dest_dir, info.filename)
+            if (info.external_attr >> 16) & 0o170000 == 0o120000:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.symlink(zipf.read(info).decode('utf-8'), target)
+            else:
+                zipf.extract(info, dest_dir)
+
+
+def content_size(source_dir: str) -> tuple:
+    """Get the number of files and total bytes below a directory."""
+    files = 0
+    total = 0
+    for root, _, names in os.walk(source_dir):
+        for name in names:
+            path = os.path.join(root, name)
+            if not os.path.islink(path):
+                files += 1
+                total += os.path.getsize(path)
+    return files, total
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--package', help='Zip package created by west update_board')
+    source.add_argument('--source', help='Directory to archive')
+    source.add_argument('--synthetic', action='store_true',
+                        help='Archive a synthetic workspace generated by package_benchmark.py')
+    parser.add_argument('--formats', default=','.join(FORMATS),
+                        help=f'Comma separated formats (default: {",".join(FORMATS)})')
+    parser.add_argument('--presets', default=','.join(COMPRESSION_PRESETS),
+                        help=f'Comma separated compression presets (default: {",".join(COMPRESSION_PRESETS)})')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='archive_benchmark_')
+    try:
+        if args.package:
+            source_dir = os.path.join(work_dir, 'content')
+            extract_package(args.package, source_dir)
+        elif args.source:
+            source_dir = os.path.abspath(args.source)
+        else:
+            import package_benchmark
+            source_dir = os.path.join(work_dir, 'content')
+            package_benchmark.generate_workspace(source_dir, 100, 3000, 4096, random.Random(1))
+
+        files, total = content_size(source_dir)
+        print(f"Content: {files} files, {total / (1024 * 1024):.1f} MB ({source_dir})")
+        print(f"{'format':10s} {'preset':10s} {'seconds':>9s} {'size MB':>9s} {'ratio':>7s}")
+
+        for archive_format in args.formats.split(','):
+            output_path = os.path.join(work_dir, 'package' + FORMATS[archive_format])
+            try:
+                check_archive_backend(output_path)
+            except RuntimeError as e:
+                print(f"{archive_format:10s} skipped: {e}")
+                continue
+            for preset in args.presets.split(','):
+                creator = PackageCreator(source_dir)
+                creator._compression_policy = CompressionPolicy(preset)
+                start = time.perf_counter()
+                creator._create_archive(source_dir, output_path)
+                elapsed = time.perf_counter() - start
+                size = os.path.getsize(output_path)
+                print(f"{archive_format:10s} {preset:10s} {elapsed:9.2f} {size / (1024 * 1024):9.1f} "
+                      f"{size / max(total, 1):7.3f}")
+                os.remove(output_path)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
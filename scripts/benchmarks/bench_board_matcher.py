@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# Copyright 2025 NXP
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Benchmark for example.yml board key matching.
+
+Generates a synthetic corpus of example.yml files shaped like the SDK examples
+(board keys such as "board@core", boards sharing name prefixes) and compares the
+historical substring scan with the precompiled BoardKeyMatcher, both in memory
+and through PackageCreator's example.yml filter on disk.
+
+Usage:
+  python scripts/benchmarks/bench_board_matcher.py [--examples 5000] [--boards 100]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import yaml
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'west_commands'))
+
+from utilities import BoardKeyMatcher, PackageCreator  # noqa: E402
+
+
+CORES = ['', '@cm33', '@cm33_core0', '@cm33_core1', '@cm7', '@cm4', '@hifi4']
+BOARD_STEMS = ['frdmmcx', 'evkmimxrt', 'evkmimx8m', 'lpcxpresso', 'frdmke', 'kw4', 'mcxw7']
+
+
+def generate_boards(count: int, rng: random.Random) -> list:
+    """Generate board names, including names that are prefixes of other names."""
+    boards = set()
+    while len(boards) < count:
+        base = f"{rng.choice(BOARD_STEMS)}{rng.randint(1, 999)}"
+        boards.add(base)
+        if rng.random() < 0.15 and len(boards) < count:
+            boards.add(base + rng.choice(['ddr3l', 'pro', 'b', 'loc']))
+    return sorted(boards)
+
+
+def generate_corpus(example_count: int, boards: list, rng: random.Random) -> list:
+    """Generate example.yml contents as (example_name, data) tuples."""
+    corpus = []
+    for index in range(example_count):
+        name = f"example_{index}"
+        board_keys = {}
+        for board in rng.sample(boards, rng.randint(3, min(30, len(boards)))):
+            board_keys[f"{board}{rng.choice(CORES)}"] = ['+armgcc', '+iar', '+mdk']
+        corpus.append((name, {name: {'section-type': 'application', 'boards': board_keys}}))
+    return corpus
+
+
+def bench_in_memory(corpus: list, targets: list) -> None:
+    """Compare substring scan and compiled matcher over the in-memory corpus."""
+    start = time.perf_counter()
+    legacy_kept = 0
+    for name, data in corpus:
+        boards = data[name]['boards']
+        legacy_kept += sum(1 for key in boards if any(t in key for t in targets))
+    legacy_elapsed = time.perf_counter() - start
+
+    results = {}
+    for label, legacy in (('matcher exact', False), ('matcher substring', True)):
+        start = time.perf_counter()
+        matcher = BoardKeyMatcher(targets, legacy_substring=legacy)
+        kept = 0
+        for name, data in corpus:
+            kept += len(matcher.filter_boards(data[name]['boards']))
+        results[label] = (time.perf_counter() - start, kept)
+
+    print(f"In-memory filtering of {len(corpus)} examples for {len(targets)} target boards:")
+    print(f"  {'substring scan (baseline)':28s} {legacy_elapsed * 1000:9.2f} ms  kept keys: {legacy_kept}")
+    for label, (elapsed, kept) in results.items():
+        print(f"  {label:28s} {elapsed * 1000:9.2f} ms  kept keys: {kept}")
+
+
+def bench_on_disk(corpus: list, targets: list) -> None:
+    """Run PackageCreator's example.yml filter over the corpus written to disk."""
+    for label, legacy in (('exact', False), ('substring', True)):
+        temp_dir = tempfile.mkdtemp(prefix='bench_board_matcher_')
+        try:
+            for name, data in corpus:
+                example_dir = os.path.join(temp_dir, 'mcuxsdk', 'examples', 'demo_apps', name)
+                os.makedirs(example_dir)
+                with open(os.path.join(example_dir, 'example.yml'), 'w', encoding='utf-8') as f:
+                    yaml.safe_dump(data, f, default_flow_style=False, sort_keys=False)
+
+            creator = PackageCreator(temp_dir)
+            creator._board_matcher = BoardKeyMatcher(targets, legacy_substring=legacy)
+            start = time.perf_counter()
+            filtered = creator._filter_example_yml_files(temp_dir, targets)
+            elapsed = time.perf_counter() - start
+            print(f"  PackageCreator filter ({label:9s}) {elapsed:8.2f} s  rewritten files: {filtered}")
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--examples', type=int, default=5000, help='Number of synthetic examples (default: 5000)')
+    parser.add_argument('--boards', type=int, default=100, help='Number of synthetic boards (default: 100)')
+    parser.add_argument('--targets', type=int, default=3, help='Number of target boards (default: 3)')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed (default: 1)')
+    parser.add_argument('--skip-disk', action='store_true', help='Only run the in-memory comparison')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    boards = generate_boards(args.boards, rng)
+    # Prefer targets that are prefixes of other boards to show the substring false positives
+    prefixed = [b for b in boards if any(o != b and o.startswith(b) for o in boards)]
+    targets = (prefixed + [b for b in boards if b not in prefixed])[:args.targets]
+    corpus = generate_corpus(args.examples, boards, rng)
+
+    print(f"Boards: {len(boards)}, targets: {targets}")
+    bench_in_memory(corpus, targets)
+    if not args.skip_disk:
+        print(f"On-disk filtering of {len(corpus)} example.yml files:")
+        bench_on_disk(corpus, targets)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# Copyright 2025 NXP
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Packaging benchmark with synthetic SDK workspaces.
+
+Generates an offline west-style workspace shaped like the SDK (git-tracked core
+with boards, devices and drivers, an examples repository with an _boards tree and
+one example.yml per example, a docs project, middleware repositories and
+symbolic links), runs the full PackageCreator.create_package pipeline on it and
+reports the throughput of the copy, filter, example.yml rewrite and archive
+phases (files, or removed example directories for the filter phase). The
+workspace is generated from a seed, so runs are reproducible and optimizations
+can be compared on identical input.
+
+Usage:
+  python scripts/benchmarks/package_benchmark.py [--boards 100] [--examples 3000] [--repeat 3]
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import yaml
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'west_commands'))
+
+from utilities import PackageCreator, PackageOptions, PhaseProfiler, ProjectRecord, WorkspaceContext  # noqa: E402
+from utilities.compression_policy import COMPRESSION_PRESETS, DEFAULT_COMPRESSION_PRESET  # noqa: E402
+
+
+CORES = ['', '@cm33', '@cm33_core0', '@cm33_core1', '@cm7', '@cm4']
+BOARD_STEMS = ['frdmmcx', 'evkmimxrt', 'evkmimx8m', 'lpcxpresso', 'frdmke', 'mcxw7']
+CATEGORIES = ['demo_apps', 'driver_examples/gpio', 'driver_examples/lpuart', 'driver_examples/dma',
+              'rtos_examples', 'usb_examples', 'multicore_examples']
+TOOLCHAINS = ['+armgcc', '+iar', '+mdk', '+mcux']
+MIDDLEWARE = ['freertos-kernel', 'usb', 'fatfs', 'lwip']
+
+# Phases reported by the benchmark and the profiler events they are read from
+REPORTED_PHASES = [
+    ('copy', 'copy'),
+    ('filter', 'filter:examples'),
+    ('yml rewrite', 'filter:example_yml'),
+    ('zip', 'archive'),
+    ('total', 'package'),
+]
+
+
+def _write(path: str, size: int, rng: random.Random) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Source-like text so that compression ratios are realistic
+    words = ['uint32_t', 'status', 'return', 'void', 'GPIO_PinInit', 'if', '(', ')', ';', '\n', 'base', '0x40000000U']
+    chunks = []
+    length = 0
+    while length < size:
+        word = rng.choice(words)
+        chunks.append(word)
+        length += len(word) + 1
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(' '.join(chunks)[:size])
+
+
+def _git_commit(repo_dir: str) -> None:
+    env = dict(os.environ, GIT_AUTHOR_DATE='2025-01-01T00:00:00Z', GIT_COMMITTER_DATE='2025-01-01T00:00:00Z')
+    for cmd in (['git', 'init', '-q'], ['git', 'add', '-A'],
+                ['git', '-c', 'user.name=bench', '-c', 'user.email=bench@example.com',
+                 'commit', '-q', '-m', 'synthetic workspace']):
+        subprocess.run(cmd, cwd=repo_dir, check=True, env=env)
+
+
+def generate_workspace(root: str, board_count: int, example_count: int, file_size: int,
+                       rng: random.Random) -> dict:
+    """
+    Generate a synthetic workspace.
+
+    Returns:
+        Dictionary with the generated boards, example paths and example boards
+    """
+    boards = set()
+    while len(boards) < board_count:
+        boards.add(f"{rng.choice(BOARD_STEMS)}{rng.randint(1, 999)}")
+    boards = sorted(boards)
+
+    os.makedirs(os.path.join(root, '.west'))
+    with open(os.path.join(root, '.west', 'config'), 'w', encoding='utf-8') as f:
+        f.write('[manifest]\npath = manifests\nfile = west.yml\n')
+    os.makedirs(os.path.join(root, 'manifests'))
+    with open(os.path.join(root, 'manifests', 'west.yml'), 'w', encoding='utf-8') as f:
+        f.write('manifest:\n  projects: []\n')
+
+    sdk = os.path.join(root, 'mcuxsdk')
+
+    # Core: drivers, devices with links to shared drivers, boards
+    for index in range(200):
+        _write(os.path.join(sdk, 'drivers', f'drv{index}', f'fsl_drv{index}.c'), file_size, rng)
+    for index in range(board_count // 2):
+        device_dir = os.path.join(sdk, 'devices', 'MCX', f'DEV{index}')
+        _write(os.path.join(device_dir, f'DEV{index}.h'), file_size * 4, rng)
+        os.makedirs(os.path.join(device_dir, 'drivers'))
+        os.symlink(os.path.join('..', '..', '..', '..', 'drivers', f'drv{index % 200}'),
+                   os.path.join(device_dir, 'drivers', f'drv{index % 200}'))
+    for board in boards:
+        for name in ('board.c', 'board.h', 'clock_config.c', 'pin_mux.c'):
+            _write(os.path.join(sdk, 'boards', board, name), file_size, rng)
+
+    # Docs
+    _write(os.path.join(sdk, 'docs', 'index.rst'), file_size, rng)
+
+    # Examples: one example.yml per example, board specific files under _boards
+    examples_root = os.path.join(sdk, 'examples')
+    example_paths = []
+    example_boards = {}
+    for index in range(example_count):
+        category = CATEGORIES[index % len(CATEGORIES)]
+        rel_path = f"{category}/example_{index}"
+        name = f"example_{index}"
+        supported = rng.sample(boards, rng.randint(3, min(25, len(boards))))
+        board_keys = {f"{board}{rng.choice(CORES)}": list(TOOLCHAINS) for board in supported}
+        example_dir = os.path.join(examples_root, rel_path)
+        os.makedirs(example_dir)
+        with open(os.path.join(example_dir, 'example.yml'), 'w', encoding='utf-8') as f:
+            yaml.safe_dump({name: {'section-type': 'application', 'contents': {'document': {'name': name}},
+                                   'boards': board_keys}}, f, default_flow_style=False, sort_keys=False)
+        _write(os.path.join(example_dir, f'{name}.c'), file_size, rng)
+        for board in supported[:3]:
+            _write(os.path.join(examples_root, '_boards', board, rel_path, 'app.h'), file_size // 4, rng)
+        example_paths.append(rel_path)
+        example_boards[rel_path] = supported
+    for board in boards:
+        board_dir = os.path.join(examples_root, '_boards', board)
+        _write(os.path.join(board_dir, 'board_files.cmake'), file_size // 2, rng)
+        os.symlink(os.path.join('..', '..', '_common', 'readme.md'), os.path.join(board_dir, 'readme.md'))
+    _write(os.path.join(examples_root, '_common', 'readme.md'), file_size, rng)
+
+    # Middleware
+    for middleware in MIDDLEWARE:
+        for index in range(50):
+            _write(os.path.join(sdk, 'middleware', middleware, 'src', f'{middleware}_{index}.c'), file_size, rng)
+
+    # Nested repositories first, so that core only tracks its own files
+    for rel in ['examples', 'docs'] + [f'middleware/{m}' for m in MIDDLEWARE]:
+        _git_commit(os.path.join(sdk, rel))
+    with open(os.path.join(sdk, '.gitignore'), 'w', encoding='utf-8') as f:
+        f.write('/examples/\n/docs/\n/middleware/\n')
+    _git_commit(sdk)
+
+    return {'boards': boards, 'examples': example_paths, 'example_boards': example_boards}
+
+
+def get_projects() -> list:
+    """Get the project records of the synthetic workspace."""
+    projects = [ProjectRecord('core', 'mcuxsdk'),
+                ProjectRecord('mcu-sdk-examples', 'mcuxsdk/examples'),
+                ProjectRecord('mcu-sdk-doc', 'mcuxsdk/docs')]
+    projects.extend(ProjectRecord(m, f'mcuxsdk/middleware/{m}') for m in MIDDLEWARE)
+    return projects
+
+
+def run_package(root: str, workspace: dict, targets: list, output_path: str,
+                compression: str = DEFAULT_COMPRESSION_PRESET) -> dict:
+    """Run create_package once and collect the profiled phase statistics."""
+    projects = get_projects()
+    context = WorkspaceContext(root, os.path.join(root, 'manifests'), projects,
+                               {p.name: True for p in projects})
+    # Exclude one middleware so that unwanted project removal is exercised too
+    repo_list = [p.name for p in projects if p.name != MIDDLEWARE[-1]]
+    example_list = [path for path in workspace['examples']
+                    if any(board in targets for board in workspace['example_boards'][path])]
+
+    profiler = PhaseProfiler()
+    creator = PackageCreator(root, None, context, profiler)
+    with profiler.phase('package'):
+        creator.create_package(output_path, projects, repo_list, example_list,
+                               PackageOptions(board_filter=targets, compression=compression))
+
+    stats = {}
+    for label, event_name in REPORTED_PHASES:
+        event = next(e for e in profiler.get_events() if e['name'] == event_name)
+        # Example filtering removes whole directories instead of processing files
+        items = event['args'].get('removed_dirs', event['args']['files'])
+        stats[label] = {'seconds': event['dur'] / 1e6, 'items': items, 'bytes': event['args']['bytes']}
+    stats['total']['archive_bytes'] = os.path.getsize(output_path)
+    stats['total']['peak_rss_kb'] = profiler.get_events()[0]['args']['peak_rss_kb']
+    return stats
+
+
+def print_report(runs: list) -> None:
+    """Print the median phase throughput over the runs."""
+    print(f"{'phase':12s} {'seconds':>9s} {'items':>8s} {'MB':>8s} {'items/s':>10s} {'MB/s':>8s}")
+    for label, _ in REPORTED_PHASES:
+        samples = sorted(runs, key=lambda r: r[label]['seconds'])
+        median = samples[len(samples) // 2][label]
+        seconds = max(median['seconds'], 1e-9)
+        mb = median['bytes'] / (1024 * 1024)
+        print(f"{label:12s} {median['seconds']:9.3f} {median['items']:8d} {mb:8.1f} "
+              f"{median['items'] / seconds:10.0f} {mb / seconds:8.1f}")
+    print(f"Archive size: {runs[-1]['total']['archive_bytes'] / (1024 * 1024):.1f} MB")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--boards', type=int, default=100, help='Number of synthetic boards (default: 100)')
+    parser.add_argument('--examples', type=int, default=3000, help='Number of synthetic examples (default: 3000)')
+    parser.add_argument('--targets', type=int, default=2, help='Number of target boards (default: 2)')
+    parser.add_argument('--file-size', type=int, default=4096, help='Size of generated source files in bytes (default: 4096)')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of packaging runs, the median is reported (default: 3)')
+    parser.add_argument('--compression', choices=COMPRESSION_PRESETS, default=DEFAULT_COMPRESSION_PRESET,
+                        help=f'Archive compression preset (default: {DEFAULT_COMPRESSION_PRESET})')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed (default: 1)')
+    parser.add_argument('--workdir', help='Directory for the synthetic workspace, kept after the run (default: temporary)')
+    parser.add_argument('--json', metavar='FILE', help='Also write the results of every run to FILE')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    work_dir = args.workdir or tempfile.mkdtemp(prefix='package_benchmark_')
+    root = os.path.join(work_dir, 'workspace')
+    if os.path.exists(root):
+        shutil.rmtree(root)
+
+    try:
+        start = time.perf_counter()
+        workspace = generate_workspace(root, args.boards, args.examples, args.file_size, rng)
+        targets = workspace['boards'][:args.targets]
+        print(f"Generated workspace with {args.boards} boards and {args.examples} examples "
+              f"in {time.perf_counter() - start:.1f} s: {root}")
+        print(f"Target boards: {targets}")
+
+        runs = []
+        for index in range(args.repeat):
+            output_path = os.path.join(work_dir, f'package_{index}.zip')
+            runs.append(run_package(root, workspace, targets, output_path, args.compression))
+            os.remove(output_path)
+        print_report(runs)
+
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump({'parameters': vars(args), 'targets': targets, 'runs': runs}, f, indent=2)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,187 @@
+# Copyright 2025 NXP
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+West extension command to query the board configurations across boards.
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+
+from west.commands import WestCommand
+from west import log
+
+from utilities import BoardIndex, ConfigLoader, WorkspaceContext
+
+
+class BoardQueryCommand(WestCommand):
+    def __init__(self):
+        super().__init__(
+            'board_query',
+            'query board configurations across boards',
+            'Answer questions across all board configurations (boards/*.yml with '
+            'their controlled-access overlays) from one index: the boards including '
+            'a repository, the boards providing an example category, the repositories '
+            'of a device, and the whole board by repository matrix. The index is kept '
+            'in the workspace cache until the board configurations change.',
+            accepts_unknown_args=False)
+
+    def do_add_parser(self, parser_adder):
+        parser = parser_adder.add_parser(
+            self.name,
+            help=self.help,
+            description=self.description,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+            epilog='''
+Examples:
+  # Boards including a repository
+  west board_query repo mcuxsdk-middleware-executorch
+
+  # Boards providing an example category, or the examples below a path
+  west board_query examples wireless_examples
+  west board_query examples driver_examples/lpuart --json
+
+  # Repositories of the packages of a device
+  west board_query device MCXW716CxxxA
+
+  # Board by repository matrix (R: required, O: optional)
+  west board_query matrix -o matrix.csv
+  west board_query matrix --format json -o matrix.json
+''')
+
+        common = argparse.ArgumentParser(add_help=False)
+        common.add_argument(
+            '--required-only',
+            action='store_true',
+            help='Ignore optional repositories and examples of the boards')
+        common.add_argument(
+            '-o', '--output',
+            help='Write the result to a file instead of standard output')
+        common.add_argument(
+            '--refresh',
+            action='store_true',
+            help='Rebuild the board index instead of using the workspace cache')
+        common.add_argument(
+            '-v', '--verbose',
+            action='store_true',
+            help='Enable verbose (DEBUG) logging')
+
+        subparsers = parser.add_subparsers(dest='query', metavar='QUERY')
+        subparsers.required = True
+
+        repo_parser = subparsers.add_parser(
+            'repo', parents=[common], help='List the boards including a repository')
+        repo_parser.add_argument('name', help='Repository (project) name')
+
+        examples_parser = subparsers.add_parser(
+            'examples', parents=[common], help='List the boards providing an example category or path')
+        examples_parser.add_argument(
+            'path', help='Example category (e.g. driver_examples) or example path prefix')
+
+        device_parser = subparsers.add_parser(
+            'device', parents=[common], help='List the boards and repositories of a device')
+        device_parser.add_argument('name', help='Device name, matched like --set device')
+
+        for query_parser in (repo_parser, examples_parser, device_parser):
+            query_parser.add_argument('--json', action='store_true', help='Write the result as JSON')
+
+        matrix_parser = subparsers.add_parser(
+            'matrix', parents=[common], help='Export the board by repository matrix')
+        matrix_parser.add_argument(
+            '--format', choices=['csv', 'json'], default='csv',
+            help='Matrix format (default: csv)')
+
+        return parser
+
+    def do_run(self, args, unknown_args):
+        if args.verbose:
+            log.VERBOSE = True
+
+        context = WorkspaceContext.from_manifest(self.manifest, self._log)
+        config_loader = ConfigLoader(context.workspace_root, context.manifest_dir, self._log, context)
+        index = BoardIndex.load(config_loader, args.refresh, self._log)
+        include_optional = not args.required_only
+        if args.query in ('device', 'matrix'):
+            index.set_devices(config_loader.device_mapper.get_available_devices())
+            if not index.device_boards:
+                log.wrn("No device-to-board mapping available, devices are not listed")
+
+        if args.query == 'repo':
+            boards = sorted(index.get_boards_for_repo(args.name, include_optional))
+            if not boards and args.name not in index.get_repos():
+                log.wrn(f"Repository {args.name} is not included by any board")
+            optional = [b for b in boards if b not in index.repo_boards.get(args.name, ())]
+            result = {'repo': args.name, 'boards': boards, 'optional': optional}
+            text = [f"{board} (optional)" if board in optional else board for board in boards]
+        elif args.query == 'examples':
+            boards = sorted(index.get_boards_for_examples(args.path, include_optional))
+            result = {'examples': args.path, 'boards': boards}
+            text = boards
+        elif args.query == 'device':
+            device = index.find_device(args.name)
+            if device is None:
+                log.die(f"Device '{args.name}' not found or without board configurations")
+            required, optional = index.get_repos_for_device(device)
+            if args.required_only:
+                optional = []
+            result = {'device': device, 'boards': index.device_boards[device],
+                      'repos': required, 'optional_repos': optional}
+            text = ([f"Device: {device}", f"Boards: {', '.join(result['boards'])}",
+                     f"Repositories ({len(required)}):"] + [f"  {repo}" for repo in required])
+            if optional:
+                text += [f"Optional repositories ({len(optional)}):"] + [f"  {repo}" for repo in optional]
+        else:
+            self._write(self._format_matrix(index, include_optional, args.format), args.output)
+            return
+
+        if args.json:
+            self._write(json.dumps(result, indent=2) + '\n', args.output)
+        else:
+            self._write(''.join(f"{line}\n" for line in text), args.output)
+
+    def _log(self, message: str, level: str = 'inf'):
+        """Forward utility log messages to west logging."""
+        if level == 'err':
+            log.err(message)
+        elif level == 'wrn':
+            log.wrn(message)
+        else:
+            log.dbg(message)  # Standard output is kept for the result
+
+    def _format_matrix(self, index: BoardIndex, include_optional: bool, output_format: str) -> str:
+        """Format the board by repository matrix as CSV or JSON."""
+        repos, matrix = index.get_matrix(include_optional)
+        if output_format == 'json':
+            boards = {}
+            for board, row in matrix.items():
+                config = index.configs[board]
+                boards[board] = {
+                    'repos': row,
+                    'board_dependencies': config.board_dependencies,
+                    'devices': index.board_devices.get(board, []),
+                    'example_categories': sorted({index.get_category(e)
+                                                  for e in config.get_all_examples(include_optional)}),
+                }
+            return json.dumps({'repos': repos, 'boards': boards}, indent=2) + '\n'
+
+        output = io.StringIO()
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow(['board', 'devices'] + repos)
+        for board, row in matrix.items():
+            writer.writerow([board, ';'.join(index.board_devices.get(board, []))] +
+                            [row.get(repo, '') for repo in repos])
+        return output.getvalue()
+
+    def _write(self, content: str, output: str):
+        if not output:
+            print(content, end='')
+            return
+        output_dir = os.path.dirname(os.path.abspath(output))
+        os.makedirs(output_dir, exist_ok=True)
+        with open(output, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+        log.inf(f"Board query result written to {output}")
@@ -0,0 +1,141 @@
+# Copyright 2025 NXP
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+West extension command to maintain the shared git object cache used by
+'west update_board --git-cache'.
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime
+
+from west.commands import WestCommand
+from west import log
+
+from utilities import WorkspaceContext
+from utilities.git_cache import GitObjectCache, GIT_CACHE_ENV
+
+
+class GitCacheCommand(WestCommand):
+    def __init__(self):
+        super().__init__(
+            'git_cache',
+            'maintain the shared git object cache',
+            'Populate, list and garbage collect the git object cache that '
+            '"west update_board --git-cache DIR" shares between the workspaces '
+            'of a host. The cache directory is taken from --cache-dir or the '
+            f'{GIT_CACHE_ENV} environment variable.',
+            accepts_unknown_args=False)
+
+    def do_add_parser(self, parser_adder):
+        parser = parser_adder.add_parser(
+            self.name,
+            help=self.help,
+            description=self.description,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+            epilog='''
+Examples:
+  # Fetch the manifest revisions of all active projects into the cache
+  west git_cache --cache-dir /var/cache/mcuxsdk-git populate
+
+  # Show the cached repositories
+  west git_cache --cache-dir /var/cache/mcuxsdk-git list
+
+  # Repack the cache and drop repositories unused for 60 days
+  west git_cache --cache-dir /var/cache/mcuxsdk-git gc --remove-unused 60
+''')
+
+        parser.add_argument(
+            '--cache-dir',
+            help=f'Cache directory (default: ${GIT_CACHE_ENV})')
+
+        parser.add_argument(
+            '-v', '--verbose',
+            action='store_true',
+            help='Enable verbose (DEBUG) logging')
+
+        subparsers = parser.add_subparsers(dest='action', metavar='ACTION')
+        subparsers.required = True
+
+        populate_parser = subparsers.add_parser(
+            'populate', help='Fetch the manifest revisions of projects into the cache')
+        populate_parser.add_argument(
+            'projects', nargs='*',
+            help='Project names to populate (default: all active projects)')
+        populate_parser.add_argument(
+            '-j', '--jobs', type=int, default=4,
+            help='Number of projects fetched concurrently (default: 4)')
+
+        subparsers.add_parser('list', help='List the cached repositories with size and last use')
+
+        gc_parser = subparsers.add_parser(
+            'gc', help='Repack the cached repositories, optionally removing unused ones')
+        gc_parser.add_argument(
+            '--remove-unused', type=int, default=0, metavar='DAYS',
+            help='Remove repositories not used by any update for DAYS days. Repositories that '
+                 'workspace repositories still borrow objects from are kept until those workspaces '
+                 'are deleted.')
+
+        return parser
+
+    def do_run(self, args, unknown_args):
+        if args.verbose:
+            log.VERBOSE = True
+
+        cache_dir = args.cache_dir or os.environ.get(GIT_CACHE_ENV)
+        if not cache_dir:
+            log.die(f"No cache directory, use --cache-dir or set {GIT_CACHE_ENV}")
+
+        cache = GitObjectCache(cache_dir, self._log)
+        try:
+            if args.action == 'populate':
+                self._populate(cache, args)
+            elif args.action == 'list':
+                self._list(cache)
+            else:
+                stats = cache.gc(args.remove_unused)
+                log.inf(f"Collected {stats['collected']} repositories, removed {stats['removed']}, "
+                        f"kept {stats['borrowed']} unused ones still borrowed by workspaces")
+        except RuntimeError as e:
+            log.die(str(e))
+
+    def _log(self, message: str, level: str = 'inf'):
+        """Forward utility log messages to west logging."""
+        if level == 'err':
+            log.err(message)
+        elif level == 'wrn':
+            log.wrn(message)
+        elif level == 'dbg':
+            log.dbg(message)
+        else:
+            log.inf(message)
+
+    def _populate(self, cache: GitObjectCache, args):
+        context = WorkspaceContext.from_manifest(self.manifest)
+        if args.projects:
+            projects = context.get_projects(args.projects)
+            missing = set(args.projects) - {p.name for p in projects}
+            if missing:
+                log.die(f"Unknown projects: {', '.join(sorted(missing))}")
+        else:
+            projects = [p for p in context.projects if context.is_active(p) and p.name != 'manifest']
+
+        start_time = time.time()
+        cache_repos = cache.populate_projects(projects, args.jobs)
+        log.inf(f"Populated {len(cache_repos)} of {len(projects)} projects in "
+                f"{time.time() - start_time:.2f} seconds: {cache.cache_dir}")
+
+    def _list(self, cache: GitObjectCache):
+        repos = cache.list_repositories()
+        if not repos:
+            log.inf(f"Git cache is empty: {cache.cache_dir}")
+            return
+        for repo in repos:
+            last_used = (datetime.fromtimestamp(repo['last_used']).strftime('%Y-%m-%d %H:%M')
+                         if repo['last_used'] else 'never')
+            log.inf(f"{repo['bytes'] / (1024 * 1024):10.1f} MB  {last_used}  {repo['url']}")
+        total = sum(repo['bytes'] for repo in repos)
+        log.inf(f"{total / (1024 * 1024):10.1f} MB  total in {len(repos)} repositories: {cache.cache_dir}")
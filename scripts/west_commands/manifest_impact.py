@@ -0,0 +1,176 @@
+# Copyright 2025 NXP
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+West extension command to list the board packages affected by a manifest change.
+"""
+
+import argparse
+import json
+import os
+
+from west.commands import WestCommand
+from west import log
+
+from utilities import BoardIndex, ConfigLoader, WorkspaceContext
+from utilities.manifest_diff import ManifestDiff, ManifestRevision
+
+# Changes of the manifest repository below these paths affect every board package
+TOOLING_PATHS = ('scripts/',)
+
+
+class ManifestImpactCommand(WestCommand):
+    def __init__(self):
+        super().__init__(
+            'manifest_impact',
+            'list boards affected by a manifest change',
+            'Compare the manifest repository at two git revisions and list the boards '
+            'and devices whose packages are affected: boards including a project whose '
+            'revision, URL or path changed, boards whose configuration changed, and the '
+            'boards depending on them. CI can rebuild only these packages.',
+            accepts_unknown_args=False)
+
+    def do_add_parser(self, parser_adder):
+        parser = parser_adder.add_parser(
+            self.name,
+            help=self.help,
+            description=self.description,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+            epilog='''
+Examples:
+  # Boards affected by the last commit of the manifest repository
+  west manifest_impact
+
+  # Boards affected by a merge request, one per line for a CI matrix
+  west manifest_impact origin/main HEAD --format boards
+
+  # Full report, ignoring optional repositories of the boards
+  west manifest_impact v25.09.00 HEAD --required-only --format json -o impact.json
+
+Note: Branch revisions (e.g. "main") are compared by name, commits pushed to a
+tracked branch without a manifest change are not detected.
+''')
+
+        parser.add_argument(
+            'base', nargs='?', default='HEAD~1',
+            help='Manifest revision before the change (default: HEAD~1)')
+
+        parser.add_argument(
+            'head', nargs='?', default='HEAD',
+            help='Manifest revision after the change (default: HEAD)')
+
+        parser.add_argument(
+            '--required-only',
+            action='store_true',
+            help='Ignore optional repositories of the boards, for packages built without --include-optional')
+
+        parser.add_argument(
+            '--format',
+            choices=['text', 'json', 'boards'],
+            default='text',
+            help='Output format: readable report, JSON, or board names one per line (default: text)')
+
+        parser.add_argument(
+            '-o', '--output',
+            help='Write the result to a file instead of standard output')
+
+        parser.add_argument(
+            '-v', '--verbose',
+            action='store_true',
+            help='Enable verbose (DEBUG) logging')
+
+        return parser
+
+    def do_run(self, args, unknown_args):
+        if args.verbose:
+            log.VERBOSE = True
+
+        context = WorkspaceContext.from_manifest(self.manifest, self._log)
+        manifest_file = os.path.basename(self.manifest.path)
+        base = ManifestRevision(context.manifest_dir, args.base, manifest_file, self._log)
+        head = ManifestRevision(context.manifest_dir, args.head, manifest_file, self._log)
+
+        try:
+            base_commit = base.resolve()
+            head_commit = head.resolve()
+            diff = ManifestDiff(base, head)
+            changed_projects = diff.get_changed_projects()
+            changed_files = diff.get_changed_files()
+            board_data = head.load_board_data()
+            group_filter_changed = diff.group_filter_changed()
+        except RuntimeError as e:
+            log.die(str(e))
+
+        config_loader = ConfigLoader(context.workspace_root, context.manifest_dir, self._log, context)
+        index = BoardIndex.build(config_loader, board_data, self._log)
+
+        changed_boards = {os.path.splitext(os.path.basename(path))[0] for path in changed_files
+                          if path.startswith('boards/') and path.endswith(('.yml', '.yaml'))}
+        tooling_files = [path for path in changed_files if path.startswith(TOOLING_PATHS)]
+        if tooling_files or group_filter_changed:
+            reason = "group-filter" if group_filter_changed else f"tooling {tooling_files[0]}"
+            affected = {board: [reason] for board in sorted(index.configs)}
+        else:
+            affected = index.get_affected_boards(changed_projects, changed_boards,
+                                                 include_optional=not args.required_only)
+
+        device_map = config_loader.device_mapper.get_available_devices() if affected else {}
+        if affected and not device_map:
+            log.wrn("No device-to-board mapping available, affected devices are not listed")
+        devices = index.get_affected_devices(affected, device_map)
+        unreferenced = sorted(name for name in changed_projects
+                              if not index.get_boards_for_repo(name, not args.required_only))
+
+        result = {
+            'base': {'revision': args.base, 'commit': base_commit},
+            'head': {'revision': args.head, 'commit': head_commit},
+            'changed_projects': changed_projects,
+            'changed_boards': sorted(changed_boards),
+            'unreferenced_projects': unreferenced,
+            'boards': affected,
+            'devices': devices,
+        }
+        self._write(self._format(result, args.format), args.output)
+
+    def _log(self, message: str, level: str = 'inf'):
+        """Forward utility log messages to west logging."""
+        if level == 'err':
+            log.err(message)
+        elif level == 'wrn':
+            log.wrn(message)
+        else:
+            log.dbg(message)  # Standard output is kept for the result
+
+    def _format(self, result: dict, output_format: str) -> str:
+        if output_format == 'json':
+            return json.dumps(result, indent=2) + '\n'
+        if output_format == 'boards':
+            return ''.join(f"{board}\n" for board in result['boards'])
+
+        lines = [f"Manifest change {result['base']['commit'][:12]}..{result['head']['commit'][:12]}"]
+        lines.append(f"Changed projects ({len(result['changed_projects'])}):")
+        for name, change in result['changed_projects'].items():
+            old = change['old']['revision'] if change['old'] else '(added)'
+            new = change['new']['revision'] if change['new'] else '(removed)'
+            lines.append(f"  {name}: {old} -> {new}")
+        if result['changed_boards']:
+            lines.append(f"Changed board configurations: {', '.join(result['changed_boards'])}")
+        if result['unreferenced_projects']:
+            lines.append(f"Projects not included by any board: {', '.join(result['unreferenced_projects'])}")
+        lines.append(f"Affected boards ({len(result['boards'])}):")
+        for board, reasons in result['boards'].items():
+            lines.append(f"  {board}: {', '.join(reasons)}")
+        lines.append(f"Affected devices ({len(result['devices'])}):")
+        lines.extend(f"  {device}" for device in result['devices'])
+        return '\n'.join(lines) + '\n'
+
+    def _write(self, content: str, output: str):
+        if not output:
+            print(content, end='')
+            return
+        output_dir = os.path.dirname(os.path.abspath(output))
+        os.makedirs(output_dir, exist_ok=True)
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(content)
+        log.inf(f"Manifest impact written to {output}")
@@ -0,0 +1,144 @@
+# Copyright 2025 NXP
+#
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+West extension command to work with packages created by update_board.
+"""
+
+import argparse
+import zipfile
+
+from west.commands import WestCommand
+from west import log
+
+from utilities.package_delta import PackageDeltaApplier, PackageDeltaWriter
+from utilities.package_index import verify_package
+from utilities.package_layers import LayeredPackageAssembler
+
+
+class PackageToolCommand(WestCommand):
+    def __init__(self):
+        super().__init__(
+            'package_tool',
+            'work with packages created by update_board',
+            'Operate on package artifacts created by update_board without a workspace: '
+            'assemble the full package of a board from the base and overlay archives '
+            'of a layered package (update_board --layered), create the delta between two '
+            'builds of a package and apply it to an extracted or zip package '
+            '(update_board --delta-from), and verify a package against its index.',
+            accepts_unknown_args=False)
+
+    def do_add_parser(self, parser_adder):
+        parser = parser_adder.add_parser(
+            self.name,
+            help=self.help,
+            description=self.description,
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+            epilog='''
+Examples:
+  # List the boards of a layered package
+  west package_tool assemble dist/layers.json --list
+
+  # Reconstruct the package of a board as a zip archive, or into a directory
+  west package_tool assemble dist/layers.json frdmmcxw71 -o frdmmcxw71.zip
+  west package_tool assemble dist/layers.json frdmmcxw71 -o sdk/
+
+  # Create the delta between two builds of a package
+  west package_tool delta mcxw23evk-25.09.zip mcxw23evk-25.12.zip -o mcxw23evk-25.12.delta.zip
+
+  # Patch an extracted package in place, or a zip package into a new one
+  west package_tool apply-delta mcxw23evk-25.12.delta.zip ~/sdk/mcxw23evk
+  west package_tool apply-delta mcxw23evk-25.12.delta.zip mcxw23evk-25.09.zip -o mcxw23evk-25.12.zip
+
+  # Check a package or an extracted package against its embedded index
+  west package_tool verify mcxw23evk-25.12.tar.zst
+''')
+
+        common = argparse.ArgumentParser(add_help=False)
+        common.add_argument(
+            '-v', '--verbose',
+            action='store_true',
+            help='Enable verbose (DEBUG) logging')
+
+        subparsers = parser.add_subparsers(dest='operation', metavar='OPERATION')
+        subparsers.required = True
+
+        assemble_parser = subparsers.add_parser(
+            'assemble', parents=[common], help='Assemble the package of a board from a layered package')
+        assemble_parser.add_argument('layers', help='Layers manifest (layers.json) of the layered package')
+        assemble_parser.add_argument('board', nargs='?', help='Board whose package is assembled')
+        assemble_parser.add_argument(
+            '-o', '--output',
+            help='Zip archive to write, or directory to extract into when not ending with .zip '
+                 '(default: <board>.zip)')
+        assemble_parser.add_argument(
+            '--list', action='store_true', help='List the boards of the layered package and exit')
+
+        delta_parser = subparsers.add_parser(
+            'delta', parents=[common], help='Create the delta between two builds of a package')
+        delta_parser.add_argument(
+            'previous', help='Previous package, its extracted directory or its index (.package-index.json)')
+        delta_parser.add_argument('package', help='New package archive')
+        delta_parser.add_argument('-o', '--output', help='Delta file to write (default: <package>.delta.zip)')
+
+        apply_parser = subparsers.add_parser(
+            'apply-delta', parents=[common], help='Apply a delta to an extracted package directory or a zip package')
+        apply_parser.add_argument('delta', help='Delta file created by update_board --delta-from or package_tool delta')
+        apply_parser.add_argument('target', help='Extracted package directory, patched in place, or zip package')
+        apply_parser.add_argument(
+            '-o', '--output', help='Patched zip package to write (default: replace the target zip package)')
+        apply_parser.add_argument(
+            '--force', action='store_true',
+            help='Apply even if the target is not the package the delta was created from')
+
+        verify_parser = subparsers.add_parser(
+            'verify', parents=[common], help='Verify the members of a package against its embedded index')
+        verify_parser.add_argument('package', help='Package archive or extracted package directory')
+
+        return parser
+
+    def do_run(self, args, unknown_args):
+        if args.verbose:
+            log.VERBOSE = True
+
+        try:
+            if args.operation == 'assemble':
+                self._assemble(args)
+            elif args.operation == 'delta':
+                PackageDeltaWriter(self._log).create_delta(args.previous, args.package, args.output)
+            elif args.operation == 'apply-delta':
+                PackageDeltaApplier(args.delta, self._log).apply(args.target, args.output, args.force)
+            elif args.operation == 'verify':
+                self._verify(args)
+        except (OSError, RuntimeError, ValueError, KeyError, zipfile.BadZipFile) as e:
+            log.die(str(e))
+
+    def _log(self, message: str, level: str = 'inf'):
+        """Forward utility log messages to west logging."""
+        if level == 'err':
+            log.err(message)
+        elif level == 'wrn':
+            log.wrn(message)
+        elif level == 'dbg':
+            log.dbg(message)
+        else:
+            log.inf(message)
+
+    def _assemble(self, args):
+        assembler = LayeredPackageAssembler(args.layers, self._log)
+        if args.list:
+            for board in assembler.get_boards():
+                print(board)
+            return
+        if not args.board:
+            log.die(f"A board is required, available boards: {', '.join(assembler.get_boards())}")
+        assembler.assemble(args.board, args.output or f"{args.board}.zip")
+
+    def _verify(self, args):
+        problems = verify_package(args.package)
+        for problem in problems:
+            log.err(problem)
+        if problems:
+            log.die(f"{args.package} does not match its package index: {len(problems)} problems")
+        log.inf(f"{args.package} matches its package index")
@@ -18,9 +18,10 @@ import uuid
 import fnmatch
 
 from west.commands import WestCommand
-from west.manifest import Manifest
 from west import log
 
+from utilities import WorkspaceContext
+
 
 class SbomCollect(WestCommand):
     def __init__(self):
@@ -72,15 +73,15 @@ class SbomCollect(WestCommand):
             log.VERBOSE = True
 
         try:
-            # Get the west workspace and manifest
-            manifest = Manifest.from_file()
-            workspace_root = Path(manifest.topdir)
+            # Get the west workspace and manifest (already resolved by west)
+            context = WorkspaceContext.from_manifest(self.manifest)
+            workspace_root = Path(context.workspace_root)
             
             log.inf(f"Starting SBOM merge for workspace: {workspace_root}")
             log.inf(f"Looking for SBOM files matching pattern: {args.sbom_pattern}")
 
             # Collect disabled groups once from manifest
-            disabled_groups = self._get_disabled_groups(manifest)
+            disabled_groups = self._get_disabled_groups(context)
             if disabled_groups:
                 log.inf(f"Manifest has disabled groups: {disabled_groups}")
             else:
@@ -89,7 +90,7 @@ class SbomCollect(WestCommand):
             # Filter projects based on provided project names
             if args.projects:
                 log.inf(f"Filtering projects: {args.projects}")
-                projects_to_process = [p for p in manifest.projects if p.name in args.projects]
+                projects_to_process = context.get_projects(args.projects)
                 
                 # Check for projects not found
                 found_project_names = {p.name for p in projects_to_process}
@@ -103,7 +104,7 @@ class SbomCollect(WestCommand):
                 
                 log.inf(f"Processing {len(projects_to_process)} specified projects")
             else:
-                projects_to_process = manifest.projects
+                projects_to_process = context.projects
                 log.inf(f"No projects specified, processing all {len(projects_to_process)} projects")
 
             # Collect SBOM files from filtered projects
@@ -272,13 +273,13 @@ class SbomCollect(WestCommand):
         # Include download location for better uniqueness
         return f"{name}-{version}-{hash(download_location) if download_location else 'no-location'}"
 
-    def _get_disabled_groups(self, manifest: Manifest) -> Set[str]:
+    def _get_disabled_groups(self, context: WorkspaceContext) -> Set[str]:
         """
         Extract disabled groups from manifest group-filter.
         Disabled groups are prefixed with '-' in West manifest group-filter.
         
         Args:
-            manifest: The west manifest object
+            context: The shared workspace context of the resolved manifest
             
         Returns:
             Set[str]: Set of disabled group names (without '-' prefix)
@@ -286,7 +287,7 @@ class SbomCollect(WestCommand):
         disabled_groups = set()
         
         try:
-            group_filter = getattr(manifest, 'group_filter', None)
+            group_filter = getattr(context, 'group_filter', None)
             
             if group_filter is None:
                 return disabled_groups
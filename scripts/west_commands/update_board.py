@@ -6,16 +6,25 @@ import os
 import subprocess
 import time
 import yaml
+import contextlib
 from datetime import datetime
 from typing import List, Tuple
 import argparse
 
 from west.commands import WestCommand
-from west.manifest import Manifest
 from west import log
 
 # Import utilities from the utilities package
-from utilities import DeviceBoardMapper, ConfigLoader, BoardConfig, PackageCreator, PackageOptions
+from utilities import DeviceBoardMapper, ConfigLoader, BoardConfig, PackageCreator, PackageOptions, WorkspaceContext
+from utilities import PhaseProfiler, PackagePlanner, ProjectUpdater
+from utilities.package_creator import DEFAULT_MAX_DOC_JOBS
+from utilities.project_updater import SPARSE_PROJECTS
+from utilities.git_cache import GitObjectCache, GIT_CACHE_ENV
+from utilities.repo_closure import RepoClosureAnalyzer
+from utilities.compression_policy import COMPRESSION_PRESETS, DEFAULT_COMPRESSION_PRESET
+from utilities.archive_writer import ARCHIVE_SUFFIXES, check_archive_backend
+from utilities.package_layers import LayeredBoard, LAYERS_MANIFEST_NAME
+from utilities.package_delta import PackageDeltaWriter
 
 
 class UpdateBoardCommand(WestCommand):
@@ -42,9 +51,43 @@ Examples:
   # Update and create package with all optional items
   west update_board --set board mcxw23evk -o package.zip --include-optional
 
+  # Update only the files the board needs in core and examples (partial clone, sparse checkout)
+  west update_board --set board mcxw23evk --sparse
+
+  # Update through a git object cache shared by all workspaces of the host
+  west update_board --set board mcxw23evk --git-cache /var/cache/mcuxsdk-git
+
+  # Update offline from a directory of per-project git bundles or bare mirrors
+  west update_board --set board mcxw23evk --seed-from /mnt/sdk-bundles
+
+  # Report the repositories the examples of a board use, then package only those
+  west update_board --set board frdmmcxn947 --repo-closure report
+  west update_board --set board frdmmcxn947 -o package.zip --repo-closure enforce
+
   # Skip update, create package with docs (for CI/CD parallel execution)
   west update_board --set board mcxw23evk -o package.zip --no-update --gen-doc
 
+  # Show what the package would contain, with size and time estimates, without creating it
+  west update_board --set board mcxw23evk -o package.zip --include-optional --plan plan.json
+
+  # Create the package as a zstd compressed tarball
+  west update_board --set board mcxw23evk -o package.tar.zst
+
+  # Create a byte-identical package for the same revisions
+  SOURCE_DATE_EPOCH=$(git -C mcuxsdk log -1 --format=%ct) west update_board --set board mcxw23evk -o package.zip --reproducible
+
+  # Create a layered package: shared base archive plus one overlay per board of the device
+  west update_board --set device MCXW716CxxxA -o dist/mcxw71 --layered
+
+  # Create the package and a delta from the previous drop for customers to patch their copy
+  west update_board --set board mcxw23evk -o mcxw23evk-25.12.zip --delta-from mcxw23evk-25.09.zip
+
+  # Continue a package build that was interrupted, e.g. by a full disk
+  west update_board --set board mcxw23evk -o package.zip --no-update --resume
+
+  # Record a phase profile (Chrome trace JSON) of the update and packaging
+  west update_board --set board mcxw23evk -o package.zip --profile-out profile.json
+
   # List all repositories with descriptions in YAML format
   west update_board --set board mcxw23evk --list-repo
 
@@ -70,7 +113,8 @@ Note: For custom SBOM pattern matching, use 'west sbom_collect' directly with
         
         # Output (makes this a packaging operation)
         parser.add_argument('-o', '--output', 
-                          help='Output file path. For packaging: creates a filtered zip package after updating repositories. '
+                          help='Output file path. For packaging: creates a filtered package after updating repositories, '
+                               'a zip archive by default or a tarball for .tar.zst/.tzst and .tar.xz/.txz file names. '
                                'For --list-repo: if the file has .yml/.yaml extension, writes repository information to that file; '
                                'For --list-sbom: writes merged SBOM to the specified JSON file.')
         
@@ -78,6 +122,16 @@ Note: For custom SBOM pattern matching, use 'west sbom_collect' directly with
         parser.add_argument('--list-repo', action='store_true',
                           help='List all repositories with display names and descriptions in YAML format for the specified set.')
         
+        # Repository closure of the examples
+        parser.add_argument('--repo-closure', choices=['report', 'enforce'],
+                          help='Derive the repositories the selected examples use from their build metadata '
+                               '(${SdkRootDirPath} paths and MCUX_COMPONENT_ Kconfig symbols, mapped to manifest project paths). '
+                               '"report" lists the used and unused repositories of the set in YAML format (written to '
+                               '-o/--output if it has a .yml/.yaml extension) without updating; "enforce" leaves the unused '
+                               'middleware and RTOS repositories out of the update and package, analyzing the examples after the '
+                               'repositories every package keeps are updated. Repositories that are not checked out are '
+                               'kept when the examples use components no checked out repository defines.')
+        
         # SBOM collection
         parser.add_argument('--list-sbom', action='store_true',
                           help='Collect SBOM files from repositories for the specified set and output merged SBOM. '
@@ -99,6 +153,71 @@ Note: For custom SBOM pattern matching, use 'west sbom_collect' directly with
                                  help='Include .git history in package. Only valid with -o/--output.')
         package_group.add_argument('--gen-doc', action='store_true', 
                                  help='Generate and include PDF documentation in package. Requires mcu-sdk-doc repository. Only valid with -o/--output.')
+        package_group.add_argument('--doc-jobs', type=int, default=0, metavar='N',
+                                 help='Maximum number of boards whose PDF documentation is generated in parallel with --gen-doc '
+                                      f'(default: number of CPUs, at most {DEFAULT_MAX_DOC_JOBS}).')
+        package_group.add_argument('--no-doc-cache', action='store_true',
+                                 help='Always regenerate PDF documentation with --gen-doc instead of reusing PDFs cached in '
+                                      '.west/mcuxsdk-cache for the same documentation input revisions.')
+        package_group.add_argument('--legacy-board-match', action='store_true',
+                                 help='Match example.yml board keys by substring as in earlier releases (e.g. "evkmimx8mn" also keeps '
+                                      '"evkmimx8mnddr3l"). By default the board part of keys like "board@core" must match exactly. '
+                                      'Only valid with -o/--output.')
+        package_group.add_argument('--keep-unsupported-examples', action='store_true',
+                                 help='Keep examples whose example.yml boards are all filtered out, with their directories. '
+                                      'By default they are removed from the package. Only valid with -o/--output.')
+        
+        package_group.add_argument('--compression', choices=COMPRESSION_PRESETS, default=None,
+                                 help='Archive compression preset: "fast" deflates at level 1, "balanced" stores already '
+                                      'compressed content (archives, images, PDFs) and binaries that do not compress, '
+                                      '"smallest" deflates at level 9 and only stores content that does not compress '
+                                      f'(default: {DEFAULT_COMPRESSION_PRESET}). For tarballs the preset selects the zstd or xz '
+                                      'level. Only valid with -o/--output.')
+        package_group.add_argument('--plan', nargs='?', const='', metavar='PLAN_FILE',
+                                 help='Plan the package instead of creating it: list file counts and bytes per project '
+                                      'with estimated compressed size and creation time, computed from directory metadata '
+                                      'without updating, copying or compressing anything. The planned member list is '
+                                      'written to PLAN_FILE (JSON) if given. Only valid with -o/--output.')
+        package_group.add_argument('--reproducible', action='store_true',
+                                 help='Create a reproducible package: members in sorted order with normalized permissions '
+                                      'and the timestamp from SOURCE_DATE_EPOCH (default: 1980-01-01), so identical content '
+                                      'yields a byte-identical archive. Only valid with -o/--output.')
+        package_group.add_argument('--resume', action='store_true',
+                                 help='Make packaging resumable: staging and progress are kept in OUTPUT.partial until the '
+                                      'package is complete, and a rerun with --resume after an interruption skips completed '
+                                      'phases and, for zip output, the members archived up to the last checkpoint. '
+                                      'Only valid with -o/--output.')
+        package_group.add_argument('--layered', action='store_true',
+                                 help='Create a layered package for the boards of a device set: -o/--output names a directory '
+                                      'receiving one content-addressed base archive with the members identical in all board '
+                                      'packages, one small overlay archive per board and a layers.json manifest. Assemble the '
+                                      'package of a board with "west package_tool assemble". Only valid with --set device.')
+        package_group.add_argument('--delta-from', metavar='PREVIOUS',
+                                 help='Also create a delta from a previous build of the package to the new one, written next '
+                                      'to the package as NAME.delta.zip: the added, changed and removed members with their '
+                                      'SHA-256 digests and the content of the added and changed members. PREVIOUS is the '
+                                      'previous package, its extracted directory or its index (.package-index.json); members '
+                                      'are compared through the package indexes. Apply it with "west package_tool apply-delta". '
+                                      'Only valid with -o/--output.')
+        
+        parser.add_argument('--profile-out', metavar='FILE',
+                          help='Write a phase profile (wall time, files and bytes processed, peak RSS of update, copy, '
+                               'filter, docs and archive phases) to FILE in Chrome trace JSON format.')
+        parser.add_argument('--sparse', action='store_true',
+                          help='Update core and examples as blobless partial clones with a sparse checkout of the files '
+                               'the board needs: other boards\' directories and unselected examples are neither downloaded '
+                               'nor checked out. Other repositories are updated with west update as usual. A later '
+                               'update without --sparse restores the full checkout of core and examples.')
+        parser.add_argument('--git-cache', metavar='DIR',
+                          help='Shared git object cache directory (default: $' + GIT_CACHE_ENV + '). Project revisions '
+                               'are fetched into one bare repository per project in DIR, shared by all workspaces of the '
+                               'host under file locks, and the workspace repositories borrow objects from it through git '
+                               'alternates, so updates only transfer missing objects. Repositories copied by --include-git are '
+                               'repacked to stand alone. Maintain it with "west git_cache".')
+        parser.add_argument('--seed-from', metavar='DIR',
+                          help='Update the projects without network access from DIR, holding a git bundle '
+                               '(NAME.bundle) or bare mirror (NAME.git) per project, named after the project or its '
+                               'repository. The manifest revision of every project is fetched from there and checked out.')
         
         return parser
 
@@ -106,60 +225,12 @@ Note: For custom SBOM pattern matching, use 'west sbom_collect' directly with
         """Main execution method."""
         start_time = time.time()
         self._log_with_timestamp("Starting update_board command", 'inf')
+        self.profiler = PhaseProfiler(self._log_with_timestamp, enabled=bool(getattr(args, 'profile_out', None)))
+        self.profiler.metadata.update(command='update_board', set=args.set, output=args.output)
     
         try:
-            # Validate arguments
-            self._validate_arguments(args)
-            
-            # Parse and validate set arguments
-            set_type, set_value = self._parse_set_arguments(args)
-        
-            # Initialize workspace
-            workspace_root, manifest_dir, manifest = self._init_workspace()
-        
-            # Initialize utilities with logger
-            config_loader = ConfigLoader(workspace_root, manifest_dir, self._log_with_timestamp)
-        
-            # Load configuration
-            config = self._load_configuration(config_loader, set_type, set_value)
-        
-            # Handle list-repo operation
-            if args.list_repo:
-                self._handle_list_repositories(config, manifest, args.output)
-                return
-            
-            # Process repositories and examples based on optional inclusion
-            # This needs to happen before list-sbom to respect --include-optional
-            final_repos, final_examples = self._process_optional_inclusion(config, args)
-            
-            # Filter repos by group-filter (e.g. exclude bifrost for external users)
-            project_map = {p.name: p for p in manifest.projects}
-            inactive_repos = [r for r in final_repos if r in project_map and not manifest.is_active(project_map[r])]
-            if inactive_repos:
-                self._log_with_timestamp(
-                    f"Skipping {len(inactive_repos)} repos disabled by group-filter: {inactive_repos}", 'inf')
-            final_repos = [r for r in final_repos if r not in set(inactive_repos)]
-
-            # Handle list-sbom operation
-            if args.list_sbom:
-                self._handle_list_sbom(final_repos, args.output, workspace_root)
-                return
-
-            # Get projects to update
-            projects = self._get_projects_to_update(manifest, final_repos)
-        
-            # Update repositories (conditional)
-            if not args.no_update:
-                self._update_projects(workspace_root, projects)
-            else:
-                self._log_with_timestamp("Skipping repository update as requested", 'inf')
-                self._validate_projects_exist(workspace_root, projects)
-        
-            # Create package if requested
-            if args.output:
-                self._create_package(config_loader, config, args, projects, final_repos, final_examples)
-            else:
-                self._log_with_timestamp("Repository update completed. No package creation requested.", 'inf')
+            with self.profiler.phase('update_board', 'command'):
+                self._run(args)
             
             elapsed_time = time.time() - start_time
             self._log_with_timestamp(f"Command completed successfully in {elapsed_time:.2f} seconds", 'inf')
@@ -171,6 +242,110 @@ Note: For custom SBOM pattern matching, use 'west sbom_collect' directly with
             elapsed_time = time.time() - start_time
             self._log_with_timestamp(f"Command failed after {elapsed_time:.2f} seconds: {e}", 'err')
             self.die(f"Command failed: {e}")
+        finally:
+            if self.profiler.enabled:
+                try:
+                    self.profiler.write(self._resolve_output_path(args.profile_out, self.topdir))
+                except OSError as e:
+                    self._log_with_timestamp(f"Failed to write profile {args.profile_out}: {e}", 'wrn')
+
+    def _run(self, args):
+        """Run the requested operation."""
+        # Validate arguments
+        self._validate_arguments(args)
+        
+        # Parse and validate set arguments
+        set_type, set_value = self._parse_set_arguments(args)
+    
+        # Initialize workspace
+        with self.profiler.phase('workspace'):
+            workspace_root, manifest_dir, context = self._init_workspace()
+    
+        # Initialize utilities with logger
+        config_loader = ConfigLoader(workspace_root, manifest_dir, self._log_with_timestamp, context)
+    
+        # Load configuration
+        with self.profiler.phase('configuration'):
+            config = self._load_configuration(config_loader, set_type, set_value)
+        if args.layered and not config.source_boards:
+            self._log_with_timestamp("--layered requires a set of several boards, use --set device", 'err')
+            raise Exception(f"Set '{set_value}' has no source boards to layer, --layered is only valid with --set device")
+    
+        # Handle list-repo operation
+        if args.list_repo:
+            self._handle_list_repositories(config, context, args.output)
+            return
+        
+        # Process repositories and examples based on optional inclusion
+        # This needs to happen before list-sbom to respect --include-optional
+        final_repos, final_examples = self._process_optional_inclusion(config, args)
+        
+        # Filter repos by group-filter (e.g. exclude bifrost for external users)
+        inactive_repos = [r for r in final_repos if context.get_project(r) and not context.is_active(r)]
+        if inactive_repos:
+            self._log_with_timestamp(
+                f"Skipping {len(inactive_repos)} repos disabled by group-filter: {inactive_repos}", 'inf')
+        final_repos = [r for r in final_repos if r not in set(inactive_repos)]
+
+        # Derive the repositories the examples use
+        if args.repo_closure == 'report':
+            closure = self._analyze_repo_closure(workspace_root, context, config_loader, config, final_repos,
+                                                 final_examples)
+            self._handle_repo_closure_report(closure, args.output)
+            return
+        # The closure of an updated workspace is derived from the updated build files, after the projects
+        # every package keeps are updated
+        closure_after_update = args.repo_closure == 'enforce' and not args.no_update and args.plan is None
+        if args.repo_closure == 'enforce' and not closure_after_update:
+            final_repos = self._enforce_repo_closure(workspace_root, context, config_loader, config, final_repos,
+                                                     final_examples)
+
+        # Handle list-sbom operation
+        if args.list_sbom:
+            self._handle_list_sbom(final_repos, args.output, workspace_root)
+            return
+
+        # Get projects to update
+        projects = self._get_projects_to_update(context, final_repos)
+    
+        # Plan the package instead of creating it
+        if args.plan is not None:
+            self._log_with_timestamp("Planning package, repositories are not updated", 'inf')
+            self._validate_projects_exist(workspace_root, projects)
+            self._plan_package(config_loader, config, args, projects, final_repos, final_examples, context)
+            return
+        
+        # Update repositories (conditional)
+        if not args.no_update and closure_after_update:
+            kept_projects = [p for p in projects if not RepoClosureAnalyzer.is_optional_project(p.path)]
+            self._update_workspace(config_loader, config, args, workspace_root, kept_projects, final_examples)
+            final_repos = self._enforce_repo_closure(workspace_root, context, config_loader, config, final_repos,
+                                                     final_examples)
+            closure_names = {p.name for p in context.get_projects(final_repos)}
+            projects = [p for p in projects if p.name in closure_names]
+            closure_projects = [p for p in projects if p not in kept_projects]
+            if closure_projects:
+                self._update_workspace(config_loader, config, args, workspace_root, closure_projects, final_examples)
+        elif not args.no_update:
+            self._update_workspace(config_loader, config, args, workspace_root, projects, final_examples)
+        else:
+            self._log_with_timestamp("Skipping repository update as requested", 'inf')
+            self._validate_projects_exist(workspace_root, projects)
+            sparse_projects = ProjectUpdater(workspace_root, self._log_with_timestamp).get_sparse_projects(
+                [p for p in projects if p.name in SPARSE_PROJECTS])
+            if sparse_projects:
+                self._log_with_timestamp(f"Projects {[p.name for p in sparse_projects]} have a sparse checkout from "
+                                         f"an earlier --sparse update, files of other boards may be missing", 'wrn')
+    
+        # Create package if requested
+        if args.output and args.layered:
+            with self.profiler.phase('package'):
+                self._create_layered_package(config_loader, config, args, context)
+        elif args.output:
+            with self.profiler.phase('package'):
+                self._create_package(config_loader, config, args, projects, final_repos, final_examples, context)
+        else:
+            self._log_with_timestamp("Repository update completed. No package creation requested.", 'inf')
 
     def _validate_arguments(self, args):
         """Validate argument combinations."""
@@ -196,6 +371,55 @@ Note: For custom SBOM pattern matching, use 'west sbom_collect' directly with
             package_only_options.append('--include-git')
         if args.gen_doc:
             package_only_options.append('--gen-doc')
+        if args.legacy_board_match:
+            package_only_options.append('--legacy-board-match')
+        if args.keep_unsupported_examples:
+            package_only_options.append('--keep-unsupported-examples')
+        if args.plan is not None:
+            package_only_options.append('--plan')
+        if args.compression:
+            package_only_options.append('--compression')
+        if args.reproducible:
+            package_only_options.append('--reproducible')
+        if args.resume:
+            package_only_options.append('--resume')
+        if args.delta_from:
+            package_only_options.append('--delta-from')
+            if not os.path.exists(args.delta_from):
+                raise Exception(f"Previous package {args.delta_from} for --delta-from does not exist")
+            # The delta reads the previous package before anything is built
+            check_archive_backend(args.delta_from)
+        if args.layered:
+            package_only_options.append('--layered')
+            if args.resume or args.plan is not None or args.repo_closure or args.delta_from:
+                self._log_with_timestamp("--layered cannot be used with --resume, --plan, --repo-closure or --delta-from", 'err')
+                raise Exception("Options --resume, --plan, --repo-closure and --delta-from are not applicable with --layered")
+            if args.output and args.output.lower().endswith(tuple(ARCHIVE_SUFFIXES)):
+                self._log_with_timestamp("--layered writes a directory, -o/--output must not be an archive file name", 'err')
+                raise Exception("Option --layered requires -o/--output to name the output directory")
+        if (args.doc_jobs or args.no_doc_cache) and not args.gen_doc:
+            self._log_with_timestamp("--doc-jobs and --no-doc-cache require --gen-doc", 'err')
+            raise Exception("Options --doc-jobs and --no-doc-cache are only applicable with --gen-doc")
+        if args.doc_jobs < 0:
+            raise Exception("--doc-jobs must not be negative")
+        if args.seed_from and (args.sparse or args.git_cache):
+            self._log_with_timestamp("--seed-from cannot be used with --sparse or --git-cache", 'err')
+            raise Exception("Option --seed-from replaces network updates, --sparse and --git-cache do not apply")
+        for option, value in (('--sparse', args.sparse), ('--git-cache', args.git_cache),
+                              ('--seed-from', args.seed_from)):
+            if value and (args.no_update or args.list_repo or args.list_sbom):
+                self._log_with_timestamp(f"{option} cannot be used with --no-update, --list-repo or --list-sbom", 'err')
+                raise Exception(f"Option {option} only applies when repositories are updated")
+        
+        if args.repo_closure and (args.list_repo or args.list_sbom):
+            self._log_with_timestamp("--repo-closure cannot be used with --list-repo or --list-sbom", 'err')
+            raise Exception("Option --repo-closure is not applicable with --list-repo or --list-sbom")
+        if args.repo_closure == 'report':
+            options = package_only_options + [option for option, value in (
+                ('--sparse', args.sparse), ('--git-cache', args.git_cache), ('--seed-from', args.seed_from)) if value]
+            if options:
+                self._log_with_timestamp(f"Invalid argument combination: {', '.join(options)} cannot be used with --repo-closure report", 'err')
+                raise Exception(f"Options {', '.join(options)} are not applicable with --repo-closure report")
         
         # --include-optional can be used with --list-sbom, so don't add it to package_only_options
         # Package-only options should not be used with --list-repo or --list-sbom
@@ -243,17 +467,18 @@ Note: For custom SBOM pattern matching, use 'west sbom_collect' directly with
         self._log_with_timestamp(f"Parsed arguments: type={set_type}, value={set_value}", 'dbg')
         return set_type, set_value.strip()
 
-    def _init_workspace(self) -> Tuple[str, str, Manifest]:
+    def _init_workspace(self) -> Tuple[str, str, WorkspaceContext]:
         """Initialize workspace."""
         try:
-            manifest = Manifest.from_topdir()
+            # Reuse the manifest west already resolved to discover extension commands
+            context = WorkspaceContext.from_manifest(self.manifest, self._log_with_timestamp)
             workspace_root = self.topdir
-            manifest_dir = os.path.dirname(self.manifest.path)
+            manifest_dir = context.manifest_dir
             
             self._log_with_timestamp(f"Workspace root: {workspace_root}", 'dbg')
             self._log_with_timestamp(f"Manifest directory: {manifest_dir}", 'dbg')
             
-            return workspace_root, manifest_dir, manifest
+            return workspace_root, manifest_dir, context
         except Exception as e:
             self._log_with_timestamp(f"Error initializing workspace: {e}", 'err')
             raise Exception(f"Error initializing workspace: {e}")
@@ -321,15 +546,15 @@ Note: For custom SBOM pattern matching, use 'west sbom_collect' directly with
         self._log_with_timestamp(f"Using absolute path: {output_file}", 'dbg')
         return output_file
 
-    def _handle_list_repositories(self, config: BoardConfig, manifest: Manifest, output_file: str = None):
+    def _handle_list_repositories(self, config: BoardConfig, context: WorkspaceContext, output_file: str = None):
         """Handle repository listing operation."""
         self._log_with_timestamp("Generating repository information in YAML format", 'inf')
         
         # Collect all repositories (core + optional), filtered by group-filter
-        project_map = {p.name: p for p in manifest.projects}
+        project_map = context.projects_by_name
         all_repos = set(
             name for name in config.repo_list + config.optional_repos
-            if name not in project_map or manifest.is_active(project_map[name])
+            if name not in project_map or context.is_active(name)
         )
         self._log_with_timestamp(f"Processing {len(all_repos)} repositories", 'dbg')
         
@@ -395,6 +620,34 @@ Note: For custom SBOM pattern matching, use 'west sbom_collect' directly with
         
         self._log_with_timestamp(f"Listed {len(all_repos)} repositories ({len(config.repo_list)} core, {len(config.optional_repos)} optional)", 'inf')
 
+    def _handle_repo_closure_report(self, closure, output_file: str = None):
+        """Handle repository closure report operation."""
+        report = {
+            'used': {repo: closure.reasons.get(repo, []) for repo in closure.required},
+            'unused': closure.unused,
+            'always_kept': closure.always_kept,
+        }
+        if closure.missing:
+            report['missing'] = {repo: closure.reasons.get(repo, []) for repo in closure.missing}
+        yaml_output = yaml.dump(report, default_flow_style=False, sort_keys=False, indent=2)
+        print(yaml_output)
+        
+        if output_file and output_file.lower().endswith(('.yml', '.yaml')):
+            try:
+                abs_output_file = self._resolve_output_path(output_file, self.topdir)
+                output_dir = os.path.dirname(abs_output_file)
+                if output_dir:
+                    os.makedirs(output_dir, exist_ok=True)
+                with open(abs_output_file, 'w', encoding='utf-8') as f:
+                    f.write(yaml_output)
+                self._log_with_timestamp(f"Repository closure written to: {abs_output_file}", 'inf')
+            except (IOError, OSError) as e:
+                self._log_with_timestamp(f"Failed to write repository closure to file: {e}", 'err')
+                raise Exception(f"Failed to write repository closure to file: {e}")
+        
+        self._log_with_timestamp(f"Examples use {len(closure.required)} repositories, {len(closure.unused)} unused, "
+                                 f"{len(closure.always_kept)} always kept ({closure.scanned_files} build files scanned)", 'inf')
+
     def _handle_list_sbom(self, repo_list: List[str], output_file: str, workspace_root: str):
         """Handle SBOM collection operation by calling west sbom_collect."""
         self._log_with_timestamp("Starting SBOM collection for configured repositories", 'inf')
@@ -498,13 +751,50 @@ Note: For custom SBOM pattern matching, use 'west sbom_collect' directly with
         
         return final_repos, final_examples
 
-    def _get_projects_to_update(self, manifest: Manifest, repo_list: List[str]) -> List:
+    def _analyze_repo_closure(self, workspace_root: str, context: WorkspaceContext, config_loader: ConfigLoader,
+                              config: BoardConfig, repo_list: List[str], example_list: List[str]):
+        """Analyze the repositories the examples use, from the build files checked out in the workspace."""
+        with self.profiler.phase('repo_closure'):
+            return RepoClosureAnalyzer(workspace_root, context, self._log_with_timestamp).analyze(
+                repo_list, example_list, config_loader.get_filtering_boards(config))
+
+    def _enforce_repo_closure(self, workspace_root: str, context: WorkspaceContext, config_loader: ConfigLoader,
+                              config: BoardConfig, repo_list: List[str], example_list: List[str]) -> List[str]:
+        """Leave out the repositories no example uses, failing when the examples cannot be analyzed."""
+        closure = self._analyze_repo_closure(workspace_root, context, config_loader, config, repo_list, example_list)
+        if example_list and not closure.scanned_files:
+            self._log_with_timestamp("--repo-closure enforce found no build files of the examples, "
+                                     "the examples project is not checked out", 'err')
+            raise Exception("Repository closure cannot be enforced without the build files of the examples")
+        if closure.missing:
+            self._log_with_timestamp(f"Examples use repositories the set does not list: {closure.missing}", 'wrn')
+        self._log_with_timestamp(f"Leaving out {len(closure.unused)} repositories no example uses: {closure.unused}", 'inf')
+        return closure.repos
+
+    def _update_workspace(self, config_loader: ConfigLoader, config: BoardConfig, args, workspace_root: str,
+                          projects: List, final_examples: List[str]):
+        """Update projects with the update method selected by the arguments."""
+        with self.profiler.phase('update', projects=len(projects)):
+            git_cache = self._prepare_git_cache(args, workspace_root, projects)
+            # Cache repositories stay locked shared so that maintenance cannot run during the update
+            with git_cache.shared([p.url for p in projects]) if git_cache else contextlib.nullcontext():
+                if args.seed_from:
+                    self._seed_projects(args.seed_from, workspace_root, projects)
+                elif args.sparse:
+                    self._update_projects_sparse(config_loader, config, args, workspace_root, projects,
+                                                 final_examples)
+                else:
+                    self._update_projects(workspace_root, projects)
+                if not args.sparse:
+                    self._disable_sparse_checkouts(workspace_root, projects)
+
+    def _get_projects_to_update(self, context: WorkspaceContext, repo_list: List[str]) -> List:
         """Get projects to update from manifest, respecting group filters."""
-        all_matched = [p for p in manifest.projects if p.name in repo_list]
-        projects = [p for p in all_matched if manifest.is_active(p)]
+        all_matched = context.get_projects(repo_list)
+        projects = [p for p in all_matched if context.is_active(p)]
 
         # Log filtered-out projects
-        filtered_out = [p.name for p in all_matched if not manifest.is_active(p)]
+        filtered_out = [p.name for p in all_matched if not context.is_active(p)]
         if filtered_out:
             self._log_with_timestamp(
                 f"Skipping {len(filtered_out)} inactive projects (disabled by group-filter): {filtered_out}", 'inf')
@@ -546,6 +836,70 @@ Note: For custom SBOM pattern matching, use 'west sbom_collect' directly with
                 self._log_with_timestamp(f"Error output: {e.stderr.strip()}", 'err')
             raise Exception(f"Update failed: {e.stderr}")
 
+    def _prepare_git_cache(self, args, workspace_root: str, projects: List):
+        """Populate the shared git object cache and attach it to the project repositories."""
+        cache_dir = args.git_cache or os.environ.get(GIT_CACHE_ENV)
+        if not cache_dir:
+            return None
+        
+        git_cache = GitObjectCache(cache_dir, self._log_with_timestamp)
+        self._log_with_timestamp(f"Using git object cache: {git_cache.cache_dir}", 'inf')
+        start_time = time.time()
+        with self.profiler.phase('update:git_cache', 'update'):
+            cache_repos = git_cache.populate_projects(projects)
+            for project in projects:
+                if project.name in cache_repos:
+                    git_cache.attach(project, os.path.join(workspace_root, project.path), cache_repos[project.name])
+        self._log_with_timestamp(f"Git cache ready for {len(cache_repos)} of {len(projects)} projects "
+                                 f"in {time.time() - start_time:.2f} seconds", 'inf')
+        return git_cache
+
+    def _seed_projects(self, seed_dir: str, workspace_root: str, projects: List):
+        """Update projects from local git bundles or bare mirrors."""
+        if not os.path.isdir(seed_dir):
+            raise Exception(f"Seed directory not found: {seed_dir}")
+        updater = ProjectUpdater(workspace_root, self._log_with_timestamp)
+        missing = [p.name for p in projects if updater.find_seed_source(seed_dir, p) is None]
+        if missing:
+            self._log_with_timestamp(f"No bundle or mirror found in {seed_dir} for {len(missing)} projects: {missing}", 'err')
+            raise Exception(f"Missing seed sources for projects: {', '.join(missing)}")
+        
+        self._log_with_timestamp(f"Seeding {len(projects)} repositories from {seed_dir}", 'inf')
+        start_time = time.time()
+        try:
+            updater.seed_projects(projects, seed_dir)
+        except RuntimeError as e:
+            self._log_with_timestamp(f"Seeding failed: {e}", 'err')
+            raise Exception(f"Update failed: {e}")
+        self._log_with_timestamp(f"Repository seeding completed in {time.time() - start_time:.2f} seconds", 'inf')
+
+    def _update_projects_sparse(self, config_loader: ConfigLoader, config: BoardConfig, args, workspace_root: str,
+                                projects: List, example_list: List[str]):
+        """Update board filtered projects sparsely and the other projects with west update."""
+        sparse_projects = [p for p in projects if p.name in SPARSE_PROJECTS]
+        other_projects = [p for p in projects if p.name not in SPARSE_PROJECTS]
+        if other_projects:
+            self._update_projects(workspace_root, other_projects)
+        
+        board_list = config_loader.get_filtering_boards(config)
+        start_time = time.time()
+        try:
+            ProjectUpdater(workspace_root, self._log_with_timestamp).update_sparse(
+                sparse_projects, board_list, example_list, args.legacy_board_match)
+        except RuntimeError as e:
+            self._log_with_timestamp(f"Sparse update failed: {e}", 'err')
+            raise Exception(f"Update failed: {e}")
+        self._log_with_timestamp(f"Sparse repository update completed in {time.time() - start_time:.2f} seconds", 'inf')
+
+    def _disable_sparse_checkouts(self, workspace_root: str, projects: List):
+        """Restore full checkouts of projects left sparse by an earlier --sparse update."""
+        try:
+            ProjectUpdater(workspace_root, self._log_with_timestamp).disable_sparse(
+                [p for p in projects if p.name in SPARSE_PROJECTS])
+        except RuntimeError as e:
+            self._log_with_timestamp(f"Restoring full checkouts failed: {e}", 'err')
+            raise Exception(f"Update failed: {e}")
+
     def _validate_projects_exist(self, workspace_root: str, projects: List):
         """Validate that required projects exist in the workspace when skipping update."""
         if not projects:
@@ -593,13 +947,8 @@ Note: For custom SBOM pattern matching, use 'west sbom_collect' directly with
         
         self._log_with_timestamp(f"All {len(projects)} required projects are present in workspace", 'inf')
 
-    def _create_package(self, config_loader: ConfigLoader, config: BoardConfig, args, 
-                       projects: List, final_repos: List[str], final_examples: List[str]):
-        """Create package using PackageCreator."""
-        # Resolve output path to absolute
-        abs_output = self._resolve_output_path(args.output, self.topdir)
-        self._log_with_timestamp(f"Creating package: {abs_output}", 'inf')
-        
+    def _get_package_options(self, config_loader: ConfigLoader, config: BoardConfig, args) -> PackageOptions:
+        """Get package options from the command line arguments."""
         # Get board list for filtering
         board_list = config_loader.get_filtering_boards(config)
         self._log_with_timestamp(f"Using board filter (including dependencies): {board_list}", 'dbg')
@@ -608,13 +957,56 @@ Note: For custom SBOM pattern matching, use 'west sbom_collect' directly with
         options = PackageOptions(
             include_git=args.include_git,
             generate_docs=args.gen_doc,
-            board_filter=board_list
+            board_filter=board_list,
+            legacy_board_match=args.legacy_board_match,
+            doc_jobs=args.doc_jobs,
+            doc_cache=not args.no_doc_cache,
+            compression=args.compression or DEFAULT_COMPRESSION_PRESET,
+            reproducible=args.reproducible,
+            resume=args.resume,
+            keep_unsupported_examples=args.keep_unsupported_examples
         )
         
         self._log_with_timestamp(f"Package options: git={options.include_git}, docs={options.generate_docs}", 'dbg')
+        return options
+
+    def _plan_package(self, config_loader: ConfigLoader, config: BoardConfig, args,
+                      projects: List, final_repos: List[str], final_examples: List[str],
+                      context: WorkspaceContext):
+        """Plan the package using PackagePlanner and log the summary."""
+        abs_output = self._resolve_output_path(args.output, self.topdir)
+        options = self._get_package_options(config_loader, config, args)
+        
+        planner = PackagePlanner(self.topdir, self._log_with_timestamp, context)
+        plan = planner.plan_package(abs_output, projects, final_repos, final_examples, options)
+        
+        self._log_with_timestamp(f"Package plan for {abs_output}:", 'inf')
+        for planned in plan.projects.values():
+            self._log_with_timestamp(f"  {planned.name:30s} {planned.files:8d} files "
+                                     f"{planned.bytes / (1024 * 1024):10.1f} MB", 'inf')
+        for path, size in plan.members:
+            self._log_with_timestamp(f"  {path} ({size} bytes)", 'dbg')
+        if plan.doc_boards:
+            self._log_with_timestamp(f"  Documentation for {len(plan.doc_boards)} boards: {plan.doc_boards}", 'inf')
+        self._log_with_timestamp(f"Planned {plan.total_files} files, {plan.total_bytes / (1024 * 1024):.1f} MB, "
+                                 f"estimated archive size {plan.estimated_compressed_bytes / (1024 * 1024):.1f} MB, "
+                                 f"estimated creation time {plan.estimated_seconds:.0f} seconds", 'inf')
+        
+        if args.plan:
+            planner.write_plan(plan, self._resolve_output_path(args.plan, self.topdir))
+
+    def _create_package(self, config_loader: ConfigLoader, config: BoardConfig, args, 
+                       projects: List, final_repos: List[str], final_examples: List[str],
+                       context: WorkspaceContext):
+        """Create package using PackageCreator."""
+        # Resolve output path to absolute
+        abs_output = self._resolve_output_path(args.output, self.topdir)
+        self._log_with_timestamp(f"Creating package: {abs_output}", 'inf')
+        
+        options = self._get_package_options(config_loader, config, args)
         
         # Create package with logger
-        package_creator = PackageCreator(self.topdir, self._log_with_timestamp)
+        package_creator = PackageCreator(self.topdir, self._log_with_timestamp, context, self.profiler)
         
         start_time = time.time()
         package_creator.create_package(abs_output, projects, final_repos, final_examples, options)
@@ -626,3 +1018,40 @@ Note: For custom SBOM pattern matching, use 'west sbom_collect' directly with
             self._log_with_timestamp(f"Package created: {abs_output} ({size_mb:.1f} MB) in {elapsed_time:.2f} seconds", 'inf')
         else:
             self._log_with_timestamp(f"Package creation completed in {elapsed_time:.2f} seconds, but file not found", 'wrn')
+        
+        if args.delta_from:
+            with self.profiler.phase('delta'):
+                previous = self._resolve_output_path(args.delta_from, self.topdir)
+                PackageDeltaWriter(self._log_with_timestamp).create_delta(previous, abs_output)
+
+    def _create_layered_package(self, config_loader: ConfigLoader, config: BoardConfig, args,
+                                context: WorkspaceContext):
+        """Create a layered package for the source boards of the set using PackageCreator."""
+        abs_output = self._resolve_output_path(args.output, self.topdir)
+        self._log_with_timestamp(f"Creating layered package for boards {config.source_boards}: {abs_output}", 'inf')
+        
+        # Every board package is filtered with the repositories, examples and boards of its own configuration
+        boards = []
+        for board_name in config.source_boards:
+            board_config = config_loader.load_board_config(board_name)
+            repos, examples = self._process_optional_inclusion(board_config, args)
+            repos = [r for r in repos if not (context.get_project(r) and not context.is_active(r))]
+            boards.append(LayeredBoard(
+                name=board_name,
+                projects=self._get_projects_to_update(context, repos),
+                repo_list=repos,
+                example_list=examples,
+                board_filter=config_loader.get_filtering_boards(board_config)
+            ))
+        
+        options = self._get_package_options(config_loader, config, args)
+        package_creator = PackageCreator(self.topdir, self._log_with_timestamp, context, self.profiler)
+        
+        start_time = time.time()
+        manifest = package_creator.create_layered_package(abs_output, boards, options)
+        elapsed_time = time.time() - start_time
+        
+        total_mb = sum(os.path.getsize(os.path.join(abs_output, name)) for name in
+                       [manifest['base']['archive']] + [b['overlay'] for b in manifest['boards'].values()]) / (1024 * 1024)
+        self._log_with_timestamp(f"Layered package created: {os.path.join(abs_output, LAYERS_MANIFEST_NAME)} "
+                                 f"({len(boards)} boards, {total_mb:.1f} MB) in {elapsed_time:.2f} seconds", 'inf')
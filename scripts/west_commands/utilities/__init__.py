@@ -7,17 +7,38 @@ SDK utilities package for west commands.
 This package provides reusable utilities for SDK operations including:
 - Device to board mapping
 - Configuration loading and management  
-- Package creation and filtering
+- Package creation, planning and filtering
+- Board-aware sparse project updates
+- Board configuration indexes
+- Persistent workspace caching
+- Shared resolved manifest context
+- Phase profiling
 """
 
 from .device_board_mapper import DeviceBoardMapper
 from .config_loader import ConfigLoader, BoardConfig
 from .package_creator import PackageCreator, PackageOptions
+from .package_planner import PackagePlanner, PackagePlan
+from .workspace_cache import WorkspaceCache
+from .workspace_context import WorkspaceContext, ProjectRecord
+from .board_matcher import BoardKeyMatcher
+from .profiler import PhaseProfiler
+from .project_updater import ProjectUpdater
+from .board_index import BoardIndex
 
 __all__ = [
     'DeviceBoardMapper',
     'ConfigLoader', 
     'BoardConfig',
     'PackageCreator',
-    'PackageOptions'
+    'PackageOptions',
+    'PackagePlanner',
+    'PackagePlan',
+    'WorkspaceCache',
+    'WorkspaceContext',
+    'ProjectRecord',
+    'BoardKeyMatcher',
+    'PhaseProfiler',
+    'ProjectUpdater',
+    'BoardIndex'
 ]
@@ -0,0 +1,384 @@
+# Copyright 2025 NXP
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Archive writer utility.
+
+This module provides the package output backends: zip (the default), and
+tar.zst or tar.xz tarballs. The format is chosen from the output file name.
+Tarballs are compressed as one stream, by the multithreaded zstd or xz
+command line tools when available and by Python modules otherwise.
+
+Writers created with a timestamp are reproducible: every member gets that
+modification time and normalized permissions, so identical content yields
+byte-identical archives with the same compressor.
+
+Files are hashed (SHA-256) while they are read for compression, so the
+package index costs no extra read of the content.
+"""
+
+import os
+import stat
+import time
+import shutil
+import hashlib
+import tarfile
+import zipfile
+import subprocess
+from typing import Callable, Optional
+from .compression_policy import CompressionPolicy, DEFAULT_COMPRESSION_PRESET
+
+
+# Output file suffixes and the archive formats they select
+ARCHIVE_SUFFIXES = {
+    '.tar.zst': 'tar.zst',
+    '.tzst': 'tar.zst',
+    '.tar.xz': 'tar.xz',
+    '.txz': 'tar.xz',
+    '.zip': 'zip',
+}
+DEFAULT_ARCHIVE_FORMAT = 'zip'
+
+# Compression levels of the tarball formats per compression preset
+ZSTD_LEVELS = {'fast': 3, 'balanced': 12, 'smallest': 19}
+XZ_LEVELS = {'fast': 1, 'balanced': 6, 'smallest': 9}
+# zstd long-distance matching window (2^27 = 128 MiB, decodable without extra options)
+ZSTD_WINDOW_LOG = 27
+
+# Member timestamp of reproducible archives when SOURCE_DATE_EPOCH is not set,
+# the earliest date zip can represent (1980-01-01 00:00:00 UTC)
+DEFAULT_SOURCE_DATE_EPOCH = 315532800
+# Normalized permissions of reproducible archive members
+REPRODUCIBLE_FILE_MODE = 0o644
+REPRODUCIBLE_EXEC_MODE = 0o755
+REPRODUCIBLE_DIR_MODE = 0o755
+REPRODUCIBLE_LINK_MODE = 0o777
+# Chunk size of file content streamed into zip members
+ZIP_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def get_archive_format(output_path: str) -> str:
+    """Get the archive format selected by an output file name, zip for unknown suffixes."""
+    name = output_path.lower()
+    for suffix, archive_format in ARCHIVE_SUFFIXES.items():
+        if name.endswith(suffix):
+            return archive_format
+    return DEFAULT_ARCHIVE_FORMAT
+
+
+def check_archive_backend(output_path: str) -> None:
+    """
+    Check that the archive format selected by a file name can be written and read.
+
+    Raises:
+        RuntimeError: If no compressor is available for the format
+    """
+    if get_archive_format(output_path) == 'tar.zst' and not shutil.which('zstd'):
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            raise RuntimeError(f"tar.zst packages ({output_path}) require the 'zstd' command line tool "
+                               f"or the 'zstandard' Python package")
+
+
+def get_source_date_epoch(logger: Callable[[str, str], None] = None) -> int:
+    """Get the timestamp of reproducible archive members from SOURCE_DATE_EPOCH."""
+    value = os.environ.get('SOURCE_DATE_EPOCH')
+    if value:
+        try:
+            return max(int(value), DEFAULT_SOURCE_DATE_EPOCH)
+        except ValueError:
+            if logger:
+                logger(f"Ignoring invalid SOURCE_DATE_EPOCH '{value}'", 'wrn')
+    return DEFAULT_SOURCE_DATE_EPOCH
+
+
+class HashingReader:
+    """File object wrapper computing the SHA-256 digest of the data read through it."""
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.sha = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.fileobj.read(size)
+        self.sha.update(data)
+        return data
+
+    def hexdigest(self) -> str:
+        return self.sha.hexdigest()
+
+
+def normalized_mode(path: str) -> int:
+    """Get the normalized permission bits of a reproducible archive member."""
+    mode = os.lstat(path).st_mode
+    if stat.S_ISLNK(mode):
+        return REPRODUCIBLE_LINK_MODE
+    if stat.S_ISDIR(mode):
+        return REPRODUCIBLE_DIR_MODE
+    # Only the executable bit of files is kept
+    return REPRODUCIBLE_EXEC_MODE if mode & 0o111 else REPRODUCIBLE_FILE_MODE
+
+
+class ArchiveWriter:
+    """
+    Base class of package archive writers, used as a context manager.
+
+    With a timestamp (seconds since the epoch) the archive is reproducible:
+    members carry that time and normalized permissions instead of the
+    metadata of the staged files.
+    """
+
+    archive_format = None
+    supports_checkpoints = False
+
+    def __init__(self, output_path: str, policy: Optional[CompressionPolicy] = None,
+                 logger: Callable[[str, str], None] = None, timestamp: Optional[int] = None,
+                 append: bool = False):
+        self.output_path = output_path
+        self.policy = policy or CompressionPolicy()
+        self.logger = logger or self._default_logger
+        self.timestamp = timestamp
+        self.append = append
+
+    def _default_logger(self, message: str, level: str = 'inf'):
+        """Default logger that does nothing."""
+        pass
+
+    def __enter__(self) -> 'ArchiveWriter':
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close(success=exc_type is None)
+
+    def open(self) -> None:
+        raise NotImplementedError
+
+    def close(self, success: bool = True) -> None:
+        raise NotImplementedError
+
+    def checkpoint(self) -> int:
+        """
+        Make everything written so far a valid archive on disk, writing continues afterwards.
+
+        Returns:
+            Offset where the member data ends and the archive index begins
+        """
+        raise NotImplementedError
+
+    def add_directory(self, src_path: str, arc_path: str) -> None:
+        """Add a directory entry (arc_path without trailing slash)."""
+        raise NotImplementedError
+
+    def add_file(self, src_path: str, arc_path: str, size: int) -> str:
+        """
+        Add a regular file.
+
+        Returns:
+            SHA-256 hex digest of the content, computed while it is read for compression
+        """
+        raise NotImplementedError
+
+    def add_symlink(self, symlink_path: str, arc_path: str) -> None:
+        """Add a symbolic link, preserved as a link."""
+        raise NotImplementedError
+
+
+class ZipArchiveWriter(ArchiveWriter):
+    """Zip output, compressed per member according to the compression policy."""
+
+    archive_format = 'zip'
+    supports_checkpoints = True
+
+    def open(self) -> None:
+        mode = 'a' if self.append else 'w'
+        self.zipf = zipfile.ZipFile(self.output_path, mode, zipfile.ZIP_DEFLATED, compresslevel=6)
+
+    def close(self, success: bool = True) -> None:
+        self.zipf.close()
+
+    def checkpoint(self) -> int:
+        # Closing writes the central directory, members added after reopening overwrite it
+        self.zipf.close()
+        offset = self.zipf.start_dir
+        self.zipf = zipfile.ZipFile(self.output_path, 'a', zipfile.ZIP_DEFLATED, compresslevel=6)
+        return offset
+
+    def _zipinfo(self, arc_path: str, mode: int) -> zipfile.ZipInfo:
+        """Create the member header of a reproducible archive."""
+        zip_info = zipfile.ZipInfo(arc_path, time.gmtime(self.timestamp)[:6])
+        zip_info.create_system = 3
+        zip_info.external_attr = mode << 16
+        if stat.S_ISDIR(mode):
+            zip_info.external_attr |= 0x10  # MS-DOS directory flag
+        return zip_info
+
+    def add_directory(self, src_path: str, arc_path: str) -> None:
+        if self.timestamp is None:
+            self.zipf.writestr(arc_path + '/', '')
+        else:
+            self.zipf.writestr(self._zipinfo(arc_path + '/', stat.S_IFDIR | REPRODUCIBLE_DIR_MODE), '')
+
+    def add_file(self, src_path: str, arc_path: str, size: int) -> str:
+        compress_type, level = self.policy.decide(src_path, arc_path, size)
+        if self.timestamp is None:
+            # The header ZipFile.write would create
+            zip_info = zipfile.ZipInfo.from_file(src_path, arc_path)
+        else:
+            zip_info = self._zipinfo(arc_path, stat.S_IFREG | normalized_mode(src_path))
+        return self._write_file_member(zip_info, src_path, size, compress_type, level)
+
+    def _write_file_member(self, zip_info: zipfile.ZipInfo, src_path: str, size: int,
+                           compress_type: int, level: Optional[int]) -> str:
+        """Stream a file into a member in chunks, returning the SHA-256 hex digest of its content."""
+        zip_info.compress_type = compress_type
+        zip_info._compresslevel = level  # Alias of compress_level since Python 3.13
+        # The expected size selects zip64 headers for large members, as ZipFile.write does
+        zip_info.file_size = size
+        with open(src_path, 'rb') as f, self.zipf.open(zip_info, 'w') as dst:
+            reader = HashingReader(f)
+            shutil.copyfileobj(reader, dst, ZIP_COPY_CHUNK_SIZE)
+        return reader.hexdigest()
+
+    def add_symlink(self, symlink_path: str, arc_path: str) -> None:
+        """Add symlink to zip with proper attributes."""
+        try:
+            link_target = os.readlink(symlink_path)
+            if self.timestamp is None:
+                zip_info = zipfile.ZipInfo(arc_path)
+                zip_info.external_attr = (0o120000 | 0o755) << 16
+            else:
+                zip_info = self._zipinfo(arc_path, stat.S_IFLNK | REPRODUCIBLE_LINK_MODE)
+            zip_info.compress_type = zipfile.ZIP_STORED
+
+            target_bytes = link_target.encode('utf-8')
+            zip_info.file_size = len(target_bytes)
+            zip_info.compress_size = len(target_bytes)
+            zip_info.create_system = 3
+            zip_info.extract_version = 20
+
+            self.zipf.writestr(zip_info, target_bytes)
+            self.logger(f"Added symlink to zip: {arc_path} -> {link_target}", 'dbg')
+        except (OSError, IOError) as e:
+            # Fallback to regular file
+            self.logger(f"Failed to add symlink {symlink_path} to zip, using fallback: {e}", 'dbg')
+            if os.path.isfile(symlink_path):
+                self.zipf.write(symlink_path, arc_path)
+
+
+class TarArchiveWriter(ArchiveWriter):
+    """
+    Tarball output compressed as a single stream.
+
+    The tar stream is piped into the zstd or xz command line tool, both run
+    with one thread per core (-T0), or written through the zstandard or lzma
+    Python module when the tool is not installed.
+    """
+
+    def __init__(self, output_path: str, archive_format: str, policy: Optional[CompressionPolicy] = None,
+                 logger: Callable[[str, str], None] = None, timestamp: Optional[int] = None):
+        super().__init__(output_path, policy, logger, timestamp)
+        self.archive_format = archive_format
+        self._output = None
+        self._process = None
+        self._stream = None
+        self.tar = None
+
+    def _get_command(self) -> Optional[list]:
+        preset = self.policy.preset if self.policy else DEFAULT_COMPRESSION_PRESET
+        if self.archive_format == 'tar.zst':
+            tool = shutil.which('zstd')
+            if tool:
+                return [tool, '-q', '-T0', f'--long={ZSTD_WINDOW_LOG}', f'-{ZSTD_LEVELS[preset]}', '-c']
+        else:
+            tool = shutil.which('xz')
+            if tool:
+                # xz before 5.4 falls back to its single-threaded format with -T0 on one core;
+                # reproducible archives force the multithreaded format, whose output does not
+                # depend on the number of threads
+                threads = f'-T{max(2, os.cpu_count() or 1)}' if self.timestamp is not None else '-T0'
+                return [tool, '-q', threads, f'-{XZ_LEVELS[preset]}', '-c']
+        return None
+
+    def _open_module_stream(self):
+        """Open a compressed stream with a Python module when the command line tool is missing."""
+        preset = self.policy.preset if self.policy else DEFAULT_COMPRESSION_PRESET
+        if self.archive_format == 'tar.xz':
+            import lzma
+            self.logger("xz not found, compressing with the single-threaded lzma module", 'wrn')
+            return lzma.LZMAFile(self._output, 'wb', preset=XZ_LEVELS[preset])
+        import zstandard
+        params = zstandard.ZstdCompressionParameters.from_level(
+            ZSTD_LEVELS[preset], window_log=ZSTD_WINDOW_LOG, enable_ldm=True, threads=-1)
+        self.logger("zstd not found, compressing with the zstandard module", 'dbg')
+        return zstandard.ZstdCompressor(compression_params=params).stream_writer(self._output)
+
+    def open(self) -> None:
+        self._output = open(self.output_path, 'wb')
+        try:
+            command = self._get_command()
+            if command:
+                self.logger(f"Compressing with: {' '.join(command)}", 'dbg')
+                self._process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=self._output)
+                self._stream = self._process.stdin
+            else:
+                self._stream = self._open_module_stream()
+            self.tar = tarfile.open(fileobj=self._stream, mode='w|', format=tarfile.PAX_FORMAT)
+        except BaseException:
+            self._output.close()
+            os.remove(self.output_path)
+            raise
+
+    def close(self, success: bool = True) -> None:
+        try:
+            if self.tar is not None:
+                self.tar.close()
+            if self._stream is not None:
+                self._stream.close()
+            if self._process is not None:
+                returncode = self._process.wait()
+                if returncode != 0 and success:
+                    raise RuntimeError(f"{self.archive_format} compressor exited with code {returncode}")
+        finally:
+            self._output.close()
+
+    def _tarinfo(self, src_path: str, arc_path: str) -> tarfile.TarInfo:
+        info = self.tar.gettarinfo(src_path, arc_path)
+        # Ownership of the build machine is meaningless to package consumers
+        info.uid = info.gid = 0
+        info.uname = info.gname = ''
+        if self.timestamp is not None:
+            info.mtime = self.timestamp
+            info.mode = normalized_mode(src_path)
+        return info
+
+    def add_directory(self, src_path: str, arc_path: str) -> None:
+        self.tar.addfile(self._tarinfo(src_path, arc_path))
+
+    def add_file(self, src_path: str, arc_path: str, size: int) -> str:
+        info = self._tarinfo(src_path, arc_path)
+        with open(src_path, 'rb') as f:
+            reader = HashingReader(f)
+            self.tar.addfile(info, reader)
+        return reader.hexdigest()
+
+    def add_symlink(self, symlink_path: str, arc_path: str) -> None:
+        # gettarinfo uses lstat, so the link is stored as a SYMTYPE member with its target
+        self.tar.addfile(self._tarinfo(symlink_path, arc_path))
+        self.logger(f"Added symlink to tar: {arc_path} -> {os.readlink(symlink_path)}", 'dbg')
+
+
+def create_archive_writer(output_path: str, policy: Optional[CompressionPolicy] = None,
+                          logger: Callable[[str, str], None] = None,
+                          timestamp: Optional[int] = None, append: bool = False) -> ArchiveWriter:
+    """
+    Create the archive writer for the format selected by the output file name.
+
+    With append, a zip archive is continued instead of replaced; tarballs are
+    always written from the start.
+    """
+    archive_format = get_archive_format(output_path)
+    if archive_format == 'zip':
+        return ZipArchiveWriter(output_path, policy, logger, timestamp, append)
+    return TarArchiveWriter(output_path, archive_format, policy, logger, timestamp)
@@ -0,0 +1,287 @@
+# Copyright 2025 NXP
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Board configuration index utility.
+
+This module loads all board configurations at once, with their
+controlled-access overlays, and builds reverse indexes over them: from each
+repository to the boards whose packages include it, from each example
+category to the boards providing it, from each board to the boards that
+depend on it, and, with the tool data device mapping, between devices and
+boards. They answer questions across boards, such as which board packages a
+change affects or the whole board by repository matrix, without loading the
+configurations board by board.
+
+The loaded configurations are persisted in the workspace cache and reused
+while the board configuration directories are unchanged.
+"""
+
+import os
+import yaml
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from .config_loader import BoardConfig, ConfigLoader
+from .workspace_cache import WorkspaceCache, directory_stamp
+
+
+BOARD_INDEX_CACHE_NAME = 'board_index'
+BOARD_FILE_EXTENSIONS = ('.yml', '.yaml')
+# Matrix cell values of required and optional repositories
+MATRIX_REQUIRED = 'R'
+MATRIX_OPTIONAL = 'O'
+
+
+class BoardIndex:
+    """Reverse indexes over all board configurations of a workspace."""
+
+    def __init__(self, configs: Iterable[BoardConfig], logger: Callable[[str, str], None] = None):
+        self.logger = logger or self._default_logger
+        self.configs: Dict[str, BoardConfig] = {config.name: config for config in configs}
+        self.repo_boards: Dict[str, Set[str]] = {}
+        self.optional_repo_boards: Dict[str, Set[str]] = {}
+        self.dependent_boards: Dict[str, Set[str]] = {}
+        self.category_boards: Dict[str, Set[str]] = {}
+        self.optional_category_boards: Dict[str, Set[str]] = {}
+        self.device_boards: Dict[str, List[str]] = {}
+        self.board_devices: Dict[str, List[str]] = {}
+
+        for name, config in self.configs.items():
+            for repo in config.repo_list:
+                self.repo_boards.setdefault(repo, set()).add(name)
+            for repo in config.optional_repos:
+                self.optional_repo_boards.setdefault(repo, set()).add(name)
+            for dependency in config.board_dependencies:
+                self.dependent_boards.setdefault(dependency, set()).add(name)
+            for example in config.example_list:
+                self.category_boards.setdefault(self.get_category(example), set()).add(name)
+            for example in config.optional_examples:
+                self.optional_category_boards.setdefault(self.get_category(example), set()).add(name)
+
+        self.logger(f"Board index ready: {len(self.configs)} boards, "
+                    f"{len(set(self.repo_boards) | set(self.optional_repo_boards))} repositories", 'dbg')
+
+    def _default_logger(self, message: str, level: str = 'inf'):
+        """Default logger that does nothing."""
+        pass
+
+    @classmethod
+    def build(cls, config_loader: ConfigLoader, board_data: Optional[Dict[str, Dict]] = None,
+              logger: Callable[[str, str], None] = None) -> 'BoardIndex':
+        """
+        Build the index from the board configurations of a workspace.
+
+        Args:
+            config_loader: Loader of the workspace, merges the controlled-access configurations
+            board_data: YAML data of the boards keyed by board name, e.g. read at a manifest
+                revision; by default the board files of the manifest directory are read
+
+        Returns:
+            Index over all boards
+        """
+        if board_data is None:
+            board_data = {}
+            boards_dir = os.path.join(config_loader.manifest_dir, 'boards')
+            for board_name in config_loader.device_mapper.get_available_boards():
+                try:
+                    with open(os.path.join(boards_dir, f'{board_name}.yml'), 'r', encoding='utf-8') as f:
+                        board_data[board_name] = yaml.safe_load(f) or {}
+                except (OSError, yaml.YAMLError) as e:
+                    config_loader.logger(f"Skipping unreadable board configuration {board_name}: {e}", 'wrn')
+        configs = [config_loader.create_board_config(name, data) for name, data in sorted(board_data.items())]
+        return cls(configs, logger)
+
+    @classmethod
+    def load(cls, config_loader: ConfigLoader, refresh: bool = False,
+             logger: Callable[[str, str], None] = None) -> 'BoardIndex':
+        """
+        Get the index of the workspace board configurations, from the workspace cache when valid.
+
+        The cache entry is valid while the board configuration directory and
+        the controlled-access board directory are unchanged.
+
+        Args:
+            config_loader: Loader of the workspace
+            refresh: Whether to rebuild the index even if the cached one is valid
+
+        Returns:
+            Index over all boards
+        """
+        cache = WorkspaceCache(config_loader.workspace_root, config_loader.logger)
+        stamp = {
+            'boards': directory_stamp(os.path.join(config_loader.manifest_dir, 'boards'), BOARD_FILE_EXTENSIONS),
+            'controlled': directory_stamp(os.path.join(config_loader.workspace_root, 'bifrost', 'boards'),
+                                          BOARD_FILE_EXTENSIONS),
+        }
+        payload = None if refresh else cache.load_json(BOARD_INDEX_CACHE_NAME)
+        if payload and payload.get('stamp') == stamp:
+            try:
+                configs = [cls._config_from_dict(data) for data in payload['boards']]
+                config_loader.logger(f"Loaded board index for {len(configs)} boards from workspace cache", 'dbg')
+                return cls(configs, logger)
+            except (KeyError, TypeError) as e:
+                config_loader.logger(f"Ignoring malformed board index cache entry: {e}", 'dbg')
+
+        index = cls.build(config_loader, logger=logger)
+        if stamp['boards'] is not None:
+            cache.store_json(BOARD_INDEX_CACHE_NAME, {
+                'stamp': stamp,
+                'boards': [config.to_dict() for config in index.configs.values()],
+            })
+        return index
+
+    @staticmethod
+    def _config_from_dict(data: Dict) -> BoardConfig:
+        """Recreate a board configuration from its dictionary format."""
+        return BoardConfig(
+            name=data['board_name'],
+            repo_list=data['repo_list'],
+            example_list=data['example_list'],
+            optional_repos=data.get('optional_repos'),
+            optional_examples=data.get('optional_examples'),
+            board_dependencies=data.get('board_dependencies')
+        )
+
+    @staticmethod
+    def get_category(example: str) -> str:
+        """Get the category of an example, the first component of its path."""
+        return example.replace('\\', '/').strip('/').split('/', 1)[0]
+
+    def set_devices(self, device_map: Dict[str, List[str]]) -> None:
+        """Index the devices of the tool data mapping, keeping the boards with a configuration."""
+        self.device_boards = {}
+        self.board_devices = {}
+        for device, boards in sorted(device_map.items()):
+            boards = [board for board in boards if board in self.configs]
+            if not boards:
+                continue
+            self.device_boards[device] = boards
+            for board in boards:
+                self.board_devices.setdefault(board, []).append(device)
+        self.logger(f"Indexed {len(self.device_boards)} devices with board configurations", 'dbg')
+
+    def get_boards_for_repo(self, repo: str, include_optional: bool = True) -> Set[str]:
+        """Get the boards whose packages include a repository."""
+        boards = set(self.repo_boards.get(repo, ()))
+        if include_optional:
+            boards |= self.optional_repo_boards.get(repo, set())
+        return boards
+
+    def get_repos(self) -> List[str]:
+        """Get all repositories included by any board, sorted."""
+        return sorted(set(self.repo_boards) | set(self.optional_repo_boards))
+
+    def get_boards_for_examples(self, path: str, include_optional: bool = True) -> Set[str]:
+        """
+        Get the boards providing an example category, or the examples below a path.
+
+        Args:
+            path: Example category (e.g. driver_examples) or example path prefix
+                (e.g. driver_examples/lpuart)
+            include_optional: Whether optional examples of the boards count
+        """
+        path = path.replace('\\', '/').strip('/')
+        if '/' not in path:
+            boards = set(self.category_boards.get(path, ()))
+            if include_optional:
+                boards |= self.optional_category_boards.get(path, set())
+            return boards
+
+        prefix = path + '/'
+        boards = set()
+        for name in self.get_boards_for_examples(self.get_category(path), include_optional):
+            config = self.configs[name]
+            if any(example == path or example.startswith(prefix)
+                   for example in config.get_all_examples(include_optional)):
+                boards.add(name)
+        return boards
+
+    def find_device(self, device: str) -> Optional[str]:
+        """Find an indexed device by name, exact first, then partial, ignoring case."""
+        device_lower = device.lower()
+        for name in self.device_boards:
+            if name.lower() == device_lower:
+                return name
+        for name in self.device_boards:
+            if device_lower in name.lower() or name.lower() in device_lower:
+                return name
+        return None
+
+    def get_repos_for_device(self, device: str) -> Tuple[List[str], List[str]]:
+        """
+        Get the repositories of the packages of a device, merged over its boards.
+
+        Returns:
+            Required and optional repositories, sorted; repositories required by
+            one board are not listed as optional
+        """
+        required = set()
+        optional = set()
+        for board in self.device_boards.get(device, ()):
+            required.update(self.configs[board].repo_list)
+            optional.update(self.configs[board].optional_repos)
+        return sorted(required), sorted(optional - required)
+
+    def get_matrix(self, include_optional: bool = True) -> Tuple[List[str], Dict[str, Dict[str, str]]]:
+        """
+        Get the board by repository matrix.
+
+        Returns:
+            Sorted repositories, and for each board the repositories it includes,
+            mapped to MATRIX_REQUIRED or MATRIX_OPTIONAL
+        """
+        matrix = {}
+        for name in sorted(self.configs):
+            config = self.configs[name]
+            row = {}
+            if include_optional:
+                row.update((repo, MATRIX_OPTIONAL) for repo in config.optional_repos)
+            row.update((repo, MATRIX_REQUIRED) for repo in config.repo_list)
+            matrix[name] = row
+        repos = sorted({repo for row in matrix.values() for repo in row})
+        return repos, matrix
+
+    def get_dependent_boards(self, boards: Iterable[str]) -> Set[str]:
+        """Get the boards depending on the given boards, directly or through other boards."""
+        dependents = set()
+        pending = list(boards)
+        while pending:
+            for dependent in self.dependent_boards.get(pending.pop(), ()):
+                if dependent not in dependents:
+                    dependents.add(dependent)
+                    pending.append(dependent)
+        return dependents
+
+    def get_affected_boards(self, changed_repos: Iterable[str], changed_boards: Iterable[str] = (),
+                            include_optional: bool = True) -> Dict[str, List[str]]:
+        """
+        Get the boards whose packages are affected by changes.
+
+        A board is affected when one of its repositories or its configuration
+        changed, and when a board it depends on is affected.
+
+        Args:
+            changed_repos: Names of the projects that changed
+            changed_boards: Names of the boards whose configuration changed
+            include_optional: Whether optional repositories of the boards count
+
+        Returns:
+            Dictionary mapping affected boards to the reasons, sorted by board
+        """
+        reasons: Dict[str, List[str]] = {}
+        for repo in sorted(set(changed_repos)):
+            for board in self.get_boards_for_repo(repo, include_optional):
+                reasons.setdefault(board, []).append(f"repository {repo}")
+        for board in sorted(set(changed_boards)):
+            if board in self.configs:
+                reasons.setdefault(board, []).append("board configuration")
+
+        for board in sorted(reasons):
+            for dependent in self.get_dependent_boards([board]):
+                reasons.setdefault(dependent, []).append(f"dependency {board}")
+        return {board: reasons[board] for board in sorted(reasons)}
+
+    def get_affected_devices(self, boards: Iterable[str], device_map: Dict[str, List[str]]) -> List[str]:
+        """Get the devices with at least one affected board among their configured boards."""
+        affected = set(boards)
+        return sorted(device for device, device_boards in device_map.items()
+                      if any(board in affected and board in self.configs for board in device_boards))
@@ -0,0 +1,69 @@
+# Copyright 2025 NXP
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Board matching utility.
+
+This module provides a matcher that is built once per package from the target
+board list and answers whether board directories and example.yml board keys
+(such as "board@core") belong to the package.
+"""
+
+import re
+from typing import Dict, List
+
+
+class BoardKeyMatcher:
+    """Precompiled matcher for board directory names and example.yml board keys."""
+
+    def __init__(self, target_boards: List[str], legacy_substring: bool = False):
+        self.target_boards = list(dict.fromkeys(target_boards or []))
+        self.legacy_substring = legacy_substring
+        self._targets = frozenset(self.target_boards)
+        self._key_cache: Dict[str, bool] = {}
+        self._legacy_pattern = None
+        if legacy_substring and self.target_boards:
+            # Longest first so that the alternation never stops at a shorter prefix
+            alternatives = sorted(self._targets, key=len, reverse=True)
+            self._legacy_pattern = re.compile('|'.join(re.escape(b) for b in alternatives))
+
+    def __bool__(self) -> bool:
+        return bool(self._targets)
+
+    def __repr__(self) -> str:
+        mode = 'substring' if self.legacy_substring else 'exact'
+        return f"BoardKeyMatcher({self.target_boards}, mode={mode})"
+
+    @staticmethod
+    def parse_board(board_key: str) -> str:
+        """Get the board portion of an example.yml board key ("board@core" -> "board")."""
+        return board_key.split('@', 1)[0].strip()
+
+    def matches_board(self, board_name: str) -> bool:
+        """Check whether a board name (e.g. an _boards/<board> directory) is a target board."""
+        return board_name in self._targets
+
+    def matches_key(self, board_key: str) -> bool:
+        """
+        Check whether an example.yml board key belongs to a target board.
+
+        In the default exact mode the parsed board portion must equal a target
+        board, so "evkmimx8mn" does not match "evkmimx8mnddr3l". The legacy mode
+        keeps the historical behavior of matching any target as a substring.
+        """
+        result = self._key_cache.get(board_key)
+        if result is None:
+            if self._legacy_pattern is not None:
+                result = self._legacy_pattern.search(board_key) is not None
+            else:
+                result = self.parse_board(board_key) in self._targets
+            self._key_cache[board_key] = result
+        return result
+
+    def filter_boards(self, boards_config: Dict) -> Dict:
+        """Filter an example.yml boards mapping down to the target board keys."""
+        return {
+            board_key: board_value
+            for board_key, board_value in boards_config.items()
+            if self.matches_key(str(board_key))
+        }
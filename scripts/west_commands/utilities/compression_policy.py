@@ -0,0 +1,121 @@
+# Copyright 2025 NXP
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Archive compression policy utility.
+
+This module decides per archive member whether it is stored or deflated, and
+at which level, from its extension and location and, for binary content, from
+a quick trial compression of a sample of the file. Presets trade archive size
+against packaging time.
+"""
+
+import os
+import zlib
+import zipfile
+from typing import Dict, Tuple
+
+
+COMPRESSION_PRESETS = ('fast', 'balanced', 'smallest')
+DEFAULT_COMPRESSION_PRESET = 'balanced'
+
+# Content that is already compressed, deflating it again gains nothing
+COMPRESSED_EXTENSIONS = {
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.zst', '.lz4', '.7z', '.rar', '.jar', '.whl',
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.ico', '.mp3', '.mp4', '.pdf', '.docx', '.xlsx',
+}
+# Binary content whose compressibility varies, decided by trial compression
+BINARY_EXTENSIONS = {
+    '.bin', '.a', '.lib', '.o', '.obj', '.elf', '.axf', '.out', '.so', '.dll', '.exe',
+    '.img', '.sb', '.sb3', '.dat', '.raw', '.wav', '.ttf', '.otf',
+}
+# Directories holding prebuilt firmware images
+BINARY_DIRECTORIES = {'fw_bin'}
+
+# Members smaller than this are stored, deflate headers would outweigh the gain
+MIN_DEFLATE_SIZE = 128
+TRIAL_SAMPLE_SIZE = 64 * 1024
+
+# Per preset: deflate level, level for binary content, trial threshold (compressed/original
+# size of the sample above which a member is stored), and whether known compressed
+# content is stored without a trial
+PRESET_SETTINGS = {
+    'fast': {'level': 1, 'binary_level': 1, 'store_ratio': 0.9, 'store_compressed': True},
+    'balanced': {'level': 6, 'binary_level': 6, 'store_ratio': 0.95, 'store_compressed': True},
+    'smallest': {'level': 9, 'binary_level': 9, 'store_ratio': 0.99, 'store_compressed': False},
+}
+
+
+class CompressionPolicy:
+    """Per-member compression decisions for zip archives."""
+
+    def __init__(self, preset: str = DEFAULT_COMPRESSION_PRESET):
+        if preset not in PRESET_SETTINGS:
+            raise ValueError(f"Unknown compression preset '{preset}', expected one of: {', '.join(COMPRESSION_PRESETS)}")
+        self.preset = preset
+        self.settings = PRESET_SETTINGS[preset]
+        self.stats: Dict[str, int] = {'stored': 0, 'deflated': 0, 'trials': 0, 'stored_bytes': 0, 'deflated_bytes': 0}
+
+    def __repr__(self) -> str:
+        return f"CompressionPolicy({self.preset})"
+
+    def decide(self, src_path: str, arc_path: str, size: int) -> Tuple[int, int]:
+        """
+        Decide how to compress an archive member.
+
+        Args:
+            src_path: Path of the file on disk
+            arc_path: Path of the member in the archive
+            size: File size in bytes
+
+        Returns:
+            Tuple of (zipfile compression type, compression level or None)
+        """
+        compress_type, level = self._decide(src_path, arc_path, size)
+        if compress_type == zipfile.ZIP_STORED:
+            self.stats['stored'] += 1
+            self.stats['stored_bytes'] += size
+        else:
+            self.stats['deflated'] += 1
+            self.stats['deflated_bytes'] += size
+        return compress_type, level
+
+    def _decide(self, src_path: str, arc_path: str, size: int) -> Tuple[int, int]:
+        if size < MIN_DEFLATE_SIZE:
+            return zipfile.ZIP_STORED, None
+
+        extension = os.path.splitext(arc_path)[1].lower()
+        if extension in COMPRESSED_EXTENSIONS:
+            if self.settings['store_compressed']:
+                return zipfile.ZIP_STORED, None
+            return self._trial(src_path, self.settings['binary_level'])
+
+        directories = arc_path.split('/')[:-1]
+        if extension in BINARY_EXTENSIONS or BINARY_DIRECTORIES.intersection(directories):
+            if self.preset == 'fast':
+                return zipfile.ZIP_DEFLATED, self.settings['binary_level']
+            return self._trial(src_path, self.settings['binary_level'])
+
+        return zipfile.ZIP_DEFLATED, self.settings['level']
+
+    def _trial(self, src_path: str, level: int) -> Tuple[int, int]:
+        """Trial-compress a sample of the file and store it if it barely compresses."""
+        self.stats['trials'] += 1
+        try:
+            with open(src_path, 'rb') as f:
+                sample = f.read(TRIAL_SAMPLE_SIZE)
+        except OSError:
+            return zipfile.ZIP_DEFLATED, level
+        if not sample:
+            return zipfile.ZIP_STORED, None
+        ratio = len(zlib.compress(sample, 1)) / len(sample)
+        if ratio > self.settings['store_ratio']:
+            return zipfile.ZIP_STORED, None
+        return zipfile.ZIP_DEFLATED, level
+
+    def summary(self) -> str:
+        """Get a one-line summary of the decisions made so far."""
+        stats = self.stats
+        return (f"compression '{self.preset}': {stats['deflated']} members deflated "
+                f"({stats['deflated_bytes'] / (1024 * 1024):.1f} MB), {stats['stored']} stored "
+                f"({stats['stored_bytes'] / (1024 * 1024):.1f} MB), {stats['trials']} trial compressions")
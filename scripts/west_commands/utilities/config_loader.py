@@ -12,6 +12,7 @@ import os
 import yaml
 from typing import Dict, List, Any, Optional, Callable
 from .device_board_mapper import DeviceBoardMapper
+from .workspace_context import WorkspaceContext
 
 
 class BoardConfig:
@@ -66,11 +67,14 @@ class BoardConfig:
 class ConfigLoader:
     """Independent configuration loader for boards, devices, and custom configs."""
     
-    def __init__(self, workspace_root: str, manifest_dir: str, logger: Callable[[str, str], None] = None):
+    def __init__(self, workspace_root: str, manifest_dir: str, logger: Callable[[str, str], None] = None,
+                 context: Optional[WorkspaceContext] = None):
         self.workspace_root = workspace_root
         self.manifest_dir = manifest_dir
         self.logger = logger or self._default_logger
-        self.device_mapper = DeviceBoardMapper(workspace_root, manifest_dir, logger)
+        self.context = context
+        tool_data_revision = context.get_revision('mcuxsdk-tool-data') if context else None
+        self.device_mapper = DeviceBoardMapper(workspace_root, manifest_dir, logger, tool_data_revision)
     
     def _default_logger(self, message: str, level: str = 'inf'):
         """Default logger that does nothing."""
@@ -93,16 +97,18 @@ class ConfigLoader:
         with open(config_path, 'r', encoding='utf-8') as f:
             data = yaml.safe_load(f) or {}
         
-        # Load controlled-access configuration if available
+        config = self.create_board_config(board_name, data)
+        self.logger(f"Successfully loaded board config: {board_name} (repos: {len(config.repo_list)}, examples: {len(config.example_list)})", 'inf')
+        
+        return config
+    
+    def create_board_config(self, board_name: str, data: Dict) -> BoardConfig:
+        """Create a board configuration from its YAML data, merged with the controlled-access configuration."""
         controlled_data = self._load_controlled_access_config(board_name)
         if controlled_data:
             self.logger(f"Merging controlled-access configuration for board: {board_name}", 'dbg')
             data = self._merge_controlled_access(data, controlled_data)
-        
-        config = self._create_board_config(board_name, data)
-        self.logger(f"Successfully loaded board config: {board_name} (repos: {len(config.repo_list)}, examples: {len(config.example_list)})", 'inf')
-        
-        return config
+        return self._create_board_config(board_name, data)
     
     def load_device_config(self, device_name: str) -> BoardConfig:
         """Load merged configuration for a device (multiple boards)."""
@@ -12,16 +12,23 @@ import os
 import yaml
 import subprocess
 from typing import List, Dict, Optional, Callable
+from .workspace_cache import WorkspaceCache, read_git_head, directory_stamp
+
+
+DEVICE_MAP_CACHE_NAME = 'device_board_map'
 
 
 class DeviceBoardMapper:
     """Independent utility for mapping devices to boards using tool data."""
     
-    def __init__(self, workspace_root: str, manifest_dir: str, logger: Callable[[str, str], None] = None):
+    def __init__(self, workspace_root: str, manifest_dir: str, logger: Callable[[str, str], None] = None,
+                 tool_data_revision: Optional[str] = None):
         self.workspace_root = workspace_root
         self.manifest_dir = manifest_dir
+        self.tool_data_revision = tool_data_revision  # Manifest revision of mcuxsdk-tool-data, if known
         self._device_cache = None
         self.logger = logger or self._default_logger
+        self.persistent_cache = WorkspaceCache(workspace_root, self.logger)
     
     def _default_logger(self, message: str, level: str = 'inf'):
         """Default logger that does nothing."""
@@ -269,17 +276,74 @@ class DeviceBoardMapper:
             self.logger("Using cached device-to-board mapping", 'dbg')
             return self._device_cache
         
+        cached_map = self._load_persistent_mapping()
+        if cached_map is not None:
+            self._device_cache = cached_map
+            self.logger(f"Loaded persistent device-to-board mapping for {len(cached_map)} devices", 'dbg')
+            return self._device_cache
+        
         self.logger("Building device-to-board mapping from tool data", 'dbg')
         self._device_cache = self._build_device_mapping()
         self.logger(f"Built mapping for {len(self._device_cache)} devices", 'dbg')
+        if self._device_cache:
+            self._store_persistent_mapping(self._device_cache)
         return self._device_cache
     
+    def _get_tool_data_dir(self) -> str:
+        """Get the tool data directory holding recommended board YAML files."""
+        return os.path.join(self.workspace_root, "mcuxsdk", "tool_data", "recommended_boards")
+    
+    def _get_tool_data_revision(self) -> Optional[str]:
+        """Get the tool data revision from the manifest, or the checked out HEAD."""
+        if self.tool_data_revision:
+            return self.tool_data_revision
+        return read_git_head(os.path.join(self.workspace_root, "mcuxsdk", "tool_data"))
+    
+    def _load_persistent_mapping(self) -> Optional[Dict[str, List[str]]]:
+        """
+        Load the device-to-board mapping persisted by a previous invocation.
+        
+        The entry is valid when the tool data revision matches and, if the tool
+        data is checked out, when the directory stamp (mtimes and sizes) matches.
+        A valid entry for a missing tool data directory skips the download.
+        """
+        payload = self.persistent_cache.load_json(DEVICE_MAP_CACHE_NAME)
+        if not payload or not isinstance(payload.get('devices'), dict):
+            return None
+        
+        revision = self._get_tool_data_revision()
+        if not revision or payload.get('revision') != revision:
+            self.logger(f"Persistent device mapping is stale (revision {payload.get('revision')} != {revision})", 'dbg')
+            return None
+        
+        tool_data_dir = self._get_tool_data_dir()
+        if os.path.isdir(tool_data_dir):
+            if payload.get('stamp') != directory_stamp(tool_data_dir, ('.yml', '.yaml')):
+                self.logger("Persistent device mapping is stale (tool data directory changed)", 'dbg')
+                return None
+        else:
+            self.logger("Tool data directory not found, using persistent mapping for matching revision", 'dbg')
+        
+        return payload['devices']
+    
+    def _store_persistent_mapping(self, device_map: Dict[str, List[str]]) -> None:
+        """Persist the device-to-board mapping together with its validation key."""
+        tool_data_dir = self._get_tool_data_dir()
+        revision = self._get_tool_data_revision()
+        stamp = directory_stamp(tool_data_dir, ('.yml', '.yaml'))
+        if not revision or stamp is None:
+            self.logger("Tool data revision or directory stamp unavailable, not persisting device mapping", 'dbg')
+            return
+        
+        self.persistent_cache.store_json(DEVICE_MAP_CACHE_NAME, {
+            'revision': revision,
+            'stamp': stamp,
+            'devices': device_map,
+        })
+    
     def _build_device_mapping(self) -> Dict[str, List[str]]:
         """Build device-to-board mapping from tool data."""
-        tool_data_dir = os.path.join(
-            self.workspace_root, 
-            "mcuxsdk", "tool_data", "recommended_boards"
-        )
+        tool_data_dir = self._get_tool_data_dir()
         
         self.logger(f"Looking for tool data in: {tool_data_dir}", 'dbg')
         
@@ -0,0 +1,149 @@
+# Copyright 2025 NXP
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Documentation artifact cache utility.
+
+This module stores generated board PDFs under the workspace cache directory,
+keyed by the board name, the revisions of the documentation build inputs and
+the tree the build reads, so that unchanged documentation is reused instead
+of being rebuilt.
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+from typing import Callable, Dict, List, Optional, Tuple
+from .workspace_cache import WorkspaceCache
+
+
+DEFAULT_DOC_CACHE_MAX_AGE_DAYS = 30
+DEFAULT_DOC_CACHE_MAX_SIZE_MB = 2048
+
+
+class DocArtifactCache:
+    """Independent cache of generated board PDF documents."""
+
+    def __init__(self, workspace_root: str, logger: Callable[[str, str], None] = None,
+                 max_age_days: float = DEFAULT_DOC_CACHE_MAX_AGE_DAYS,
+                 max_size_mb: float = DEFAULT_DOC_CACHE_MAX_SIZE_MB):
+        self.logger = logger or self._default_logger
+        self.cache_dir = WorkspaceCache(workspace_root, self.logger).path('docs')
+        self.max_age_seconds = max_age_days * 24 * 3600
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+
+    def _default_logger(self, message: str, level: str = 'inf'):
+        """Default logger that does nothing."""
+        pass
+
+    @staticmethod
+    def compute_key(board_name: str, input_revisions: Dict[str, str], input_scope: Optional[Dict] = None) -> str:
+        """
+        Compute the cache key of a board PDF from the board and its doc input revisions.
+
+        Args:
+            board_name: Board of the PDF
+            input_revisions: Revisions of the documentation input projects
+            input_scope: Description of the tree the build reads, e.g. the staged
+                projects and boards
+        """
+        data = json.dumps({'board': board_name, 'inputs': input_revisions, 'scope': input_scope or {}},
+                          sort_keys=True)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}.pdf')
+
+    def fetch(self, key: str, dest_path: str) -> bool:
+        """
+        Place a cached PDF at dest_path.
+
+        Cached files are never modified in place, so a hard link is used when
+        possible and the file is copied otherwise.
+
+        Returns:
+            True on a cache hit, False on a miss
+        """
+        entry = self._entry_path(key)
+        if not os.path.isfile(entry):
+            return False
+
+        try:
+            if os.path.lexists(dest_path):
+                os.remove(dest_path)
+            try:
+                os.link(entry, dest_path)
+            except OSError:
+                shutil.copyfile(entry, dest_path)
+            # Record the use for age-based eviction
+            os.utime(entry, None)
+            return True
+        except OSError as e:
+            self.logger(f"Failed to use cached documentation {entry}: {e}", 'wrn')
+            return False
+
+    def store(self, key: str, pdf_path: str, board_name: str, input_revisions: Dict[str, str]) -> bool:
+        """Store a generated PDF. Failures are logged and never raised."""
+        entry = self._entry_path(key)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix='.doc.', suffix='.tmp', dir=self.cache_dir)
+            os.close(fd)
+            try:
+                shutil.copyfile(pdf_path, tmp_path)
+                os.replace(tmp_path, entry)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            with open(os.path.join(self.cache_dir, f'{key}.json'), 'w', encoding='utf-8') as f:
+                json.dump({'board': board_name, 'inputs': input_revisions, 'created': time.time()}, f, indent=2)
+            self.logger(f"Cached documentation for {board_name}: {entry}", 'dbg')
+            return True
+        except OSError as e:
+            self.logger(f"Failed to cache documentation for {board_name}: {e}", 'wrn')
+            return False
+
+    def evict(self) -> int:
+        """
+        Evict entries not used within the maximum age, then the least recently
+        used entries until the cache fits the maximum size.
+
+        Returns:
+            Number of evicted entries
+        """
+        entries: List[Tuple[float, int, str]] = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith('.pdf') and entry.is_file():
+                        st = entry.stat()
+                        entries.append((st.st_mtime, st.st_size, entry.name[:-len('.pdf')]))
+        except FileNotFoundError:
+            return 0
+        except OSError as e:
+            self.logger(f"Cannot scan documentation cache {self.cache_dir}: {e}", 'wrn')
+            return 0
+
+        entries.sort()
+        now = time.time()
+        total_size = sum(size for _, size, _ in entries)
+        evicted = 0
+
+        for mtime, size, key in entries:
+            if now - mtime <= self.max_age_seconds and total_size <= self.max_size_bytes:
+                break
+            for suffix in ('.pdf', '.json'):
+                try:
+                    os.remove(os.path.join(self.cache_dir, key + suffix))
+                except OSError:
+                    pass
+            total_size -= size
+            evicted += 1
+
+        if evicted:
+            self.logger(f"Evicted {evicted} documentation cache entries", 'dbg')
+        return evicted
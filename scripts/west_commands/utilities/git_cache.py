@@ -0,0 +1,293 @@
+# Copyright 2025 NXP
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Shared git object cache utility.
+
+This module keeps one bare repository per project URL in a cache directory
+shared by all workspaces of a host, for example by the CI agents of a build
+machine. Workspace repositories borrow the cached objects through git
+alternates, so updates only transfer objects the cache does not hold yet,
+and a commit already in the cache is not fetched at all.
+
+Concurrent users coordinate through file locks next to each cache repository:
+fetching into the cache and maintenance take the lock exclusively, workspace
+updates that read through alternates hold it shared. Workspace repositories
+keep borrowing objects after the update, so each cache repository records
+its borrowers and is not removed while one of them still exists. Copies of
+a borrowing repository, e.g. in a package, must be dissociated first.
+"""
+
+import os
+import time
+import shutil
+import hashlib
+import subprocess
+import concurrent.futures
+from contextlib import contextmanager, ExitStack
+from typing import Callable, Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows, the cache is then used without locking
+    fcntl = None
+
+
+# Environment variable selecting the cache directory when no option is given
+GIT_CACHE_ENV = 'MCUXSDK_GIT_CACHE'
+LOCK_FILE_SUFFIX = '.lock'
+# Marker file inside each cache repository, its mtime is the last use
+LAST_USED_FILE_NAME = 'mcuxsdk-last-used'
+# File inside each cache repository listing the git directories of the workspace repositories borrowing from it
+BORROWERS_FILE_NAME = 'mcuxsdk-borrowers'
+# Fetched commits are kept reachable under this ref namespace so gc never prunes them
+CACHE_REF_PREFIX = 'refs/cache/'
+DEFAULT_POPULATE_JOBS = 4
+
+
+@contextmanager
+def file_lock(lock_path: str, exclusive: bool = True) -> Iterator[None]:
+    """Hold an advisory lock on a lock file, shared or exclusive."""
+    with open(lock_path, 'a+') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def get_alternates(git_dir: str) -> List[str]:
+    """Get the object directories a repository borrows objects from."""
+    alternates_path = os.path.join(git_dir, 'objects', 'info', 'alternates')
+    if not os.path.exists(alternates_path):
+        return []
+    with open(alternates_path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+
+def dissociate(git_dir: str, logger: Callable[[str, str], None] = None) -> bool:
+    """
+    Make a repository standalone: copy the objects it borrows into its own
+    packs and drop its alternates, as git clone --dissociate does.
+
+    Returns:
+        True if the repository borrowed objects
+
+    Raises:
+        RuntimeError: If the repository cannot be repacked
+    """
+    if not get_alternates(git_dir):
+        return False
+    cmd = ['git', '--git-dir', git_dir, 'repack', '-a', '-d', '-q']
+    if logger:
+        logger(f"Running command: {' '.join(cmd)}", 'dbg')
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Cannot dissociate {git_dir} from its alternates: {result.stderr.strip()}")
+    os.remove(os.path.join(git_dir, 'objects', 'info', 'alternates'))
+    return True
+
+
+class GitObjectCache:
+    """Independent utility for a host-wide cache of git objects shared through alternates."""
+
+    def __init__(self, cache_dir: str, logger: Callable[[str, str], None] = None):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.logger = logger or self._default_logger
+
+    def _default_logger(self, message: str, level: str = 'inf'):
+        """Default logger that does nothing."""
+        pass
+
+    @staticmethod
+    def repo_name(url: str) -> str:
+        """Get the cache repository name of a project URL, readable and unique per URL."""
+        base = url.rstrip('/').split('/')[-1]
+        if base.endswith('.git'):
+            base = base[:-4]
+        return f"{base or 'repo'}-{hashlib.sha1(url.encode('utf-8')).hexdigest()[:12]}.git"
+
+    def repo_path(self, url: str) -> str:
+        """Get the path of the cache repository of a project URL."""
+        return os.path.join(self.cache_dir, self.repo_name(url))
+
+    def _lock_path(self, url: str) -> str:
+        return self.repo_path(url) + LOCK_FILE_SUFFIX
+
+    def _git(self, repo_dir: str, args: List[str], check: bool = True) -> subprocess.CompletedProcess:
+        cmd = ['git'] + args
+        self.logger(f"Running command: {' '.join(cmd)} (in {repo_dir})", 'dbg')
+        result = subprocess.run(cmd, cwd=repo_dir, capture_output=True, text=True)
+        if check and result.returncode != 0:
+            raise RuntimeError(f"'{' '.join(cmd)}' failed in {repo_dir}: {result.stderr.strip()}")
+        return result
+
+    def _has_commit(self, repo_dir: str, revision: str) -> bool:
+        return self._git(repo_dir, ['cat-file', '-e', f'{revision}^{{commit}}'], check=False).returncode == 0
+
+    def populate(self, url: str, revision: Optional[str]) -> str:
+        """
+        Make a project revision available in the cache.
+
+        The cache repository is created on first use. A commit SHA that is
+        already cached is not fetched again; branches and tags are always
+        fetched, transferring only the missing objects.
+
+        Args:
+            url: Project URL
+            revision: Manifest revision (commit, branch or tag), None for the remote HEAD
+
+        Returns:
+            Path of the cache repository
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        repo_dir = self.repo_path(url)
+        revision = revision or 'HEAD'
+        with file_lock(self._lock_path(url), exclusive=True):
+            if not os.path.isdir(repo_dir):
+                self.logger(f"Creating git cache repository for {url}: {repo_dir}", 'dbg')
+                tmp_dir = repo_dir + '.tmp'
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                os.makedirs(tmp_dir)
+                self._git(tmp_dir, ['init', '-q', '--bare'])
+                self._git(tmp_dir, ['remote', 'add', 'origin', url])
+                os.replace(tmp_dir, repo_dir)
+
+            if len(revision) == 40 and self._has_commit(repo_dir, revision):
+                self.logger(f"Git cache hit: {url} {revision[:12]}", 'dbg')
+            else:
+                start_time = time.time()
+                self._git(repo_dir, ['fetch', '-q', '--tags', 'origin', revision])
+                commit = self._git(repo_dir, ['rev-parse', 'FETCH_HEAD^{commit}']).stdout.strip()
+                self._git(repo_dir, ['update-ref', f'{CACHE_REF_PREFIX}{commit}', commit])
+                self.logger(f"Fetched {url} {revision} into git cache in {time.time() - start_time:.2f} seconds", 'dbg')
+
+            with open(os.path.join(repo_dir, LAST_USED_FILE_NAME), 'w') as f:
+                f.write(f"{time.time()}\n")
+        return repo_dir
+
+    def populate_projects(self, projects: List, jobs: int = DEFAULT_POPULATE_JOBS) -> Dict[str, str]:
+        """
+        Populate the cache for several projects concurrently.
+
+        Returns:
+            Dictionary mapping project names to their cache repository; projects
+            that failed are left out and updated without the cache
+        """
+        cache_repos = {}
+        projects = [p for p in projects if getattr(p, 'url', None)]
+        if not projects:
+            return cache_repos
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(jobs, len(projects)))) as executor:
+            futures = {executor.submit(self.populate, p.url, p.revision): p for p in projects}
+            for future in concurrent.futures.as_completed(futures):
+                project = futures[future]
+                try:
+                    cache_repos[project.name] = future.result()
+                except (OSError, RuntimeError) as e:
+                    self.logger(f"Git cache not used for {project.name}: {e}", 'wrn')
+        return cache_repos
+
+    def attach(self, project, repo_dir: str, cache_repo: str) -> None:
+        """
+        Let a workspace repository borrow objects from a cache repository.
+
+        A missing workspace repository is initialized the way west initializes
+        it, with the project remote; west then takes cached commits from the
+        alternates instead of fetching them.
+        """
+        os.makedirs(repo_dir, exist_ok=True)
+        if not os.path.exists(os.path.join(repo_dir, '.git')):
+            self._git(repo_dir, ['init', '-q'])
+            self._git(repo_dir, ['remote', 'add', getattr(project, 'remote_name', None) or 'origin', project.url])
+        git_dir = self._git(repo_dir, ['rev-parse', '--absolute-git-dir']).stdout.strip()
+        alternates_path = os.path.join(git_dir, 'objects', 'info', 'alternates')
+        objects_dir = os.path.join(cache_repo, 'objects')
+
+        alternates = get_alternates(git_dir)
+        if objects_dir not in alternates:
+            os.makedirs(os.path.dirname(alternates_path), exist_ok=True)
+            with open(alternates_path, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(alternates + [objects_dir]) + '\n')
+            self.logger(f"Attached git cache to {repo_dir}", 'dbg')
+        if git_dir not in self._read_borrowers(cache_repo):
+            with open(os.path.join(cache_repo, BORROWERS_FILE_NAME), 'a', encoding='utf-8') as f:
+                f.write(git_dir + '\n')
+
+    def _read_borrowers(self, cache_repo: str) -> List[str]:
+        borrowers_path = os.path.join(cache_repo, BORROWERS_FILE_NAME)
+        if not os.path.exists(borrowers_path):
+            return []
+        with open(borrowers_path, 'r', encoding='utf-8') as f:
+            return [line.strip() for line in f if line.strip()]
+
+    def get_borrowers(self, cache_repo: str) -> List[str]:
+        """Get the git directories of the repositories still borrowing objects from a cache repository."""
+        objects_dir = os.path.join(cache_repo, 'objects')
+        return [git_dir for git_dir in self._read_borrowers(cache_repo)
+                if os.path.isdir(git_dir) and objects_dir in get_alternates(git_dir)]
+
+    @contextmanager
+    def shared(self, urls: List[str]) -> Iterator[None]:
+        """Hold the cache repositories of the URLs shared, keeping maintenance out while they are read."""
+        with ExitStack() as stack:
+            for url in sorted(set(urls)):
+                if os.path.isdir(self.repo_path(url)):
+                    stack.enter_context(file_lock(self._lock_path(url), exclusive=False))
+            yield
+
+    def list_repositories(self) -> List[Dict]:
+        """List the cache repositories with their URL, size and last use."""
+        repos = []
+        if not os.path.isdir(self.cache_dir):
+            return repos
+        for name in sorted(os.listdir(self.cache_dir)):
+            repo_dir = os.path.join(self.cache_dir, name)
+            if not name.endswith('.git') or not os.path.isdir(repo_dir):
+                continue
+            url = self._git(repo_dir, ['remote', 'get-url', 'origin'], check=False).stdout.strip()
+            marker = os.path.join(repo_dir, LAST_USED_FILE_NAME)
+            size = sum(os.path.getsize(os.path.join(root, f))
+                       for root, _, files in os.walk(repo_dir) for f in files)
+            repos.append({
+                'name': name,
+                'url': url,
+                'path': repo_dir,
+                'bytes': size,
+                'last_used': os.path.getmtime(marker) if os.path.exists(marker) else None,
+            })
+        return repos
+
+    def gc(self, remove_unused_days: int = 0) -> Dict[str, int]:
+        """
+        Maintain the cache repositories.
+
+        Every repository is repacked with git gc. With remove_unused_days,
+        repositories not used for that many days are removed, unless
+        workspace repositories still borrow objects from them: removing
+        those would corrupt the workspaces.
+
+        Returns:
+            Counts of repositories collected, removed and kept for their borrowers
+        """
+        stats = {'collected': 0, 'removed': 0, 'borrowed': 0}
+        now = time.time()
+        for repo in self.list_repositories():
+            with file_lock(repo['path'] + LOCK_FILE_SUFFIX, exclusive=True):
+                last_used = repo['last_used'] or 0
+                if remove_unused_days and now - last_used > remove_unused_days * 86400:
+                    borrowers = self.get_borrowers(repo['path'])
+                    if not borrowers:
+                        self.logger(f"Removing unused git cache repository: {repo['name']} ({repo['url']})", 'inf')
+                        shutil.rmtree(repo['path'])
+                        stats['removed'] += 1
+                        continue
+                    self.logger(f"Keeping unused git cache repository {repo['name']}, still borrowed by "
+                                f"{len(borrowers)} workspace repositories: {borrowers}", 'wrn')
+                    stats['borrowed'] += 1
+                self.logger(f"Collecting git cache repository: {repo['name']}", 'inf')
+                self._git(repo['path'], ['gc', '--quiet'])
+                stats['collected'] += 1
+        return stats
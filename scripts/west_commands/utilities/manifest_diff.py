@@ -0,0 +1,174 @@
+# Copyright 2025 NXP
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Manifest revision comparison utility.
+
+This module reads the west manifest and the board configurations of the
+manifest repository at git revisions, without checking them out, and compares
+two revisions: projects whose revision, URL or path changed, and files changed
+in the manifest repository. Self imports (files and directories) are resolved
+the way west resolves them, imports from other projects are not followed.
+"""
+
+import os
+import subprocess
+import yaml
+from typing import Any, Callable, Dict, List, Optional
+
+
+# Default revision of projects without one, as in west
+DEFAULT_PROJECT_REVISION = 'master'
+# Project attributes compared between manifest revisions
+PROJECT_ATTRIBUTES = ('revision', 'url', 'path')
+
+
+class ManifestRevision:
+    """Projects and board configurations of the manifest repository at a git revision."""
+
+    def __init__(self, manifest_dir: str, revision: str, manifest_file: str = 'west.yml',
+                 logger: Callable[[str, str], None] = None):
+        self.manifest_dir = manifest_dir
+        self.revision = revision
+        self.manifest_file = manifest_file
+        self.logger = logger or self._default_logger
+        self.group_filter: List[str] = []
+        self._projects: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _default_logger(self, message: str, level: str = 'inf'):
+        """Default logger that does nothing."""
+        pass
+
+    def _git(self, args: List[str]) -> str:
+        cmd = ['git'] + args
+        self.logger(f"Running command: {' '.join(cmd)} (in {self.manifest_dir})", 'dbg')
+        try:
+            result = subprocess.run(cmd, cwd=self.manifest_dir, check=True, capture_output=True, text=True)
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"'{' '.join(cmd)}' failed in {self.manifest_dir}: {(e.stderr or '').strip()}") from e
+        return result.stdout
+
+    def resolve(self) -> str:
+        """Get the commit of the revision, failing early for unknown revisions."""
+        return self._git(['rev-parse', '--verify', f'{self.revision}^{{commit}}']).strip()
+
+    def read_file(self, path: str) -> Optional[str]:
+        """Read a file of the manifest repository at the revision, None if it does not exist."""
+        try:
+            return self._git(['show', f'{self.revision}:{path}'])
+        except RuntimeError:
+            return None
+
+    def list_files(self, path: str, suffixes=('.yml', '.yaml')) -> List[str]:
+        """List the files below a directory of the manifest repository at the revision, sorted."""
+        output = self._git(['ls-tree', '-r', '--name-only', self.revision, '--', path.rstrip('/') + '/'])
+        return sorted(line for line in output.splitlines() if line.endswith(suffixes))
+
+    def load_projects(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load the projects defined by the manifest at the revision.
+
+        Projects of the top manifest file come first, then those of the self
+        imports in order; the first definition of a project wins.
+
+        Returns:
+            Dictionary mapping project names to their revision, url, path and groups
+        """
+        if self._projects is not None:
+            return self._projects
+
+        content = self.read_file(self.manifest_file)
+        if content is None:
+            raise RuntimeError(f"Manifest file {self.manifest_file} not found at revision {self.revision}")
+        manifest_data = (yaml.safe_load(content) or {}).get('manifest', {}) or {}
+        self.group_filter = list(manifest_data.get('group-filter', []) or [])
+
+        projects = {}
+        self._add_projects(projects, manifest_data, self.manifest_file)
+        self_imports = (manifest_data.get('self', {}) or {}).get('import', [])
+        if isinstance(self_imports, (str, dict)):
+            self_imports = [self_imports]
+        for imported in self_imports:
+            if not isinstance(imported, str):
+                self.logger(f"Skipping unsupported mapping import at {self.revision}: {imported}", 'wrn')
+                continue
+            import_files = [imported] if imported.endswith(('.yml', '.yaml')) else self.list_files(imported)
+            for import_file in import_files:
+                data = yaml.safe_load(self.read_file(import_file) or '') or {}
+                self._add_projects(projects, data.get('manifest', {}) or {}, import_file)
+
+        self.logger(f"Loaded {len(projects)} projects from manifest at {self.revision}", 'dbg')
+        self._projects = projects
+        return projects
+
+    def _add_projects(self, projects: Dict[str, Dict[str, Any]], manifest_data: Dict, file_name: str) -> None:
+        """Add the projects of one manifest file not defined before."""
+        remotes = {r.get('name'): r.get('url-base', '').rstrip('/')
+                   for r in manifest_data.get('remotes', []) or [] if isinstance(r, dict)}
+        defaults = manifest_data.get('defaults', {}) or {}
+        for project in manifest_data.get('projects', []) or []:
+            if not isinstance(project, dict) or not project.get('name'):
+                continue
+            name = project['name']
+            if project.get('import'):
+                self.logger(f"Imports of project {name} in {file_name} are not followed", 'wrn')
+            if name in projects:
+                continue
+            url = project.get('url')
+            if not url:
+                url_base = remotes.get(project.get('remote') or defaults.get('remote'), '')
+                url = f"{url_base}/{project.get('repo-path') or name}"
+            projects[name] = {
+                'revision': str(project.get('revision') or defaults.get('revision') or DEFAULT_PROJECT_REVISION),
+                'url': url,
+                'path': (project.get('path') or name).rstrip('/'),
+                'groups': list(project.get('groups', []) or []),
+            }
+
+    def load_board_data(self) -> Dict[str, Dict]:
+        """Load the YAML data of the board configurations at the revision, keyed by board name."""
+        boards = {}
+        for path in self.list_files('boards'):
+            board_name = os.path.splitext(os.path.basename(path))[0]
+            try:
+                boards[board_name] = yaml.safe_load(self.read_file(path) or '') or {}
+            except yaml.YAMLError as e:
+                self.logger(f"Skipping unreadable board configuration {path} at {self.revision}: {e}", 'wrn')
+        return boards
+
+
+class ManifestDiff:
+    """Comparison of the manifest repository at two git revisions."""
+
+    def __init__(self, base: ManifestRevision, head: ManifestRevision):
+        self.base = base
+        self.head = head
+
+    def get_changed_projects(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the projects added, removed or changed between the revisions.
+
+        Returns:
+            Dictionary mapping project names to their 'old' and 'new' definitions,
+            None for projects missing at one revision
+        """
+        base_projects = self.base.load_projects()
+        head_projects = self.head.load_projects()
+        changed = {}
+        for name in sorted(set(base_projects) | set(head_projects)):
+            old = base_projects.get(name)
+            new = head_projects.get(name)
+            if old is None or new is None or any(old[key] != new[key] for key in PROJECT_ATTRIBUTES):
+                changed[name] = {'old': old, 'new': new}
+        return changed
+
+    def get_changed_files(self) -> List[str]:
+        """Get the files of the manifest repository changed between the revisions."""
+        output = self.head._git(['diff', '--name-only', self.base.revision, self.head.revision])
+        return sorted(line for line in output.splitlines() if line)
+
+    def group_filter_changed(self) -> bool:
+        """Check whether the group-filter of the top manifest changed."""
+        self.base.load_projects()
+        self.head.load_projects()
+        return self.base.group_filter != self.head.group_filter
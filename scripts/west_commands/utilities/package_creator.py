@@ -3,15 +3,46 @@
 # SPDX-License-Identifier: BSD-3-Clause
 
 import os
-import zipfile
 import shutil
+import fnmatch
+import hashlib
 import tempfile
 import subprocess
 import time
 import yaml
-from typing import List, Optional, Set, Callable
-from dataclasses import dataclass
-from west.manifest import Manifest
+import concurrent.futures
+from typing import Dict, List, Optional, Set, Tuple, Callable
+from dataclasses import dataclass, asdict, replace
+from .workspace_context import WorkspaceContext
+from .board_matcher import BoardKeyMatcher
+from .doc_cache import DocArtifactCache
+from .workspace_cache import CACHE_DIR_NAME, read_git_head
+from .git_cache import dissociate
+from .profiler import PhaseProfiler
+from .compression_policy import CompressionPolicy, DEFAULT_COMPRESSION_PRESET
+from .archive_writer import (ArchiveWriter, check_archive_backend, create_archive_writer, get_archive_format,
+                             get_source_date_epoch)
+from .package_journal import PackageJournal, CheckpointedArchiveWriter
+from .package_layers import LayeredBoard, LayeredPackageWriter
+from .package_index import (MEMBER_DIRECTORY, MEMBER_FILE, MEMBER_SYMLINK, PACKAGE_INDEX_NAME, PackageIndex,
+                            PackageMember, hash_file)
+
+
+EXAMPLE_YML_NAME = 'example.yml'
+# Directories skipped when example.yml files have to be searched on disk
+EXAMPLE_YML_PRUNED_DIRS = {'.git', '_build', '__pycache__'}
+# Example directories shared by all examples, never removed as unsupported
+EXAMPLE_SHARED_DIRS = {'_boards', '_common'}
+# Upper bound of concurrent 'west doc pdf' builds when not set explicitly
+DEFAULT_MAX_DOC_JOBS = 4
+# Project holding the documentation sources, staged first so doc builds can start early
+DOC_PROJECT_NAME = 'mcu-sdk-doc'
+# Package directory the documentation is built in and the PDFs are placed in
+DOC_PACKAGE_PATH = 'mcuxsdk/docs'
+# Projects whose revisions determine the content of a generated board PDF, the only ones doc builds read
+DOC_INPUT_PROJECTS = (DOC_PROJECT_NAME, 'core', 'mcu-sdk-examples')
+# Generated board PDFs in the docs directory
+DOC_PDF_PATTERN = 'mcuxsdk-*.pdf'
 
 @dataclass
 class PackageOptions:
@@ -19,23 +50,58 @@ class PackageOptions:
     include_git: bool = False
     generate_docs: bool = False
     board_filter: List[str] = None
+    legacy_board_match: bool = False  # Substring matching of example.yml board keys (historical behavior)
+    doc_jobs: int = 0  # Concurrent documentation builds, 0 selects automatically
+    doc_cache: bool = True  # Reuse board PDFs cached for identical doc input revisions
+    compression: str = DEFAULT_COMPRESSION_PRESET  # Compression policy preset: fast, balanced or smallest
+    reproducible: bool = False  # Sorted members with SOURCE_DATE_EPOCH timestamps and normalized permissions
+    resume: bool = False  # Journal progress in <output>.partial and continue an interrupted build from it
+    keep_unsupported_examples: bool = False  # Keep examples left without target boards by example.yml filtering
     
     def __post_init__(self):
         if self.board_filter is None:
             self.board_filter = []
 
 
+@dataclass
+class DocBuildResult:
+    """Outcome of the documentation build for one board."""
+    board: str
+    success: bool
+    elapsed: float
+    pdf_path: Optional[str] = None
+    error: Optional[str] = None
+    cached: bool = False
+
+
 class PackageCreator:
     """Independent utility for creating filtered SDK packages."""
     
-    def __init__(self, workspace_root: str, logger: Callable[[str, str], None] = None):
+    def __init__(self, workspace_root: str, logger: Callable[[str, str], None] = None,
+                 context: Optional[WorkspaceContext] = None, profiler: Optional[PhaseProfiler] = None):
         self.workspace_root = workspace_root
         self.logger = logger or self._default_logger
+        self.profiler = profiler or PhaseProfiler(enabled=False)
+        self._context = context
+        self._example_yml_index = None  # example.yml paths recorded while staging, None if not collected
+        self._board_matcher = None
+        self._compression_policy = None
+        self._source_date_epoch = None  # Member timestamp of reproducible archives, None otherwise
+        self._journal = None  # Progress journal of resumable builds
+        self._board_example_index = {}  # Target board -> examples of the filtered example.yml files supporting it
+        self._package_index = None  # Index of the members archived so far, with the package sources
     
     def _default_logger(self, message: str, level: str = 'inf'):
         """Default logger that does nothing."""
         pass
     
+    @property
+    def context(self) -> WorkspaceContext:
+        """Workspace context, resolved on first use if none was provided."""
+        if self._context is None:
+            self._context = WorkspaceContext.from_topdir(self.workspace_root, self.logger)
+        return self._context
+    
     def create_package(self, output_path: str, projects: List, repo_list: List[str], 
                       example_list: List[str], options: PackageOptions) -> None:
         """Create a filtered package with the specified options."""
@@ -43,63 +109,222 @@ class PackageCreator:
         self.logger(f"Package options: git={options.include_git}, docs={options.generate_docs}, "
                    f"board_filter={options.board_filter}", 'dbg')
         
-        temp_dir = tempfile.mkdtemp(prefix='sdk_package_')
-        self.logger(f"Created temporary directory: {temp_dir}", 'dbg')
+        check_archive_backend(output_path)
+        
+        self._journal = None
+        if options.resume:
+            self._journal = PackageJournal(output_path, self._get_journal_key(
+                output_path, projects, repo_list, example_list, options), self.logger)
+            self._journal.load()
+            temp_dir = self._journal.staging_dir
+            self.logger(f"Using resumable staging directory: {temp_dir}", 'dbg')
+        else:
+            temp_dir = tempfile.mkdtemp(prefix='sdk_package_')
+            self.logger(f"Created temporary directory: {temp_dir}", 'dbg')
+        self._compression_policy = CompressionPolicy(options.compression)
+        self._source_date_epoch = get_source_date_epoch(self.logger) if options.reproducible else None
+        if self._source_date_epoch is not None:
+            self.logger(f"Reproducible archive, member timestamp: {self._source_date_epoch}", 'dbg')
+        self._package_index = PackageIndex({}, self._get_index_projects(projects), options.board_filter)
         
         try:
             start_time = time.time()
-            
-            # Copy repositories with filtering
-            self.logger("Starting repository copy phase", 'inf')
-            copy_start = time.time()
-            self._copy_repositories(temp_dir, projects, options)
-            copy_elapsed = time.time() - copy_start
-            self.logger(f"Repository copy completed in {copy_elapsed:.2f} seconds", 'inf')
-
-            # Clean west manifest filter settings in temp directory
-            self.logger("Cleaning west manifest filter settings", 'inf')
-            self._clean_west_filters(temp_dir)
-            
-            # Handle documentation
-            if options.generate_docs:
-                self.logger("Starting documentation generation phase", 'inf')
-                doc_start = time.time()
-                self._generate_documentation(temp_dir, options.board_filter)
-                doc_elapsed = time.time() - doc_start
-                self.logger(f"Documentation generation completed in {doc_elapsed:.2f} seconds", 'inf')
-            else:
-                self.logger("Removing documentation directory", 'dbg')
-                self._remove_docs_directory(temp_dir)
-
-            # Filter examples
-            self.logger("Starting example filtering phase", 'inf')
-            filter_start = time.time()
-            self._remove_unwanted_directory(temp_dir, repo_list)
-            self._filter_examples(temp_dir, repo_list, example_list, options.board_filter)
-            filter_elapsed = time.time() - filter_start
-            self.logger(f"Example filtering completed in {filter_elapsed:.2f} seconds", 'inf')
-
-            # Create final archive
-            self.logger("Starting archive creation phase", 'inf')
-            archive_start = time.time()
-            self._create_archive(temp_dir, output_path)
-            archive_elapsed = time.time() - archive_start
-            self.logger(f"Archive creation completed in {archive_elapsed:.2f} seconds", 'inf')
+            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as doc_executor:
+                doc_future = self._stage_package(temp_dir, projects, repo_list, example_list, options, doc_executor)
+                
+                # Create final archive, documentation is appended once its builds finish
+                self.logger("Starting archive creation phase", 'inf')
+                archive_start = time.time()
+                with self.profiler.phase('archive') as record:
+                    self._create_archive(temp_dir, output_path, doc_future)
+                    if os.path.exists(output_path):
+                        record.args['archive_bytes'] = os.path.getsize(output_path)
+                archive_elapsed = time.time() - archive_start
+                self.logger(f"Archive creation completed in {archive_elapsed:.2f} seconds", 'inf')
             
             total_elapsed = time.time() - start_time
             self.logger(f"Package creation completed successfully in {total_elapsed:.2f} seconds", 'inf')
+            if self._journal is not None:
+                self._journal.discard()
             
         except Exception as e:
             self.logger(f"Package creation failed: {e}", 'err')
+            if self._journal is not None:
+                self.logger(f"Package build state kept in {self._journal.partial_dir}, "
+                            f"rerun with --resume to continue", 'inf')
             raise
         finally:
-            if os.path.exists(temp_dir):
+            if self._journal is None and os.path.exists(temp_dir):
                 self.logger(f"Cleaning up temporary directory: {temp_dir}", 'dbg')
                 try:
                     shutil.rmtree(temp_dir)
                 except Exception as e:
                     self.logger(f"Cleaning tmp folder failed: {e}, please delete manually {temp_dir}.", 'wrn')
 
+    def create_layered_package(self, output_dir: str, boards: List[LayeredBoard],
+                               options: PackageOptions) -> Dict:
+        """
+        Create a layered package for a board set.
+        
+        Every board package is staged as with create_package, with the board
+        filter of the board, and the staged trees are split into one
+        content-addressed base archive holding the members identical for all
+        boards and one overlay archive per board, described by a layers.json
+        manifest in output_dir. Layer archives are always zip.
+        
+        Args:
+            output_dir: Directory receiving the layer archives and the manifest
+            boards: Package inputs of the boards of the set
+            options: Package options, the board filter is taken from each board
+            
+        Returns:
+            Layers manifest as written to output_dir
+        """
+        if options.resume:
+            raise RuntimeError("Layered packages cannot be resumed")
+        if not boards:
+            raise RuntimeError("Layered packages need at least one board")
+        self.logger(f"Starting layered package creation for {len(boards)} boards: {output_dir}", 'inf')
+        
+        self._journal = None
+        self._compression_policy = CompressionPolicy(options.compression)
+        self._source_date_epoch = get_source_date_epoch(self.logger) if options.reproducible else None
+        staging_root = tempfile.mkdtemp(prefix='sdk_layers_')
+        self.logger(f"Created temporary directory: {staging_root}", 'dbg')
+        
+        try:
+            start_time = time.time()
+            staged = {}
+            for board in boards:
+                self.logger(f"Staging package of board {board.name}", 'inf')
+                stage_dir = os.path.join(staging_root, board.name)
+                os.makedirs(stage_dir)
+                board_options = replace(options, board_filter=board.board_filter)
+                with self.profiler.phase('stage', board=board.name):
+                    self._stage_package(stage_dir, board.projects, board.repo_list, board.example_list,
+                                        board_options)
+                staged[board.name] = stage_dir
+            
+            self.logger("Starting layer archive creation phase", 'inf')
+            with self.profiler.phase('archive'):
+                writer = LayeredPackageWriter(output_dir, self._get_compression_policy(), self.logger,
+                                              self._source_date_epoch)
+                manifest = writer.write(staged, {board.name: PackageIndex({}, self._get_index_projects(board.projects),
+                                                                          board.board_filter) for board in boards})
+            
+            self.logger(f"Layered package creation completed successfully in "
+                        f"{time.time() - start_time:.2f} seconds", 'inf')
+            return manifest
+        except Exception as e:
+            self.logger(f"Layered package creation failed: {e}", 'err')
+            raise
+        finally:
+            self.logger(f"Cleaning up temporary directory: {staging_root}", 'dbg')
+            try:
+                shutil.rmtree(staging_root)
+            except Exception as e:
+                self.logger(f"Cleaning tmp folder failed: {e}, please delete manually {staging_root}.", 'wrn')
+    
+    def _stage_package(self, temp_dir: str, projects: List, repo_list: List[str], example_list: List[str],
+                       options: PackageOptions,
+                       doc_executor: Optional[concurrent.futures.Executor] = None) -> Optional[concurrent.futures.Future]:
+        """
+        Stage the filtered package tree: copy the projects, build or remove the documentation, filter examples.
+        
+        With doc_executor, documentation builds run in the background when
+        possible, and the returned future completes once they finished;
+        otherwise they run in place and None is returned.
+        """
+        # Skipped copy phases record nothing, example.yml files are then searched on disk
+        self._example_yml_index = None if self._journal and self._journal.resumed else set()
+        self._board_matcher = BoardKeyMatcher(options.board_filter, options.legacy_board_match)
+        excluded_boards = self._get_excluded_boards(options.board_filter)
+        self.logger(f"Excluding {len(excluded_boards)} boards from filtering: {sorted(list(excluded_boards))}", 'dbg')
+        
+        # Documentation builds overlap the remaining phases when they can run in
+        # private doc workspaces linked to a snapshot of the staged doc inputs
+        overlap_docs = (doc_executor is not None and options.generate_docs and bool(options.board_filter)
+                        and self._symlinks_supported())
+        doc_projects = [p for p in projects if p.name in DOC_INPUT_PROJECTS]
+        other_projects = [p for p in projects if p.name not in DOC_INPUT_PROJECTS]
+        doc_future = None
+        
+        # Stage workspace metadata and the doc input projects first, the doc builds read nothing else
+        self.logger("Starting repository copy phase", 'inf')
+        copy_start = time.time()
+        with self.profiler.phase('copy'):
+            if not self._is_phase_done('copy:metadata'):
+                with self.profiler.phase('copy:metadata', 'copy'):
+                    self._copy_workspace_metadata(temp_dir, excluded_boards, options.include_git)
+                self._mark_phase_done('copy:metadata')
+            self._copy_repositories(temp_dir, doc_projects, excluded_boards, options.include_git)
+            
+            # Clean west manifest filter settings in temp directory
+            if not self._is_phase_done('clean_filters'):
+                self.logger("Cleaning west manifest filter settings", 'inf')
+                with self.profiler.phase('clean_filters'):
+                    self._clean_west_filters(temp_dir)
+                self._mark_phase_done('clean_filters')
+            
+            # Serial and background builds read the staged doc inputs, before the other projects are staged
+            doc_start = time.time()
+            if overlap_docs and not self._is_phase_done('docs'):
+                self.logger("Starting documentation generation phase in background", 'inf')
+                snapshot_dir = self._snapshot_doc_inputs(temp_dir)
+                doc_future = doc_executor.submit(self._run_snapshot_documentation_phase, temp_dir, options,
+                                                 doc_projects, snapshot_dir)
+            elif options.generate_docs:
+                self._run_documentation_phase(temp_dir, options, doc_projects)
+            doc_elapsed = time.time() - doc_start if doc_future is None else 0.0
+            
+            self._copy_repositories(temp_dir, other_projects, excluded_boards, options.include_git)
+        copy_elapsed = time.time() - copy_start - doc_elapsed
+        self.logger(f"Repository copy completed in {copy_elapsed:.2f} seconds", 'inf')
+        
+        if not options.generate_docs:
+            self.logger("Removing documentation directory", 'dbg')
+            self._remove_docs_directory(temp_dir)
+        
+        # Filter examples
+        if not self._is_phase_done('filter'):
+            self.logger("Starting example filtering phase", 'inf')
+            filter_start = time.time()
+            with self.profiler.phase('filter'):
+                with self.profiler.phase('filter:projects', 'filter'):
+                    self._remove_unwanted_directory(temp_dir, repo_list, options.generate_docs)
+                self._filter_examples(temp_dir, repo_list, example_list, options.board_filter,
+                                      not options.keep_unsupported_examples)
+            self._mark_phase_done('filter')
+            filter_elapsed = time.time() - filter_start
+            self.logger(f"Example filtering completed in {filter_elapsed:.2f} seconds", 'inf')
+        
+        return doc_future
+
+    def _get_journal_key(self, output_path: str, projects: List, repo_list: List[str],
+                         example_list: List[str], options: PackageOptions) -> str:
+        """Get the key of the build inputs, a resumed build must have the same inputs."""
+        inputs = {
+            'output': os.path.abspath(output_path),
+            'projects': [(p.name, p.path, read_git_head(os.path.join(self.workspace_root, p.path)))
+                         for p in projects],
+            'repos': sorted(repo_list),
+            'examples': sorted(example_list),
+            'options': {k: v for k, v in asdict(options).items() if k not in ('resume', 'doc_jobs')},
+        }
+        return PackageJournal.compute_key(inputs)
+    
+    def _is_phase_done(self, phase: str) -> bool:
+        """Check whether a resumed build completed a phase before it was interrupted."""
+        if self._journal is not None and self._journal.is_done(phase):
+            self.logger(f"Skipping phase completed by an earlier run: {phase}", 'inf')
+            return True
+        return False
+    
+    def _mark_phase_done(self, phase: str) -> None:
+        """Record a completed phase in the journal of a resumable build."""
+        if self._journal is not None:
+            self._journal.mark_done(phase)
+    
     def _clean_west_filters(self, temp_dir: str) -> None:
         """Clean west manifest filter settings in the temporary directory."""
         try:
@@ -139,28 +364,35 @@ class PackageCreator:
             self.logger(f"Warning: Unexpected error cleaning west filters: {e}", 'wrn')
             pass
 
-    def _copy_repositories(self, temp_dir: str, projects: List, options: PackageOptions) -> None:
-        """Copy repositories with filtering."""
-        self.logger(f"Copying {len(projects)} repositories to temporary directory", 'inf')
-        
-        # Get boards to exclude from filtering
-        excluded_boards = self._get_excluded_boards(options.board_filter)
-        self.logger(f"Excluding {len(excluded_boards)} boards from filtering: {sorted(list(excluded_boards))}", 'dbg')
-        
-        # Copy workspace metadata
+    def _copy_workspace_metadata(self, temp_dir: str, excluded_boards: Set[str], include_git: bool) -> None:
+        """Copy west workspace metadata."""
         for meta_dir in ['.west', 'manifests']:
             src = os.path.join(self.workspace_root, meta_dir)
             if os.path.exists(src):
                 dst = os.path.join(temp_dir, meta_dir)
                 self.logger(f"Copying workspace metadata: {meta_dir}", 'dbg')
-                self._copy_with_filtering(src, dst, excluded_boards, options.include_git)
+                # The workspace cache holds local build state only, it is never packaged
+                skip_paths = {CACHE_DIR_NAME} if meta_dir == '.west' else None
+                self._copy_with_filtering(src, dst, excluded_boards, include_git, skip_paths=skip_paths)
             else:
                 self.logger(f"Workspace metadata directory not found: {meta_dir}", 'dbg')
+    
+    def _copy_repositories(self, temp_dir: str, projects: List, excluded_boards: Set[str],
+                           include_git: bool) -> None:
+        """Copy repositories with filtering."""
+        if not projects:
+            return
+        self.logger(f"Copying {len(projects)} repositories to temporary directory", 'inf')
         
         # Copy project repositories
         for project in projects:
+            phase = f'copy:{project.name}'
+            if self._is_phase_done(phase):
+                continue
             self.logger(f"Copying project: {project.name} ({project.path})", 'dbg')
-            self._copy_project(temp_dir, project, excluded_boards, options.include_git)
+            with self.profiler.phase(phase, 'copy', path=project.path):
+                self._copy_project(temp_dir, project, excluded_boards, include_git)
+            self._mark_phase_done(phase)
     
     def _copy_project(self, temp_dir: str, project, excluded_boards: Set[str], 
                      include_git: bool) -> None:
@@ -172,18 +404,35 @@ class PackageCreator:
             
         dst = os.path.join(temp_dir, project.path)
         
-        if project.name == "core" or project.name == "mcu-sdk-doc":
+        if self._uses_git_tree_copy(project):
             self.logger(f"Using git tree copy for project: {project.name}", 'dbg')
             self._copy_project_with_git_tree(src, dst, excluded_boards, include_git)
         else:
-            # Apply board filtering only to examples
-            boards_to_exclude = excluded_boards if project.path == "mcuxsdk/examples" else set()
+            boards_to_exclude = self._get_project_excluded_boards(project, excluded_boards)
             if boards_to_exclude:
                 self.logger(f"Applying board filtering to project {project.name}: excluding {len(boards_to_exclude)} boards", 'dbg')
             else:
                 self.logger(f"No board filtering applied to project: {project.name}", 'dbg')
             self._copy_with_filtering(src, dst, boards_to_exclude, include_git)
 
+    @staticmethod
+    def _uses_git_tree_copy(project) -> bool:
+        """Check whether a project is copied from its git HEAD tree instead of its directory."""
+        return project.name == "core" or project.name == "mcu-sdk-doc"
+    
+    @staticmethod
+    def _get_project_excluded_boards(project, excluded_boards: Set[str]) -> Set[str]:
+        """Get the boards excluded from a directory-copied project."""
+        # Apply board filtering only to examples
+        return excluded_boards if project.path == "mcuxsdk/examples" else set()
+    
+    def _get_git_tree_files(self, src_dir: str) -> List[str]:
+        """Get the files of the HEAD tree of a git repository."""
+        cmd = ['git', 'ls-tree', '-r', '--name-only', 'HEAD']
+        self.logger(f"Getting git tree for: {src_dir}", 'dbg')
+        result = subprocess.run(cmd, cwd=src_dir, capture_output=True, text=True, check=True)
+        return [f.strip() for f in result.stdout.splitlines() if f.strip()]
+    
     def _copy_git_folder(self, src_dir: str, dst_dir: str) -> None:
         """Copy .git folder from source to destination."""
         git_src = os.path.join(src_dir, '.git')
@@ -201,7 +450,10 @@ class PackageCreator:
             elif os.path.isdir(git_src):
                 # .git is a directory (normal repository)
                 self.logger(f"Copying .git directory: {git_src}", 'dbg')
-                shutil.copytree(git_src, git_dst, symlinks=True, ignore_dangling_symlinks=True)
+                shutil.copytree(git_src, git_dst, symlinks=True, ignore_dangling_symlinks=True, dirs_exist_ok=True)
+                # Objects borrowed from a git cache of this host are copied in, the package must stand alone
+                if dissociate(git_dst, self.logger):
+                    self.logger(f"Dissociated packaged repository from its alternates: {git_dst}", 'dbg')
             elif os.path.islink(git_src):
                 # .git is a symlink
                 self.logger(f"Copying .git symlink: {git_src}", 'dbg')
@@ -218,11 +470,7 @@ class PackageCreator:
         
         try:
             # Get the current HEAD tree
-            cmd = ['git', 'ls-tree', '-r', '--name-only', 'HEAD']
-            self.logger(f"Getting git tree for: {src_dir}", 'dbg')
-            result = subprocess.run(cmd, cwd=src_dir, capture_output=True, text=True, check=True)
-            
-            tracked_files = [f.strip() for f in result.stdout.splitlines() if f.strip()]
+            tracked_files = self._get_git_tree_files(src_dir)
             self.logger(f"Found {len(tracked_files)} tracked files in git repository", 'dbg')
 
             if not tracked_files:
@@ -245,11 +493,15 @@ class PackageCreator:
                 
                 os.makedirs(os.path.dirname(dst_file), exist_ok=True)
                 
+                # Gitlinks of submodules are neither, nothing is staged for them
                 if os.path.islink(src_file):
                     self._copy_symlink(src_file, dst_file)
                 elif os.path.isfile(src_file):
-                    shutil.copy2(src_file, dst_file)
+                    self._copy_file(src_file, dst_file)
+                else:
+                    continue
                 
+                self._record_staged_file(dst_file)
                 copied_files += 1
                     
             self.logger(f"Git tree copy completed: {copied_files} files copied, {excluded_files} files excluded", 'dbg')
@@ -263,8 +515,8 @@ class PackageCreator:
             self._copy_git_folder(src_dir, dest_dir)
     
     def _copy_with_filtering(self, src_dir: str, dest_dir: str, excluded_boards: Set[str], 
-                           include_git: bool, rel_path: str = "") -> None:
-        """Recursively copy with filtering."""
+                           include_git: bool, rel_path: str = "", skip_paths: Optional[Set[str]] = None) -> None:
+        """Recursively copy with filtering, leaving out the relative paths in skip_paths."""
         if not os.path.exists(src_dir):
             self.logger(f"Source directory does not exist: {src_dir}", 'wrn')
             return
@@ -286,24 +538,51 @@ class PackageCreator:
             item_rel_path = os.path.join(rel_path, item) if rel_path else item
             
             # Apply filtering rules
+            if skip_paths and item_rel_path in skip_paths:
+                excluded_items += 1
+                continue
             if self._should_exclude_path(item_rel_path, excluded_boards, include_git):
                 excluded_items += 1
                 continue
             
             if os.path.islink(src_item):
                 self._copy_symlink(src_item, dest_item)
+                self._record_staged_file(dest_item)
                 copied_items += 1
             elif os.path.isdir(src_item):
-                self._copy_with_filtering(src_item, dest_item, excluded_boards, include_git, item_rel_path)
+                self._copy_with_filtering(src_item, dest_item, excluded_boards, include_git, item_rel_path, skip_paths)
                 copied_items += 1
             elif os.path.isfile(src_item):
                 os.makedirs(os.path.dirname(dest_item), exist_ok=True)
-                shutil.copy2(src_item, dest_item)
+                self._copy_file(src_item, dest_item)
+                self._record_staged_file(dest_item)
                 copied_items += 1
         
         if rel_path == "":  # Only log for top-level directory
             self.logger(f"Directory copy completed for {src_dir}: {copied_items} items copied, {excluded_items} items excluded", 'dbg')
     
+    def _copy_file(self, src_path: str, dest_path: str) -> None:
+        """Copy a file with its metadata, keeping copies a resumed build already staged."""
+        if self._journal is not None and self._journal.resumed:
+            try:
+                src_stat = os.stat(src_path)
+                dest_stat = os.lstat(dest_path)
+                if dest_stat.st_size == src_stat.st_size and dest_stat.st_mtime_ns == src_stat.st_mtime_ns:
+                    return
+            except OSError:
+                pass
+            # A staged copy may be linked into a doc snapshot, it is replaced rather than overwritten
+            if os.path.lexists(dest_path):
+                os.remove(dest_path)
+        shutil.copy2(src_path, dest_path)
+    
+    def _record_staged_file(self, dest_path: str) -> None:
+        """Record staged example.yml files so that filtering does not need to walk the tree."""
+        if self._example_yml_index is not None and os.path.basename(dest_path) == EXAMPLE_YML_NAME:
+            self._example_yml_index.add(os.path.normpath(dest_path))
+        if self.profiler.enabled and os.path.lexists(dest_path):
+            self.profiler.add(files=1, bytes=os.lstat(dest_path).st_size)
+    
     def _should_exclude_path(self, rel_path: str, excluded_boards: Set[str], include_git: bool) -> bool:
         """Check if a path should be excluded."""
         path_components = rel_path.split(os.sep)
@@ -344,13 +623,19 @@ class PackageCreator:
                 self.logger(f"Fallback copy also failed for {src_path}: {fallback_e}", 'wrn')
                 pass
     
+    def _get_board_matcher(self, target_boards: List[str]) -> BoardKeyMatcher:
+        """Get the board matcher built for this package, or build one for other target boards."""
+        if self._board_matcher is not None and self._board_matcher.target_boards == list(dict.fromkeys(target_boards)):
+            return self._board_matcher
+        return BoardKeyMatcher(target_boards)
+    
     def _get_excluded_boards(self, target_boards: List[str]) -> Set[str]:
         """Get board names to exclude from filtering."""
         if not target_boards:
             self.logger("No target boards specified, no board filtering will be applied", 'dbg')
             return set()
         
-        target_set = set(target_boards)
+        matcher = self._get_board_matcher(target_boards)
         excluded = set()
         
         boards_dir = os.path.join(self.workspace_root, "mcuxsdk", "examples", "_boards")
@@ -363,11 +648,11 @@ class PackageCreator:
                     board_path = os.path.join(boards_dir, name)
                     if os.path.isdir(board_path):
                         all_boards.append(name)
-                        if name not in target_set:
+                        if not matcher.matches_board(name):
                             excluded.add(name)
                 
                 self.logger(f"Found {len(all_boards)} total boards, excluding {len(excluded)} boards", 'dbg')
-                self.logger(f"Target boards (including dependencies):{sorted(target_set)}", 'dbg')
+                self.logger(f"Target boards (including dependencies):{sorted(matcher.target_boards)}", 'dbg')
                 
             except (OSError, PermissionError) as e:
                 self.logger(f"Error reading boards directory {boards_dir}: {e}", 'wrn')
@@ -377,43 +662,142 @@ class PackageCreator:
         
         return excluded
     
-    def _generate_documentation(self, temp_dir: str, board_list: List[str]) -> None:
-        """Generate documentation for specified boards."""
+    def _run_documentation_phase(self, temp_dir: str, options: PackageOptions, doc_projects: List,
+                                 source_root: Optional[str] = None) -> Dict[str, DocBuildResult]:
+        """Run the documentation generation phase with timing logs."""
+        if self._is_phase_done('docs'):
+            return {}
+        # The builds read the staged doc input projects, without the excluded boards
+        doc_inputs = {'projects': sorted(p.name for p in doc_projects), 'boards': sorted(options.board_filter)}
+        doc_start = time.time()
+        with self.profiler.phase('docs', boards=len(options.board_filter)):
+            results = self._generate_documentation(temp_dir, options.board_filter, options.doc_jobs,
+                                                   options.doc_cache, source_root, doc_inputs)
+        self._mark_phase_done('docs')
+        doc_elapsed = time.time() - doc_start
+        self.logger(f"Documentation generation completed in {doc_elapsed:.2f} seconds", 'inf')
+        return results
+    
+    def _run_snapshot_documentation_phase(self, temp_dir: str, options: PackageOptions, doc_projects: List,
+                                          snapshot_dir: str) -> Dict[str, DocBuildResult]:
+        """Run the documentation generation phase on a snapshot of the staged doc inputs, removed afterwards."""
+        try:
+            return self._run_documentation_phase(temp_dir, options, doc_projects, snapshot_dir)
+        finally:
+            shutil.rmtree(snapshot_dir, ignore_errors=True)
+    
+    def _snapshot_doc_inputs(self, temp_dir: str) -> str:
+        """
+        Snapshot the staging directory for background documentation builds.
+        
+        Files are hard linked when possible. Staged files are replaced, never
+        rewritten in place, so later phases do not change the snapshot.
+        """
+        snapshot_dir = tempfile.mkdtemp(prefix='sdk_doc_inputs_', dir=os.path.dirname(temp_dir))
+        
+        def link_or_copy(src: str, dst: str) -> None:
+            try:
+                os.link(src, dst)
+            except OSError:
+                shutil.copy2(src, dst)
+        
+        with self.profiler.phase('copy:doc_snapshot', 'copy'):
+            for entry in os.listdir(temp_dir):
+                src = os.path.join(temp_dir, entry)
+                dst = os.path.join(snapshot_dir, entry)
+                if os.path.isdir(src) and not os.path.islink(src):
+                    shutil.copytree(src, dst, symlinks=True, copy_function=link_or_copy)
+                elif os.path.islink(src):
+                    os.symlink(os.readlink(src), dst)
+                else:
+                    link_or_copy(src, dst)
+        self.logger(f"Snapshot of the documentation inputs: {snapshot_dir}", 'dbg')
+        return snapshot_dir
+    
+    def _generate_documentation(self, temp_dir: str, board_list: List[str], doc_jobs: int = 0,
+                                use_cache: bool = False, source_root: Optional[str] = None,
+                                doc_inputs: Optional[Dict] = None) -> Dict[str, DocBuildResult]:
+        """
+        Generate documentation for specified boards.
+        
+        With several boards the builds run concurrently in a bounded pool of
+        'west doc pdf' processes, each in its own doc workspace so that the
+        _build/latex outputs do not collide. Failures are collected per board.
+        With use_cache, PDFs cached for the same doc input revisions are reused
+        and only cache misses are built.
+        
+        With source_root, every build runs in a doc workspace linked to that
+        snapshot of the staging directory instead of the staging directory
+        itself, so the rest of the staging directory may still be copied and
+        filtered while the builds run.
+        
+        Args:
+            temp_dir: Staging directory of the package
+            board_list: Boards to generate PDF documentation for
+            doc_jobs: Maximum number of concurrent builds (0 selects automatically)
+            use_cache: Whether to use the documentation artifact cache
+            source_root: Snapshot the doc workspaces link to (None for the staging directory)
+            doc_inputs: Description of the tree the builds read, part of the cache keys
+            
+        Returns:
+            Dictionary mapping board names to their DocBuildResult
+        """
         if not board_list:
             self.logger("No boards specified for documentation generation", 'dbg')
-            return
+            return {}
         
         self.logger(f"Generating documentation for {len(board_list)} boards: {board_list}", 'inf')
         
         docs_dir = os.path.join(temp_dir, "mcuxsdk", "docs")
         os.makedirs(docs_dir, exist_ok=True)
         
-        successful_docs = 0
-        failed_docs = 0
-        
-        for board_name in board_list:
-            try:
-                self.logger(f"Generating PDF documentation for board: {board_name}", 'dbg')
-                cmd = ['west', 'doc', 'pdf', '--board', board_name]
-                result = subprocess.run(cmd, cwd=temp_dir, check=True, capture_output=True, text=True)
-                
-                # Move generated PDF to final location
-                pdf_src = os.path.join(temp_dir, "mcuxsdk", "docs", "_build", "latex", f"mcuxsdk-{board_name}.pdf")
-                if os.path.exists(pdf_src):
+        results = {}
+        doc_cache = None
+        cache_keys = {}
+        if use_cache:
+            doc_cache = DocArtifactCache(self.workspace_root, self.logger)
+            input_revisions = self._get_doc_input_revisions()
+            if input_revisions is not None:
+                cache_keys = {b: doc_cache.compute_key(b, input_revisions, doc_inputs) for b in board_list}
+                for board_name in board_list:
                     pdf_dest = os.path.join(docs_dir, f"mcuxsdk-{board_name}.pdf")
-                    shutil.move(pdf_src, pdf_dest)
-                    successful_docs += 1
-                    self.logger(f"Generated documentation: mcuxsdk-{board_name}.pdf", 'dbg')
-                else:
-                    self.logger(f"Expected PDF not found for board {board_name}: {pdf_src}", 'wrn')
-                    failed_docs += 1
-                    
-            except subprocess.CalledProcessError as e:
-                failed_docs += 1
-                self.logger(f"Documentation generation failed for board {board_name}: {e}", 'wrn')
-                if e.stderr:
-                    self.logger(f"Doc generation error output: {e.stderr.strip()}", 'dbg')
-                continue
+                    if doc_cache.fetch(cache_keys[board_name], pdf_dest):
+                        self.logger(f"Using cached documentation for board: {board_name}", 'inf')
+                        results[board_name] = DocBuildResult(board_name, True, 0.0, pdf_path=pdf_dest, cached=True)
+        
+        pending_boards = [b for b in board_list if b not in results]
+        
+        jobs = doc_jobs if doc_jobs and doc_jobs > 0 else min(DEFAULT_MAX_DOC_JOBS, os.cpu_count() or 1)
+        jobs = max(1, min(jobs, len(pending_boards)))
+        if jobs > 1 and not self._symlinks_supported():
+            self.logger("Symbolic links are not supported, generating documentation serially", 'wrn')
+            jobs = 1
+        
+        if jobs == 1:
+            for board_name in pending_boards:
+                results[board_name] = self._build_board_documentation(
+                    temp_dir, board_name, docs_dir, isolated=source_root is not None, source_root=source_root)
+        else:
+            self.logger(f"Running {jobs} documentation builds in parallel", 'inf')
+            with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+                futures = {
+                    executor.submit(self._build_board_documentation, temp_dir, board_name, docs_dir,
+                                    True, source_root): board_name
+                    for board_name in pending_boards
+                }
+                for future in concurrent.futures.as_completed(futures):
+                    board_name = futures[future]
+                    try:
+                        results[board_name] = future.result()
+                    except Exception as e:
+                        results[board_name] = DocBuildResult(board_name, False, 0.0, error=str(e))
+        
+        if doc_cache is not None:
+            for board_name in pending_boards:
+                result = results[board_name]
+                if result.success and board_name in cache_keys:
+                    doc_cache.store(cache_keys[board_name], result.pdf_path, board_name, input_revisions)
+            doc_cache.evict()
         
         # Clean up build directory
         build_dir = os.path.join(temp_dir, "mcuxsdk", "docs", "_build")
@@ -421,7 +805,161 @@ class PackageCreator:
             self.logger("Cleaning up documentation build directory", 'dbg')
             shutil.rmtree(build_dir)
         
-        self.logger(f"Documentation generation completed: {successful_docs} successful, {failed_docs} failed", 'inf')
+        for board_name in board_list:
+            result = results[board_name]
+            status = ("cached" if result.cached else "ok") if result.success else "failed"
+            self.logger(f"Documentation for {board_name}: {status} in {result.elapsed:.2f} seconds", 'inf')
+        
+        failed = {b: r.error for b, r in results.items() if not r.success}
+        successful_docs = len(results) - len(failed)
+        if failed:
+            self.logger(f"Documentation generation failed for {len(failed)} boards:", 'wrn')
+            for board_name in sorted(failed):
+                self.logger(f"  {board_name}: {failed[board_name]}", 'wrn')
+        
+        self.logger(f"Documentation generation completed: {successful_docs} successful, {len(failed)} failed", 'inf')
+        return results
+    
+    def _get_doc_input_revisions(self) -> Optional[Dict[str, str]]:
+        """
+        Get the checked out revisions of the documentation build inputs.
+        
+        Returns:
+            Dictionary mapping project names to commits, or None if the cache cannot be
+            used (doc project missing, unknown HEAD or local modifications)
+        """
+        revisions = {}
+        for project_name in DOC_INPUT_PROJECTS:
+            project = self.context.get_project(project_name)
+            if project is None:
+                continue
+            repo_dir = os.path.join(self.workspace_root, project.path)
+            if not os.path.isdir(repo_dir):
+                continue
+            
+            head = read_git_head(repo_dir)
+            if not head:
+                self.logger(f"Cannot determine revision of {project_name}, documentation cache disabled", 'dbg')
+                return None
+            
+            try:
+                # Untracked files are ignored: nested projects live inside core's working tree
+                status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=repo_dir,
+                                        capture_output=True, text=True, check=True)
+            except (OSError, subprocess.CalledProcessError) as e:
+                self.logger(f"Cannot check {project_name} for local changes, documentation cache disabled: {e}", 'dbg')
+                return None
+            if status.stdout.strip():
+                self.logger(f"Project {project_name} has local changes, documentation cache disabled", 'inf')
+                return None
+            
+            revisions[project_name] = head
+        
+        if 'mcu-sdk-doc' not in revisions:
+            self.logger("Documentation project not found in workspace, documentation cache disabled", 'dbg')
+            return None
+        
+        self.logger(f"Documentation input revisions: {revisions}", 'dbg')
+        return revisions
+    
+    def _build_board_documentation(self, temp_dir: str, board_name: str, docs_dir: str,
+                                   isolated: bool, source_root: Optional[str] = None) -> DocBuildResult:
+        """Build the PDF for one board as a profiled phase."""
+        with self.profiler.phase(f'docs:{board_name}', 'docs', board=board_name) as record:
+            result = self._run_board_documentation_build(temp_dir, board_name, docs_dir, isolated, source_root)
+            if result.pdf_path and os.path.exists(result.pdf_path):
+                record.add(files=1, bytes=os.path.getsize(result.pdf_path))
+            record.args['success'] = result.success
+        return result
+    
+    def _run_board_documentation_build(self, temp_dir: str, board_name: str, docs_dir: str,
+                                       isolated: bool, source_root: Optional[str]) -> DocBuildResult:
+        """Build the PDF for one board and move it into the package docs directory."""
+        start_time = time.time()
+        build_root = temp_dir
+        try:
+            if isolated:
+                build_root = self._prepare_doc_workspace(temp_dir, board_name, source_root)
+            
+            self.logger(f"Generating PDF documentation for board: {board_name}", 'dbg')
+            cmd = ['west', 'doc', 'pdf', '--board', board_name]
+            env = None
+            if self._source_date_epoch is not None:
+                # Sphinx and LaTeX take document dates from SOURCE_DATE_EPOCH
+                env = dict(os.environ, SOURCE_DATE_EPOCH=str(self._source_date_epoch))
+            subprocess.run(cmd, cwd=build_root, check=True, capture_output=True, text=True, env=env)
+            
+            # Move generated PDF to final location
+            pdf_src = os.path.join(build_root, "mcuxsdk", "docs", "_build", "latex", f"mcuxsdk-{board_name}.pdf")
+            if not os.path.exists(pdf_src):
+                self.logger(f"Expected PDF not found for board {board_name}: {pdf_src}", 'wrn')
+                return DocBuildResult(board_name, False, time.time() - start_time,
+                                      error=f"expected PDF not found: {pdf_src}")
+            
+            pdf_dest = os.path.join(docs_dir, f"mcuxsdk-{board_name}.pdf")
+            shutil.move(pdf_src, pdf_dest)
+            self.logger(f"Generated documentation: mcuxsdk-{board_name}.pdf", 'dbg')
+            return DocBuildResult(board_name, True, time.time() - start_time, pdf_path=pdf_dest)
+            
+        except subprocess.CalledProcessError as e:
+            self.logger(f"Documentation generation failed for board {board_name}: {e}", 'wrn')
+            if e.stderr:
+                self.logger(f"Doc generation error output: {e.stderr.strip()}", 'dbg')
+            return DocBuildResult(board_name, False, time.time() - start_time,
+                                  error=f"west doc exited with code {e.returncode}")
+        except (OSError, shutil.Error) as e:
+            self.logger(f"Documentation generation failed for board {board_name}: {e}", 'wrn')
+            return DocBuildResult(board_name, False, time.time() - start_time, error=str(e))
+        finally:
+            if isolated and build_root != temp_dir:
+                shutil.rmtree(build_root, ignore_errors=True)
+    
+    def _prepare_doc_workspace(self, temp_dir: str, board_name: str, source_root: Optional[str] = None) -> str:
+        """
+        Create a private doc workspace for one board build.
+        
+        The workspace links every entry back to source_root (the package
+        staging directory by default), except the west metadata and the docs
+        project which are copied from it, so each build writes its own
+        mcuxsdk/docs/_build tree.
+        """
+        link_root = source_root or temp_dir
+        build_root = tempfile.mkdtemp(prefix=f'sdk_doc_{board_name}_')
+        self.logger(f"Preparing doc workspace for {board_name}: {build_root}", 'dbg')
+        
+        west_src = os.path.join(link_root, '.west')
+        if os.path.isdir(west_src):
+            shutil.copytree(west_src, os.path.join(build_root, '.west'), symlinks=True)
+        for entry in os.listdir(link_root):
+            src = os.path.join(link_root, entry)
+            dst = os.path.join(build_root, entry)
+            if entry not in ('.west', 'mcuxsdk'):
+                os.symlink(src, dst, target_is_directory=os.path.isdir(src))
+        
+        sdk_dst = os.path.join(build_root, 'mcuxsdk')
+        os.makedirs(sdk_dst)
+        docs_src = os.path.join(link_root, 'mcuxsdk', 'docs')
+        if os.path.isdir(docs_src):
+            shutil.copytree(docs_src, os.path.join(sdk_dst, 'docs'), symlinks=True,
+                            ignore=shutil.ignore_patterns('_build', '*.pdf'))
+        sdk_src = os.path.join(link_root, 'mcuxsdk')
+        for entry in os.listdir(sdk_src):
+            if entry != 'docs':
+                src = os.path.join(sdk_src, entry)
+                os.symlink(src, os.path.join(sdk_dst, entry), target_is_directory=os.path.isdir(src))
+        
+        return build_root
+    
+    def _symlinks_supported(self) -> bool:
+        """Check whether symbolic links can be created (e.g. not on Windows without privileges)."""
+        probe_dir = tempfile.mkdtemp(prefix='sdk_symlink_probe_')
+        try:
+            os.symlink(probe_dir, os.path.join(probe_dir, 'link'), target_is_directory=True)
+            return True
+        except (OSError, NotImplementedError):
+            return False
+        finally:
+            shutil.rmtree(probe_dir, ignore_errors=True)
     
     def _remove_docs_directory(self, temp_dir: str) -> None:
         """Remove docs directory."""
@@ -432,13 +970,38 @@ class PackageCreator:
         else:
             self.logger("No docs directory found to remove", 'dbg')
 
-    def _remove_unwanted_directory(self, temp_dir: str, repo_list: List[str]) -> None:
-        # Remove unwanted project directories
+    def _remove_doc_sources(self, docs_dir: str) -> None:
+        """Remove the documentation sources from the docs directory, keeping the generated PDFs."""
+        for entry in os.listdir(docs_dir):
+            path = os.path.join(docs_dir, entry)
+            if fnmatch.fnmatch(entry, DOC_PDF_PATTERN) and os.path.isfile(path):
+                continue
+            if os.path.isdir(path) and not os.path.islink(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+        self.logger(f"Removed documentation sources from {docs_dir}, keeping the generated PDFs", 'dbg')
+    
+    def _remove_unwanted_directory(self, temp_dir: str, repo_list: List[str], keep_docs: bool = False) -> None:
+        """
+        Remove unwanted project directories.
+        
+        With keep_docs, the generated PDFs are kept: the docs project directory
+        is emptied except for them, and projects containing it are kept.
+        """
         removed_projects = 0
-        manifest = Manifest.from_topdir()
-        for project in manifest.projects:
+        for project in self.context.projects:
             if project.name not in repo_list and project.path != "manifests":
+                project_path = self.context.normalize_path(project.path)
                 proj_dir = os.path.join(temp_dir, project.path)
+                if keep_docs and DOC_PACKAGE_PATH.startswith(project_path + '/'):
+                    self.logger(f"Keeping project directory {project.path}, it holds the documentation", 'dbg')
+                    continue
+                if keep_docs and project_path == DOC_PACKAGE_PATH:
+                    if os.path.exists(proj_dir):
+                        self._remove_doc_sources(proj_dir)
+                        removed_projects += 1
+                    continue
                 if os.path.exists(proj_dir):
                     shutil.rmtree(proj_dir)
                     self.logger(f"Removed unwanted project directory {proj_dir} ", 'dbg')
@@ -448,7 +1011,8 @@ class PackageCreator:
             self.logger(f"Removed {removed_projects} unwanted project directories", 'inf')
 
     def _filter_examples(self, temp_dir: str, repo_list: List[str], 
-                        example_list: List[str], board_filter: List[str]) -> None:
+                        example_list: List[str], board_filter: List[str],
+                        remove_unsupported: bool = False) -> None:
         """Filter examples based on the provided lists."""
         examples_root = os.path.join(temp_dir, "mcuxsdk", "examples")
         if not os.path.exists(examples_root):
@@ -457,6 +1021,32 @@ class PackageCreator:
         
         self.logger(f"Filtering examples with {len(example_list)} target examples and {len(board_filter)} board filters", 'inf')
         
+        target_paths, parent_paths = self._get_example_target_paths(example_list)
+        self.logger(f"Target paths: {len(target_paths)} paths, Parent paths: {len(parent_paths)} paths", 'dbg')
+        
+        # Remove unwanted directories
+        with self.profiler.phase('filter:examples', 'filter') as record:
+            removed_count = self._remove_unwanted_examples(examples_root, "", target_paths, parent_paths)
+            record.args['removed_dirs'] = removed_count
+        self.logger(f"Removed {removed_count} unwanted example directories", 'inf')
+        
+        # Filter example.yml files
+        with self.profiler.phase('filter:example_yml', 'filter'):
+            filtered_count = self._filter_example_yml_files(temp_dir, board_filter, remove_unsupported)
+        self.logger(f"Filtered {filtered_count} example.yml files", 'inf')
+        if self._board_example_index:
+            counts = {board: len(examples) for board, examples in sorted(self._board_example_index.items())}
+            self.logger(f"Examples supporting each target board: {counts}", 'dbg')
+    
+    @staticmethod
+    def _get_example_target_paths(example_list: List[str]) -> Tuple[Set[str], Set[str]]:
+        """
+        Get the example directories to keep and their parent directories.
+        
+        Returns:
+            Tuple of (target paths kept entirely, parent paths kept and descended into),
+            relative to mcuxsdk/examples
+        """
         # Build target paths
         target_paths = {"_boards", "_common"}
         target_paths.update(example.replace('\\', '/').strip('/') for example in example_list)
@@ -469,15 +1059,7 @@ class PackageCreator:
                 parent_path = '/'.join(path_parts[:i])
                 parent_paths.add(parent_path)
         
-        self.logger(f"Target paths: {len(target_paths)} paths, Parent paths: {len(parent_paths)} paths", 'dbg')
-        
-        # Remove unwanted directories
-        removed_count = self._remove_unwanted_examples(examples_root, "", target_paths, parent_paths)
-        self.logger(f"Removed {removed_count} unwanted example directories", 'inf')
-        
-        # Filter example.yml files
-        filtered_count = self._filter_example_yml_files(temp_dir, board_filter)
-        self.logger(f"Filtered {filtered_count} example.yml files", 'inf')
+        return target_paths, parent_paths
     
     def _remove_unwanted_examples(self, current_dir: str, relative_path: str, 
                                  target_paths: Set[str], parent_paths: Set[str]) -> int:
@@ -517,8 +1099,21 @@ class PackageCreator:
         
         return removed_count
     
-    def _filter_example_yml_files(self, temp_dir: str, target_boards: List[str]) -> int:
-        """Filter example.yml files to include only target boards."""
+    def _filter_example_yml_files(self, temp_dir: str, target_boards: List[str],
+                                  remove_unsupported: bool = False) -> int:
+        """
+        Filter example.yml files to include only target boards.
+        
+        Args:
+            temp_dir: Staging directory
+            target_boards: Boards kept in example.yml files
+            remove_unsupported: Whether examples left without boards are removed, their
+                entries and, below the examples project, their directories
+        
+        Returns:
+            Number of example.yml files modified
+        """
+        self._board_example_index = {}
         if not target_boards:
             self.logger("No target boards specified, skipping example.yml filtering", 'dbg')
             return 0
@@ -531,24 +1126,95 @@ class PackageCreator:
         
         self.logger(f"Filtering example.yml files for boards: {target_boards}", 'dbg')
         
-        # Find all example.yml files
-        yml_files = []
-        for root, dirs, files in os.walk(examples_dir):
-            for file in files:
-                if file == 'example.yml':
-                    yml_files.append(os.path.join(root, file))
-        
+        yml_files = self._find_example_yml_files(examples_dir)
         self.logger(f"Found {len(yml_files)} example.yml files to process", 'dbg')
         
+        matcher = self._get_board_matcher(target_boards)
+        self.logger(f"Using board key matcher: {matcher}", 'dbg')
+        
         filtered_count = 0
+        unsupported_files = []
         for yml_path in yml_files:
-            if self._filter_single_example_yml(yml_path, target_boards):
+            if self._filter_single_example_yml(yml_path, matcher, remove_unsupported, unsupported_files):
                 filtered_count += 1
+                if self.profiler.enabled:
+                    self.profiler.add(files=1, bytes=os.path.getsize(yml_path))
+        
+        if unsupported_files:
+            examples_root = os.path.join(examples_dir, 'examples')
+            kept_files = set(yml_files) - set(unsupported_files)
+            removed_count = self._remove_unsupported_example_dirs(examples_root, unsupported_files, kept_files)
+            self.logger(f"Removed {removed_count} example directories without target boards", 'inf')
         
         return filtered_count
     
-    def _filter_single_example_yml(self, yml_file: str, target_boards: List[str]) -> bool:
-        """Filter a single example.yml file."""
+    def _remove_unsupported_example_dirs(self, examples_root: str, unsupported_files: List[str],
+                                         kept_files: Set[str]) -> int:
+        """
+        Remove the directories of example.yml files left without examples.
+        
+        Only directories below the examples project are removed, except the shared
+        ones and directories holding other example.yml files still supporting a
+        target board. Parent directories left empty are removed too.
+        """
+        prefix = os.path.join(os.path.normpath(examples_root), '')
+        kept_dirs = {os.path.dirname(path) for path in kept_files}
+        removed_count = 0
+        for yml_path in unsupported_files:
+            example_dir = os.path.dirname(yml_path)
+            rel_path = os.path.relpath(example_dir, examples_root).replace(os.sep, '/')
+            if (not example_dir.startswith(prefix) or rel_path.split('/', 1)[0] in EXAMPLE_SHARED_DIRS
+                    or not os.path.isdir(example_dir)):
+                continue
+            if any(kept == example_dir or kept.startswith(os.path.join(example_dir, '')) for kept in kept_dirs):
+                self.logger(f"Keeping unsupported example directory holding supported examples: {rel_path}", 'dbg')
+                continue
+            try:
+                self.logger(f"Removing example directory without target boards: {rel_path}", 'dbg')
+                shutil.rmtree(example_dir)
+                removed_count += 1
+            except (OSError, IOError) as e:
+                self.logger(f"Failed to remove directory {example_dir}: {e}", 'wrn')
+                continue
+            
+            parent_dir = os.path.dirname(example_dir)
+            while parent_dir.startswith(prefix) and not os.listdir(parent_dir):
+                os.rmdir(parent_dir)
+                parent_dir = os.path.dirname(parent_dir)
+        
+        return removed_count
+    
+    def _find_example_yml_files(self, examples_dir: str) -> List[str]:
+        """Find example.yml files, using the staging index when it is available."""
+        if self._example_yml_index is not None:
+            # Entries may have been removed by project or example filtering since staging
+            prefix = os.path.join(os.path.normpath(examples_dir), '')
+            yml_files = sorted(p for p in self._example_yml_index
+                               if p.startswith(prefix) and os.path.isfile(p))
+            self.logger(f"Using staging index for example.yml files ({len(self._example_yml_index)} recorded)", 'dbg')
+            return yml_files
+        
+        # No index (e.g. staged outside create_package): walk, pruning subtrees without examples
+        docs_dir = os.path.join(examples_dir, 'docs')
+        yml_files = []
+        for root, dirs, files in os.walk(examples_dir):
+            dirs[:] = [d for d in dirs
+                       if d not in EXAMPLE_YML_PRUNED_DIRS and os.path.join(root, d) != docs_dir]
+            if EXAMPLE_YML_NAME in files:
+                yml_files.append(os.path.join(root, EXAMPLE_YML_NAME))
+        return yml_files
+    
+    def _filter_single_example_yml(self, yml_file: str, matcher: BoardKeyMatcher,
+                                   remove_unsupported: bool = False,
+                                   unsupported_files: Optional[List[str]] = None) -> bool:
+        """
+        Filter a single example.yml file.
+        
+        The examples supporting a target board are added to the board to example
+        index. With remove_unsupported, examples whose boards were all filtered
+        out are removed, and the file is added to unsupported_files when no
+        example is left in it.
+        """
         try:
             with open(yml_file, 'r', encoding='utf-8') as f:
                 yaml_data = yaml.safe_load(f)
@@ -557,6 +1223,7 @@ class PackageCreator:
                 return False
             
             modified = False
+            unsupported = []
             
             for example_name, example_config in yaml_data.items():
                 if not isinstance(example_config, dict) or 'boards' not in example_config:
@@ -569,22 +1236,33 @@ class PackageCreator:
                 original_board_count = len(boards_config)
                 
                 # Filter boards
-                filtered_boards = {
-                    board_key: board_value 
-                    for board_key, board_value in boards_config.items()
-                    if any(target_board in board_key for target_board in target_boards)
-                }
+                filtered_boards = matcher.filter_boards(boards_config)
                 
                 if len(filtered_boards) != original_board_count:
                     example_config['boards'] = filtered_boards
                     modified = True
                     self.logger(f"Filtered example {example_name} in {yml_file}: "
                                f"{original_board_count} -> {len(filtered_boards)} boards", 'dbg')
+                
+                for board_key in filtered_boards:
+                    self._board_example_index.setdefault(matcher.parse_board(str(board_key)), set()).add(example_name)
+                if original_board_count and not filtered_boards:
+                    unsupported.append(example_name)
+            
+            if remove_unsupported and unsupported:
+                for example_name in unsupported:
+                    del yaml_data[example_name]
+                self.logger(f"Removed {len(unsupported)} examples without target boards from {yml_file}", 'dbg')
+                if not any(isinstance(v, dict) for v in yaml_data.values()) and unsupported_files is not None:
+                    unsupported_files.append(yml_file)
             
             # Write back if modified
             if modified:
-                with open(yml_file, 'w', encoding='utf-8') as f:
+                # Replaced, not rewritten in place: the staged file may be linked into a doc snapshot
+                tmp_file = yml_file + '.tmp'
+                with open(tmp_file, 'w', encoding='utf-8') as f:
                     yaml.safe_dump(yaml_data, f, default_flow_style=False, sort_keys=False)
+                os.replace(tmp_file, yml_file)
                 return True
                     
         except (yaml.YAMLError, IOError) as e:
@@ -593,31 +1271,90 @@ class PackageCreator:
         
         return False
     
-    def _create_archive(self, temp_dir: str, output_path: str) -> None:
-        """Create the final zip archive."""
-        self.logger(f"Creating zip archive: {output_path}", 'inf')
+    def _create_archive(self, temp_dir: str, output_path: str,
+                        doc_future: Optional[concurrent.futures.Future] = None) -> None:
+        """
+        Create the final archive in the format selected by the output file name.
+        
+        With doc_future, the documentation directory is still being generated:
+        everything else is compressed first and the documentation is appended
+        once the future completes. Reproducible archives wait for the
+        documentation instead, so that all members are added in sorted order.
+        
+        The package index, listing every member with its SHA-256 digest, is
+        added as the last member.
+        
+        Resumable builds write the archive into the partial directory and move
+        it to output_path when complete. Zip archives are checkpointed while
+        written, and a resumed build skips the members of the last checkpoint.
+        """
+        self.logger(f"Creating {get_archive_format(output_path)} archive: {output_path}", 'inf')
         
         output_zip_dir = os.path.dirname(output_path)
         if output_zip_dir and not os.path.exists(output_zip_dir):
             os.makedirs(output_zip_dir)
         
-        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=6) as zipf:
-            file_count = self._add_directory_to_zip(zipf, temp_dir, "")
+        docs_dir = os.path.join(temp_dir, "mcuxsdk", "docs")
+        if doc_future is not None and self._source_date_epoch is not None:
+            with self.profiler.phase('archive:docs_wait', 'archive'):
+                doc_future.result()
+            doc_future = None
+        deferred = {docs_dir} if doc_future is not None else None
+        
+        archive_path = output_path
+        if self._journal is not None:
+            archive_path = self._journal.archive_path
+            archived = self._journal.prepare_archive(get_archive_format(output_path) == 'zip')
+            writer = CheckpointedArchiveWriter(
+                create_archive_writer(archive_path, self._get_compression_policy(), self.logger,
+                                      self._source_date_epoch, append=bool(archived)),
+                self._journal, archived)
+        else:
+            writer = create_archive_writer(output_path, self._get_compression_policy(), self.logger,
+                                           self._source_date_epoch)
+        
+        with writer:
+            file_count = self._add_directory_to_archive(writer, temp_dir, "", deferred)
+            
+            if doc_future is not None:
+                if not doc_future.done():
+                    self.logger("Waiting for documentation generation to finish", 'inf')
+                wait_start = time.time()
+                with self.profiler.phase('archive:docs_wait', 'archive'):
+                    doc_future.result()
+                self.logger(f"Waited {time.time() - wait_start:.2f} seconds for documentation", 'dbg')
+                if os.path.isdir(docs_dir):
+                    with self.profiler.phase('archive:docs', 'archive'):
+                        writer.add_directory(docs_dir, "mcuxsdk/docs")
+                        self._index_member(PackageMember("mcuxsdk/docs", MEMBER_DIRECTORY, '', 0))
+                        file_count += 1 + self._add_directory_to_archive(writer, docs_dir, "mcuxsdk/docs")
+            
+            with self.profiler.phase('archive:index', 'archive'):
+                self._add_package_index(writer)
+            file_count += 1
+        
+        if archive_path != output_path:
+            os.replace(archive_path, output_path)
         
         # Get final archive size
         if os.path.exists(output_path):
             size_mb = os.path.getsize(output_path) / (1024 * 1024)
             self.logger(f"Archive created successfully: {file_count} files, {size_mb:.1f} MB", 'inf')
+            if writer.archive_format == 'zip':
+                self.logger(f"Archive {self._get_compression_policy().summary()}", 'dbg')
         else:
             self.logger(f"Archive creation completed but file not found: {output_path}", 'wrn')
     
-    def _add_directory_to_zip(self, zipf: zipfile.ZipFile, src_dir: str, arc_prefix: str) -> int:
-        """Add directory contents to zip file."""
+    def _add_directory_to_archive(self, writer: ArchiveWriter, src_dir: str, arc_prefix: str,
+                                  skip_dirs: Optional[Set[str]] = None) -> int:
+        """Add directory contents to the archive, leaving out the directories in skip_dirs."""
         try:
             items = os.listdir(src_dir)
         except (OSError, PermissionError) as e:
-            self.logger(f"Cannot read directory for zip {src_dir}: {e}", 'wrn')
+            self.logger(f"Cannot read directory for archive {src_dir}: {e}", 'wrn')
             return 0
+        if self._source_date_epoch is not None:
+            items.sort()
         
         file_count = 0
         
@@ -627,38 +1364,57 @@ class PackageCreator:
             arc_path = arc_path.replace(os.sep, '/')
       
             if os.path.islink(src_path):
-                self._add_symlink_to_zip(zipf, src_path, arc_path)
+                writer.add_symlink(src_path, arc_path)
+                target = os.readlink(src_path).encode('utf-8')
+                self._index_member(PackageMember(arc_path, MEMBER_SYMLINK, hashlib.sha256(target).hexdigest(),
+                                                 len(target)))
                 file_count += 1
             elif os.path.isdir(src_path):
-                if not arc_path.endswith('/'):
-                    arc_path += '/'
-                zipf.writestr(arc_path, '')
+                if skip_dirs and src_path in skip_dirs:
+                    continue
+                writer.add_directory(src_path, arc_path)
+                self._index_member(PackageMember(arc_path, MEMBER_DIRECTORY, '', 0))
                 file_count += 1
-                file_count += self._add_directory_to_zip(zipf, src_path, arc_path.rstrip('/'))
+                file_count += self._add_directory_to_archive(writer, src_path, arc_path, skip_dirs)
             elif os.path.isfile(src_path):
-                zipf.write(src_path, arc_path)
+                size = os.path.getsize(src_path)
+                digest = writer.add_file(src_path, arc_path, size)
+                # Members archived before a resume checkpoint are not read again by the writer
+                self._index_member(PackageMember(arc_path, MEMBER_FILE, digest or hash_file(src_path), size))
                 file_count += 1
+                self.profiler.add(files=1, bytes=size)
         
         return file_count
     
-    def _add_symlink_to_zip(self, zipf: zipfile.ZipFile, symlink_path: str, arc_path: str) -> None:
-        """Add symlink to zip with proper attributes."""
+    def _get_index_projects(self, projects: List) -> Dict[str, Dict[str, str]]:
+        """Get the paths, manifest revisions and checked out commits of projects for the package index."""
+        return {p.name: {'path': p.path, 'revision': p.revision or '',
+                         'commit': read_git_head(os.path.join(self.workspace_root, p.path)) or ''}
+                for p in projects}
+    
+    def _index_member(self, member: PackageMember) -> None:
+        """Record an archived member in the package index."""
+        if self._package_index is not None:
+            self._package_index.members[member.path] = member
+    
+    def _add_package_index(self, writer: ArchiveWriter) -> PackageIndex:
+        """Add the index of the archived members, digests computed while they were compressed."""
+        index = PackageIndex(self._package_index.members, self._package_index.projects,
+                             self._package_index.board_filter)
+        # Written outside the staging directory, a resumed build must not archive it as content
+        fd, index_path = tempfile.mkstemp(prefix='sdk_package_index_', suffix='.json')
+        os.close(fd)
         try:
-            link_target = os.readlink(symlink_path)
-            zip_info = zipfile.ZipInfo(arc_path)
-            zip_info.external_attr = (0o120000 | 0o755) << 16
-            zip_info.compress_type = zipfile.ZIP_STORED
-            
-            target_bytes = link_target.encode('utf-8')
-            zip_info.file_size = len(target_bytes)
-            zip_info.compress_size = len(target_bytes)
-            zip_info.create_system = 3
-            zip_info.extract_version = 20
-            
-            zipf.writestr(zip_info, target_bytes)
-            self.logger(f"Added symlink to zip: {arc_path} -> {link_target}", 'dbg')
-        except (OSError, IOError) as e:
-            # Fallback to regular file
-            self.logger(f"Failed to add symlink {symlink_path} to zip, using fallback: {e}", 'dbg')
-            if os.path.isfile(symlink_path):
-                zipf.write(symlink_path, arc_path)
+            index.write(index_path)
+            os.chmod(index_path, 0o644)
+            writer.add_file(index_path, PACKAGE_INDEX_NAME, os.path.getsize(index_path))
+        finally:
+            os.remove(index_path)
+        self.logger(f"Package index: {len(index.members)} members, digest {index.digest}", 'dbg')
+        return index
+    
+    def _get_compression_policy(self) -> CompressionPolicy:
+        """Get the compression policy of this package, the default preset if none was set."""
+        if self._compression_policy is None:
+            self._compression_policy = CompressionPolicy()
+        return self._compression_policy
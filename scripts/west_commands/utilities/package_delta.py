@@ -0,0 +1,275 @@
+# Copyright 2025 NXP
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Package delta utility.
+
+A delta holds what changed between two builds of a package: the members
+added, changed and removed, with their SHA-256 digests, and the content of
+the added and changed members. Members are compared through the package
+indexes, so the previous package is only needed for its index and only the
+added and changed members of the new package are read.
+
+A delta is a zip archive with a .package-delta.json manifest and the added
+and changed members under their package paths. It patches an extracted
+package directory in place, or a zip package into a new archive, after
+checking that the target is the package the delta was created from.
+"""
+
+import os
+import copy
+import json
+import stat
+import time
+import shutil
+import hashlib
+import zipfile
+from typing import Callable, Dict, List, Optional
+from .archive_writer import ARCHIVE_SUFFIXES, DEFAULT_SOURCE_DATE_EPOCH, ZIP_COPY_CHUNK_SIZE, get_archive_format
+from .package_index import (MEMBER_DIRECTORY, MEMBER_SYMLINK, PACKAGE_INDEX_NAME, PackageIndex,
+                            PackageMember, extract_zip_member, hash_file, open_package_tar)
+
+
+DELTA_MANIFEST_NAME = '.package-delta.json'
+DELTA_FORMAT_VERSION = 1
+DELTA_SUFFIX = '.delta.zip'
+
+
+def get_delta_path(package_path: str) -> str:
+    """Get the default delta file name of a package, e.g. package.delta.zip for package.tar.zst."""
+    for suffix in ARCHIVE_SUFFIXES:
+        if package_path.lower().endswith(suffix):
+            return package_path[:-len(suffix)] + DELTA_SUFFIX
+    return package_path + DELTA_SUFFIX
+
+
+def copy_zip_member(source: zipfile.ZipFile, info: zipfile.ZipInfo, output: zipfile.ZipFile) -> None:
+    """Copy a zip member in chunks, keeping its header and compression method."""
+    if info.is_dir():
+        output.writestr(info, b'', compress_type=info.compress_type)
+        return
+    # Writing updates the sizes and CRC of the header, keep the source entry intact
+    with source.open(info) as src, output.open(copy.copy(info), 'w') as dst:
+        shutil.copyfileobj(src, dst, ZIP_COPY_CHUNK_SIZE)
+
+
+class PackageDelta:
+    """Members added, changed and removed between two package indexes."""
+
+    def __init__(self, old: PackageIndex, new: PackageIndex):
+        self.old = old
+        self.new = new
+        self.added = [m for path, m in new.members.items() if path not in old.members]
+        self.changed = [m for path, m in new.members.items() if path in old.members and old.members[path] != m]
+        self.removed = [m for path, m in old.members.items() if path not in new.members]
+
+    @property
+    def content_members(self) -> List[PackageMember]:
+        """Members whose content the delta carries, in path order."""
+        return sorted(self.added + self.changed, key=lambda m: m.path)
+
+    def to_dict(self) -> Dict:
+        return {
+            'format_version': DELTA_FORMAT_VERSION,
+            'from': {'digest': self.old.digest, 'members': len(self.old.members)},
+            'to': {'digest': self.new.digest, 'members': len(self.new.members)},
+            'added': [m.to_dict() for m in self.added],
+            'changed': [dict(m.to_dict(), old_sha256=self.old.members[m.path].digest,
+                             old_type=self.old.members[m.path].kind) for m in self.changed],
+            'removed': [m.to_dict() for m in self.removed],
+        }
+
+    def summary(self) -> str:
+        changed_bytes = sum(m.size for m in self.added + self.changed)
+        return (f"{len(self.added)} added, {len(self.changed)} changed, {len(self.removed)} removed members, "
+                f"{changed_bytes / (1024 * 1024):.1f} MB of content")
+
+
+class PackageDeltaWriter:
+    """Independent utility creating the delta between a previous package and a new one."""
+
+    def __init__(self, logger: Callable[[str, str], None] = None):
+        self.logger = logger or self._default_logger
+
+    def _default_logger(self, message: str, level: str = 'inf'):
+        """Default logger that does nothing."""
+        pass
+
+    def create_delta(self, previous: str, package_path: str, output_path: Optional[str] = None) -> PackageDelta:
+        """
+        Create the delta from a previous package to a new package.
+
+        Args:
+            previous: Previous package archive, extracted package directory or package index JSON file
+            package_path: New package archive
+            output_path: Delta file to write (default: <package>.delta.zip)
+
+        Returns:
+            Delta between the packages
+        """
+        output_path = output_path or get_delta_path(package_path)
+        delta = PackageDelta(PackageIndex.load(previous, self.logger), PackageIndex.load(package_path, self.logger))
+        self.logger(f"Package delta: {delta.summary()}", 'inf')
+
+        partial_path = output_path + '.tmp'
+        with zipfile.ZipFile(partial_path, 'w', zipfile.ZIP_DEFLATED) as output:
+            output.writestr(DELTA_MANIFEST_NAME, json.dumps(delta.to_dict(), indent=1) + '\n')
+            wanted = {m.path for m in delta.content_members} | {PACKAGE_INDEX_NAME}
+            if get_archive_format(package_path) == 'zip':
+                self._copy_zip_members(package_path, wanted, output)
+            else:
+                self._copy_tar_members(package_path, wanted, output)
+        os.replace(partial_path, output_path)
+        self.logger(f"Package delta written to {output_path} "
+                    f"({os.path.getsize(output_path) / (1024 * 1024):.1f} MB)", 'inf')
+        return delta
+
+    def _copy_zip_members(self, package_path: str, wanted: set, output: zipfile.ZipFile) -> None:
+        with zipfile.ZipFile(package_path) as package:
+            for info in package.infolist():
+                if info.filename.rstrip('/') in wanted:
+                    copy_zip_member(package, info, output)
+
+    def _copy_tar_members(self, package_path: str, wanted: set, output: zipfile.ZipFile) -> None:
+        with open_package_tar(package_path) as package:
+            for info in package:
+                arc_path = info.name.rstrip('/')
+                if arc_path not in wanted:
+                    continue
+                zip_info = zipfile.ZipInfo(arc_path + '/' if info.isdir() else arc_path,
+                                           time.gmtime(max(info.mtime, DEFAULT_SOURCE_DATE_EPOCH))[:6])
+                zip_info.create_system = 3
+                if info.isdir():
+                    zip_info.external_attr = ((stat.S_IFDIR | info.mode) << 16) | 0x10
+                    output.writestr(zip_info, b'')
+                elif info.issym():
+                    zip_info.external_attr = (stat.S_IFLNK | 0o777) << 16
+                    output.writestr(zip_info, info.linkname.encode('utf-8'))
+                elif info.isfile():
+                    zip_info.external_attr = (stat.S_IFREG | info.mode) << 16
+                    zip_info.compress_type = zipfile.ZIP_DEFLATED
+                    zip_info.file_size = info.size
+                    with package.extractfile(info) as src, output.open(zip_info, 'w') as dst:
+                        shutil.copyfileobj(src, dst, ZIP_COPY_CHUNK_SIZE)
+
+
+class PackageDeltaApplier:
+    """Independent utility patching an extracted package directory or a zip package with a delta."""
+
+    def __init__(self, delta_path: str, logger: Callable[[str, str], None] = None):
+        self.delta_path = delta_path
+        self.logger = logger or self._default_logger
+        with zipfile.ZipFile(delta_path) as delta:
+            self.manifest = json.loads(delta.read(DELTA_MANIFEST_NAME))
+        version = self.manifest.get('format_version')
+        if version != DELTA_FORMAT_VERSION:
+            raise RuntimeError(f"Unsupported package delta format version {version} in {delta_path}")
+        self.added = [PackageMember.from_dict(entry) for entry in self.manifest['added']]
+        self.changed = [PackageMember.from_dict(entry) for entry in self.manifest['changed']]
+        self.removed = [PackageMember.from_dict(entry) for entry in self.manifest['removed']]
+        self.old_members = {entry['path']: PackageMember(entry['path'], entry['old_type'], entry['old_sha256'], 0)
+                            for entry in self.manifest['changed']}
+        self.old_members.update((m.path, m) for m in self.removed)
+
+    def _default_logger(self, message: str, level: str = 'inf'):
+        """Default logger that does nothing."""
+        pass
+
+    def apply(self, target: str, output_path: Optional[str] = None, force: bool = False) -> None:
+        """
+        Apply the delta to a package.
+
+        Args:
+            target: Extracted package directory, patched in place, or zip package
+            output_path: Patched zip package to write, by default the zip package is replaced
+            force: Apply even if the target is not the package the delta was created from
+        """
+        if os.path.isdir(target):
+            if output_path:
+                raise RuntimeError("Extracted package directories are patched in place, -o/--output does not apply")
+            self._check(self._find_mismatches(target), target, force)
+            self._apply_directory(target)
+        elif get_archive_format(target) == 'zip' and target.lower().endswith('.zip'):
+            index = PackageIndex.load(target, self.logger)
+            mismatches = [] if index.digest == self.manifest['from']['digest'] else [PACKAGE_INDEX_NAME]
+            self._check(mismatches, target, force)
+            self._apply_zip(target, output_path or target)
+        else:
+            raise RuntimeError(f"Deltas apply to extracted package directories and zip packages, not {target}")
+        self.logger(f"Applied delta {self.delta_path} to {output_path or target}: {len(self.added)} added, "
+                    f"{len(self.changed)} changed, {len(self.removed)} removed members", 'inf')
+
+    def _check(self, mismatches: List[str], target: str, force: bool) -> None:
+        if not mismatches:
+            return
+        message = (f"{target} is not the package the delta was created from "
+                   f"({len(mismatches)} mismatching members, first: {mismatches[0]})")
+        if not force:
+            raise RuntimeError(message)
+        self.logger(f"{message}, applying anyway", 'wrn')
+
+    def _find_mismatches(self, root: str) -> List[str]:
+        """Get the members to change or remove whose current content is not the expected one."""
+        mismatches = []
+        for path, member in sorted(self.old_members.items()):
+            file_path = os.path.join(root, *path.split('/'))
+            if member.kind == MEMBER_SYMLINK:
+                matches = (os.path.islink(file_path) and
+                           hashlib.sha256(os.readlink(file_path).encode('utf-8')).hexdigest() == member.digest)
+            elif member.kind == MEMBER_DIRECTORY:
+                matches = os.path.isdir(file_path) and not os.path.islink(file_path)
+            else:
+                matches = (os.path.isfile(file_path) and not os.path.islink(file_path)
+                           and hash_file(file_path) == member.digest)
+            if not matches:
+                mismatches.append(path)
+        return mismatches
+
+    def _apply_directory(self, root: str) -> None:
+        # Removed members deepest first, so directories are empty when reached
+        for member in sorted(self.removed, key=lambda m: m.path, reverse=True):
+            self._remove_path(os.path.join(root, *member.path.split('/')), member.kind == MEMBER_DIRECTORY)
+        with zipfile.ZipFile(self.delta_path) as delta:
+            for info in sorted(delta.infolist(), key=lambda i: i.filename):
+                path = info.filename.rstrip('/')
+                if path == DELTA_MANIFEST_NAME:
+                    continue
+                file_path = os.path.join(root, *path.split('/'))
+                old = self.old_members.get(path)
+                if old is not None and (old.kind == MEMBER_DIRECTORY) != info.is_dir():
+                    self._remove_path(file_path, old.kind == MEMBER_DIRECTORY, recursive=True)
+                extract_zip_member(delta, info, file_path)
+
+    def _remove_path(self, path: str, is_directory: bool, recursive: bool = False) -> None:
+        if not os.path.lexists(path):
+            return
+        if not is_directory or os.path.islink(path):
+            os.remove(path)
+        elif recursive:
+            shutil.rmtree(path)
+        elif os.listdir(path):
+            self.logger(f"Keeping removed directory {path}, it holds files not in the package", 'wrn')
+        else:
+            os.rmdir(path)
+
+    def _apply_zip(self, target: str, output_path: str) -> None:
+        """Write the patched package: unchanged members in their order, then the added members."""
+        removed = {m.path for m in self.removed}
+        partial_path = output_path + '.tmp'
+        with zipfile.ZipFile(self.delta_path) as delta, zipfile.ZipFile(target) as package, \
+                zipfile.ZipFile(partial_path, 'w') as output:
+            replacements = {info.filename.rstrip('/'): info for info in delta.infolist()
+                            if info.filename != DELTA_MANIFEST_NAME}
+            for info in package.infolist():
+                path = info.filename.rstrip('/')
+                if path in removed or path == PACKAGE_INDEX_NAME:
+                    continue
+                source, source_info = (delta, replacements.pop(path)) if path in replacements else (package, info)
+                copy_zip_member(source, source_info, output)
+            index_info = replacements.pop(PACKAGE_INDEX_NAME, None)
+            for path in sorted(replacements):
+                info = replacements[path]
+                copy_zip_member(delta, info, output)
+            if index_info is not None:
+                copy_zip_member(delta, index_info, output)
+        os.replace(partial_path, output_path)
@@ -0,0 +1,370 @@
+# Copyright 2025 NXP
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Package index utility.
+
+Every package carries an index member (.package-index.json) listing its
+other members with type, size, SHA-256 digest and source project, along with
+the revisions of the projects and the board filter of the package. The
+digests are computed while the members are compressed. Tools comparing or
+checking packages, such as delta generation and verification, read the small
+index instead of decompressing and hashing whole archives. Packages of
+earlier releases without an index are indexed from their content instead.
+"""
+
+import os
+import json
+import shutil
+import subprocess
+import stat
+import hashlib
+import tarfile
+import zipfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import IO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from .archive_writer import ZSTD_WINDOW_LOG, check_archive_backend, get_archive_format
+
+
+PACKAGE_INDEX_NAME = '.package-index.json'
+PACKAGE_INDEX_VERSION = 1
+# Member types of packages
+MEMBER_FILE = 'file'
+MEMBER_DIRECTORY = 'dir'
+MEMBER_SYMLINK = 'link'
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class PackageMember:
+    """Member of a package, identical members of two packages compare equal."""
+    path: str
+    kind: str
+    digest: str  # SHA-256 of the file content or link target, empty for directories
+    size: int
+
+    def to_dict(self) -> Dict:
+        return {'path': self.path, 'type': self.kind, 'size': self.size, 'sha256': self.digest}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'PackageMember':
+        return cls(data['path'], data['type'], data.get('sha256', ''), data.get('size', 0))
+
+
+def hash_file(file_path: str) -> str:
+    """Get the SHA-256 hex digest of a file."""
+    with open(file_path, 'rb') as f:
+        return _hash_stream(f)
+
+
+def scan_package_tree(root: str) -> Dict[str, PackageMember]:
+    """
+    Get the members of a staged or extracted package tree, as they are archived.
+
+    The package index member itself is not listed.
+
+    Returns:
+        Dictionary mapping archive paths to members, in sorted order
+    """
+    members = {}
+    for current, dirs, files in os.walk(root):
+        rel_dir = os.path.relpath(current, root).replace(os.sep, '/')
+        prefix = '' if rel_dir == '.' else rel_dir + '/'
+        for name in dirs + files:
+            src_path = os.path.join(current, name)
+            arc_path = prefix + name
+            if arc_path == PACKAGE_INDEX_NAME:
+                continue
+            if os.path.islink(src_path):
+                target = os.readlink(src_path).encode('utf-8')
+                members[arc_path] = PackageMember(arc_path, MEMBER_SYMLINK, hashlib.sha256(target).hexdigest(),
+                                                  len(target))
+            elif os.path.isdir(src_path):
+                members[arc_path] = PackageMember(arc_path, MEMBER_DIRECTORY, '', 0)
+            elif os.path.isfile(src_path):
+                members[arc_path] = PackageMember(arc_path, MEMBER_FILE, hash_file(src_path),
+                                                  os.path.getsize(src_path))
+    return {path: members[path] for path in sorted(members)}
+
+
+def get_members_digest(members: Iterable[PackageMember]) -> str:
+    """Get the content digest of a set of members from their paths, types and digests."""
+    sha = hashlib.sha256()
+    for member in sorted(members, key=lambda m: m.path):
+        sha.update(f"{member.kind} {member.digest} {member.path}\n".encode('utf-8'))
+    return sha.hexdigest()
+
+
+def extract_zip_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo, target: str) -> None:
+    """Extract a package zip member to a path, restoring symbolic links and permissions."""
+    mode = info.external_attr >> 16
+    if info.is_dir():
+        os.makedirs(target, exist_ok=True)
+        return
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    if os.path.lexists(target):
+        os.remove(target)
+    if stat.S_ISLNK(mode):
+        os.symlink(archive.read(info).decode('utf-8'), target)
+        return
+    with archive.open(info) as src, open(target, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    if mode & 0o777:
+        os.chmod(target, mode & 0o777)
+
+
+class PackageIndex:
+    """
+    Index of the members of a package.
+
+    Besides the members, the index records the projects the package was
+    created from, with their paths and revisions, and the board filter of the
+    package; each member is attributed to the project with the longest path
+    containing it.
+    """
+
+    def __init__(self, members: Dict[str, PackageMember], projects: Optional[Dict[str, Dict[str, str]]] = None,
+                 board_filter: Optional[List[str]] = None):
+        self.members = {path: members[path] for path in sorted(members)}
+        self.projects = projects or {}
+        self.board_filter = list(board_filter or [])
+
+    @property
+    def digest(self) -> str:
+        """Content digest of the package, equal for packages with identical members."""
+        return get_members_digest(self.members.values())
+
+    @classmethod
+    def from_tree(cls, root: str) -> 'PackageIndex':
+        """Index a staged or extracted package tree."""
+        return cls(scan_package_tree(root))
+
+    def get_member_projects(self) -> Dict[str, str]:
+        """Get the source project of each member attributed to one, keyed by member path."""
+        project_paths = {info['path'].strip('/'): name for name, info in self.projects.items()}
+        member_projects = {}
+        for path in self.members:
+            parent = path
+            while parent:
+                if parent in project_paths:
+                    member_projects[path] = project_paths[parent]
+                    break
+                parent = parent.rpartition('/')[0]
+        return member_projects
+
+    def to_dict(self) -> Dict:
+        member_projects = self.get_member_projects()
+        members = []
+        for path, member in self.members.items():
+            entry = member.to_dict()
+            if path in member_projects:
+                entry['project'] = member_projects[path]
+            members.append(entry)
+        return {
+            'format_version': PACKAGE_INDEX_VERSION,
+            'digest': self.digest,
+            'board_filter': self.board_filter,
+            'projects': self.projects,
+            'members': members,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'PackageIndex':
+        version = data.get('format_version')
+        if version != PACKAGE_INDEX_VERSION:
+            raise RuntimeError(f"Unsupported package index format version {version}")
+        return cls({entry['path']: PackageMember.from_dict(entry) for entry in data['members']},
+                   data.get('projects'), data.get('board_filter'))
+
+    def to_json(self) -> bytes:
+        return (json.dumps(self.to_dict(), indent=1) + '\n').encode('utf-8')
+
+    def write(self, output_path: str) -> None:
+        """Write the index as a JSON file."""
+        with open(output_path, 'wb') as f:
+            f.write(self.to_json())
+
+    @classmethod
+    def load(cls, path: str, logger: Callable[[str, str], None] = None) -> 'PackageIndex':
+        """
+        Load the index of a package.
+
+        Args:
+            path: Package archive (zip or tarball) with an index member, extracted
+                package directory, or index JSON file
+
+        Returns:
+            Index of the package, read from its index member without hashing the
+            other members (tarballs are decompressed up to the index member, zip
+            archives read it directly); packages without an index member are
+            indexed from their content
+        """
+        if os.path.isfile(path) and path.lower().endswith('.json'):
+            with open(path, 'r', encoding='utf-8') as f:
+                return cls.from_dict(json.load(f))
+        if os.path.isdir(path) and os.path.isfile(os.path.join(path, PACKAGE_INDEX_NAME)):
+            return cls.load(os.path.join(path, PACKAGE_INDEX_NAME))
+        if os.path.isfile(path) and get_archive_format(path) == 'zip':
+            with zipfile.ZipFile(path) as package:
+                if PACKAGE_INDEX_NAME in package.NameToInfo:
+                    return cls.from_dict(json.loads(package.read(PACKAGE_INDEX_NAME)))
+        elif os.path.isfile(path):
+            embedded = cls._load_tar_index(path)
+            if embedded is not None:
+                return embedded
+
+        embedded, members = cls.scan(path)
+        if embedded is not None:
+            return embedded
+        if logger:
+            logger(f"No package index in {path}, indexed the package content", 'wrn')
+        return cls(members)
+
+    @classmethod
+    def _load_tar_index(cls, path: str) -> Optional['PackageIndex']:
+        """Read the index member of a tarball, skipping the other members unread."""
+        with open_package_tar(path) as package:
+            for info in package:
+                if info.name.rstrip('/') == PACKAGE_INDEX_NAME:
+                    return cls.from_dict(json.load(package.extractfile(info)))
+        return None
+
+    @classmethod
+    def scan(cls, path: str) -> Tuple[Optional['PackageIndex'], Dict[str, PackageMember]]:
+        """
+        Read a whole package: its embedded index and its members indexed from their content.
+
+        Args:
+            path: Package archive (zip or tarball) or extracted package directory
+
+        Returns:
+            Embedded index, None if the package has none, and the members found
+        """
+        if os.path.isdir(path):
+            index_path = os.path.join(path, PACKAGE_INDEX_NAME)
+            embedded = cls.load(index_path) if os.path.isfile(index_path) else None
+            return embedded, scan_package_tree(path)
+        if get_archive_format(path) == 'zip':
+            return cls._scan_zip(path)
+        return cls._scan_tar(path)
+
+    @classmethod
+    def _scan_zip(cls, path: str) -> Tuple[Optional['PackageIndex'], Dict[str, PackageMember]]:
+        embedded = None
+        members = {}
+        with zipfile.ZipFile(path) as package:
+            for info in package.infolist():
+                arc_path = info.filename.rstrip('/')
+                if arc_path == PACKAGE_INDEX_NAME:
+                    embedded = cls.from_dict(json.loads(package.read(info)))
+                    continue
+                if info.is_dir():
+                    members[arc_path] = PackageMember(arc_path, MEMBER_DIRECTORY, '', 0)
+                    continue
+                with package.open(info) as f:
+                    digest = _hash_stream(f)
+                kind = MEMBER_SYMLINK if stat.S_ISLNK(info.external_attr >> 16) else MEMBER_FILE
+                members[arc_path] = PackageMember(arc_path, kind, digest, info.file_size)
+        return embedded, members
+
+    @classmethod
+    def _scan_tar(cls, path: str) -> Tuple[Optional['PackageIndex'], Dict[str, PackageMember]]:
+        embedded = None
+        members = {}
+        with open_package_tar(path) as package:
+            for info in package:
+                arc_path = info.name.rstrip('/')
+                if arc_path == PACKAGE_INDEX_NAME:
+                    embedded = cls.from_dict(json.load(package.extractfile(info)))
+                elif info.isdir():
+                    members[arc_path] = PackageMember(arc_path, MEMBER_DIRECTORY, '', 0)
+                elif info.issym():
+                    target = info.linkname.encode('utf-8')
+                    members[arc_path] = PackageMember(arc_path, MEMBER_SYMLINK, hashlib.sha256(target).hexdigest(),
+                                                      len(target))
+                elif info.isfile():
+                    members[arc_path] = PackageMember(arc_path, MEMBER_FILE, _hash_stream(package.extractfile(info)),
+                                                      info.size)
+        return embedded, members
+
+
+def verify_package(path: str) -> List[str]:
+    """
+    Verify the members of a package against its embedded index.
+
+    Args:
+        path: Package archive (zip or tarball) or extracted package directory
+
+    Returns:
+        Problems found, one per member: missing, not indexed, or differing in
+        type, size or digest; empty if the package matches its index
+
+    Raises:
+        RuntimeError: If the package has no index
+    """
+    embedded, members = PackageIndex.scan(path)
+    if embedded is None:
+        raise RuntimeError(f"{path} has no package index ({PACKAGE_INDEX_NAME})")
+    problems = []
+    for member_path in sorted(set(embedded.members) | set(members)):
+        expected = embedded.members.get(member_path)
+        actual = members.get(member_path)
+        if actual is None:
+            problems.append(f"missing: {member_path}")
+        elif expected is None:
+            problems.append(f"not indexed: {member_path}")
+        elif actual.kind != expected.kind:
+            problems.append(f"type differs: {member_path} ({actual.kind}, indexed as {expected.kind})")
+        elif actual != expected:
+            problems.append(f"content differs: {member_path}")
+    return problems
+
+
+def _hash_stream(stream) -> str:
+    sha = hashlib.sha256()
+    for chunk in iter(lambda: stream.read(HASH_CHUNK_SIZE), b''):
+        sha.update(chunk)
+    return sha.hexdigest()
+
+
+@contextmanager
+def open_package_tar(path: str) -> Iterator[tarfile.TarFile]:
+    """
+    Open a package tarball for sequential reading.
+
+    tar.zst packages are decompressed by the zstd command line tool when
+    available and by the zstandard Python module otherwise, like they are
+    written.
+    """
+    if get_archive_format(path) == 'tar.xz':
+        with tarfile.open(path, 'r|xz') as package:
+            yield package
+        return
+    check_archive_backend(path)
+    tool = shutil.which('zstd')
+    if tool:
+        with _open_zstd_tool_stream(tool, path) as stream, tarfile.open(fileobj=stream, mode='r|') as package:
+            yield package
+        return
+    import zstandard
+    with open(path, 'rb') as f, zstandard.ZstdDecompressor(max_window_size=2 ** 31).stream_reader(f) as stream:
+        with tarfile.open(fileobj=stream, mode='r|') as package:
+            yield package
+
+
+@contextmanager
+def _open_zstd_tool_stream(tool: str, path: str) -> Iterator[IO[bytes]]:
+    """Decompress a zstd file through the zstd command line tool."""
+    process = subprocess.Popen([tool, '-q', '-d', '-c', f'--long={ZSTD_WINDOW_LOG}', path],
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        yield process.stdout
+    finally:
+        # Readers may stop before the end of the stream, the tool then ends on the closed pipe
+        process.stdout.close()
+        stderr = process.stderr.read().decode('utf-8', errors='replace').strip()
+        process.stderr.close()
+        # A failed decompression is the cause of any tar read error, report it instead
+        if process.wait() > 0:
+            raise RuntimeError(f"zstd failed to decompress {path}: {stderr or f'exit code {process.returncode}'}")
@@ -0,0 +1,257 @@
+# Copyright 2025 NXP
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Package build journal utility.
+
+This module keeps the state of a resumable package build in a partial
+directory next to the output file: the staging directory, a journal of the
+completed phases and, for zip output, the members written to the archive up
+to its last checkpoint. A rerun with the same inputs continues from there
+instead of copying and compressing everything again.
+
+A zip checkpoint is the offset where the member data ends plus a copy of the
+central directory written behind it. Members added later overwrite that
+central directory, so a resumed build cuts the archive at the offset and
+puts the saved copy back.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import threading
+from typing import Callable, Dict, List, Optional, Set
+from .archive_writer import ArchiveWriter
+
+
+PARTIAL_DIR_SUFFIX = '.partial'
+JOURNAL_FILE_NAME = 'journal.json'
+MEMBERS_FILE_NAME = 'members.txt'
+STAGING_DIR_NAME = 'staging'
+JOURNAL_VERSION = 1
+# The archive is checkpointed after this many members or bytes, whichever comes first
+CHECKPOINT_MEMBERS = 10000
+CHECKPOINT_BYTES = 256 * 1024 * 1024
+
+
+class PackageJournal:
+    """Journal of the completed phases and archive checkpoints of one package build."""
+
+    def __init__(self, output_path: str, key: str, logger: Callable[[str, str], None] = None):
+        self.partial_dir = os.path.abspath(output_path) + PARTIAL_DIR_SUFFIX
+        self.staging_dir = os.path.join(self.partial_dir, STAGING_DIR_NAME)
+        self.archive_path = os.path.join(self.partial_dir, os.path.basename(output_path))
+        self.key = key
+        self.logger = logger or self._default_logger
+        self.completed_phases: List[str] = []
+        self.archive_members = 0  # Members in the archive at its last checkpoint
+        self.archive_offset = 0  # End of the member data at the last checkpoint
+        self.archive_tail = None  # File holding the archive bytes behind archive_offset at the last checkpoint
+        self.resumed = False
+        self._lock = threading.Lock()
+
+    def _default_logger(self, message: str, level: str = 'inf'):
+        """Default logger that does nothing."""
+        pass
+
+    @staticmethod
+    def compute_key(inputs: Dict) -> str:
+        """Compute the key identifying the inputs of a package build."""
+        data = json.dumps(inputs, sort_keys=True, default=str)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    def _journal_path(self) -> str:
+        return os.path.join(self.partial_dir, JOURNAL_FILE_NAME)
+
+    def _members_path(self) -> str:
+        return os.path.join(self.partial_dir, MEMBERS_FILE_NAME)
+
+    def load(self) -> bool:
+        """
+        Load the journal of an interrupted build with the same inputs.
+
+        State left by a build with other inputs is discarded.
+
+        Returns:
+            True if the build resumes from an earlier state
+        """
+        data = None
+        try:
+            with open(self._journal_path(), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            self.logger(f"Cannot read package journal, starting over: {e}", 'wrn')
+
+        if data and data.get('version') == JOURNAL_VERSION and data.get('key') == self.key:
+            self.completed_phases = list(data.get('completed_phases', []))
+            self.archive_members = data.get('archive_members', 0)
+            self.archive_offset = data.get('archive_offset', 0)
+            self.archive_tail = data.get('archive_tail')
+            self.resumed = bool(self.completed_phases or self.archive_members)
+        elif os.path.exists(self.partial_dir):
+            self.logger(f"Discarding package state of a build with other inputs: {self.partial_dir}", 'inf')
+            shutil.rmtree(self.partial_dir)
+
+        os.makedirs(self.staging_dir, exist_ok=True)
+        if self.resumed:
+            self.logger(f"Resuming package build, completed phases: {', '.join(self.completed_phases) or 'none'}", 'inf')
+        self.save()
+        return self.resumed
+
+    def save(self) -> None:
+        """Write the journal atomically."""
+        with self._lock:
+            data = {
+                'version': JOURNAL_VERSION,
+                'key': self.key,
+                'completed_phases': self.completed_phases,
+                'archive_members': self.archive_members,
+                'archive_offset': self.archive_offset,
+                'archive_tail': self.archive_tail,
+            }
+            tmp_path = self._journal_path() + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self._journal_path())
+
+    def is_done(self, phase: str) -> bool:
+        """Check whether a phase completed in this or an earlier run."""
+        return phase in self.completed_phases
+
+    def mark_done(self, phase: str) -> None:
+        """Record a completed phase."""
+        with self._lock:
+            if phase not in self.completed_phases:
+                self.completed_phases.append(phase)
+        self.save()
+
+    def prepare_archive(self, checkpoints: bool) -> Set[str]:
+        """
+        Prepare the partial archive for writing.
+
+        An archive checkpointed by an earlier run is restored to its last
+        checkpoint, anything written after it is lost with the interruption.
+
+        Args:
+            checkpoints: Whether the archive format supports checkpoints
+
+        Returns:
+            Archive paths of the members already in the archive
+        """
+        members = []
+        tail_path = os.path.join(self.partial_dir, self.archive_tail) if self.archive_tail else None
+        if (checkpoints and self.archive_members and tail_path and os.path.exists(tail_path)
+                and os.path.exists(self.archive_path) and os.path.exists(self._members_path())
+                and os.path.getsize(self.archive_path) >= self.archive_offset):
+            with open(self._members_path(), 'r', encoding='utf-8') as f:
+                members = [line.rstrip('\n') for _, line in zip(range(self.archive_members), f)]
+
+        if members and len(members) == self.archive_members:
+            with open(self.archive_path, 'r+b') as f, open(tail_path, 'rb') as tail:
+                f.truncate(self.archive_offset)
+                f.seek(self.archive_offset)
+                shutil.copyfileobj(tail, f)
+            with open(self._members_path(), 'w', encoding='utf-8') as f:
+                f.writelines(f"{member}\n" for member in members)
+            self.logger(f"Resuming archive after {len(members)} members", 'inf')
+            return set(members)
+
+        if self.archive_members:
+            self.logger("Archive cannot be resumed, recreating it", 'inf')
+        for path in (self.archive_path, self._members_path(), tail_path):
+            if path and os.path.exists(path):
+                os.remove(path)
+        self.archive_members = 0
+        self.archive_offset = 0
+        self.archive_tail = None
+        self.save()
+        return set()
+
+    def record_checkpoint(self, new_members: List[str], offset: int) -> None:
+        """
+        Record an archive checkpoint.
+
+        Args:
+            new_members: Members written since the previous checkpoint
+            offset: End of the member data, the archive is valid when cut there
+                and followed by the bytes currently behind it
+        """
+        with open(self._members_path(), 'a', encoding='utf-8') as f:
+            f.writelines(f"{member}\n" for member in new_members)
+        previous_tail = self.archive_tail
+        self.archive_members += len(new_members)
+        self.archive_offset = offset
+        # Named per checkpoint, the journal refers to the previous tail until it is saved
+        self.archive_tail = f"archive-tail-{self.archive_members}.bin"
+        with open(self.archive_path, 'rb') as f, \
+                open(os.path.join(self.partial_dir, self.archive_tail), 'wb') as tail:
+            f.seek(offset)
+            shutil.copyfileobj(f, tail)
+        self.save()
+        if previous_tail and previous_tail != self.archive_tail:
+            os.remove(os.path.join(self.partial_dir, previous_tail))
+
+    def discard(self) -> None:
+        """Remove the partial directory after a successful build."""
+        shutil.rmtree(self.partial_dir, ignore_errors=True)
+
+
+class CheckpointedArchiveWriter:
+    """
+    Archive writer wrapper for resumable builds.
+
+    Members already archived before the last checkpoint are skipped, and the
+    archive is checkpointed periodically when the writer supports it.
+    """
+
+    def __init__(self, writer: ArchiveWriter, journal: PackageJournal, archived: Set[str]):
+        self.writer = writer
+        self.journal = journal
+        self.archived = archived
+        self.enabled = writer.supports_checkpoints
+        self._pending: List[str] = []
+        self._pending_bytes = 0
+
+    @property
+    def archive_format(self) -> str:
+        return self.writer.archive_format
+
+    def __enter__(self) -> 'CheckpointedArchiveWriter':
+        self.writer.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.writer.close(success=exc_type is None)
+
+    def _add(self, arc_path: str, size: int, add: Callable, *args):
+        if arc_path in self.archived:
+            return None
+        result = add(*args)
+        if self.enabled:
+            self._pending.append(arc_path)
+            self._pending_bytes += size
+            if len(self._pending) >= CHECKPOINT_MEMBERS or self._pending_bytes >= CHECKPOINT_BYTES:
+                self.checkpoint()
+        return result
+
+    def checkpoint(self) -> None:
+        """Make the archive consistent on disk and record its members in the journal."""
+        if not self.enabled or not self._pending:
+            return
+        offset = self.writer.checkpoint()
+        self.journal.record_checkpoint(self._pending, offset)
+        self._pending = []
+        self._pending_bytes = 0
+
+    def add_directory(self, src_path: str, arc_path: str) -> None:
+        self._add(arc_path, 0, self.writer.add_directory, src_path, arc_path)
+
+    def add_file(self, src_path: str, arc_path: str, size: int) -> Optional[str]:
+        """Add a regular file, returns its digest or None if it was archived before the checkpoint."""
+        return self._add(arc_path, size, self.writer.add_file, src_path, arc_path, size)
+
+    def add_symlink(self, symlink_path: str, arc_path: str) -> None:
+        self._add(arc_path, 0, self.writer.add_symlink, symlink_path, arc_path)
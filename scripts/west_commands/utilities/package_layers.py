@@ -0,0 +1,275 @@
+# Copyright 2025 NXP
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Layered package utility.
+
+The packages of the boards of one family share most of their content (core
+drivers, CMSIS, middleware). A layered package stores that content once: a
+base archive holds the members identical in all board packages of the set,
+and a small overlay archive per board holds the members of that board's
+package not in the base. A layers.json manifest describes how to compose
+them, and the assembler reconstructs the full package of a board from its
+two layers, checking its content against the package digest of the manifest.
+
+The base archive is content-addressed: its name is derived from the paths,
+types and SHA-256 digests of its members, so identical base content of two
+builds gets the same name and a mirror stores it once.
+"""
+
+import os
+import copy
+import json
+import stat
+import shutil
+import hashlib
+import zipfile
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+from .compression_policy import CompressionPolicy
+from .archive_writer import ZIP_COPY_CHUNK_SIZE, HashingReader, create_archive_writer
+from .package_index import (MEMBER_DIRECTORY, MEMBER_FILE, MEMBER_SYMLINK, PACKAGE_INDEX_NAME, PackageIndex,
+                            PackageMember, extract_zip_member, get_members_digest, hash_file,
+                            scan_package_tree)
+
+
+LAYERS_MANIFEST_NAME = 'layers.json'
+LAYERS_FORMAT_VERSION = 1
+BASE_LAYER_PREFIX = 'base-'
+OVERLAY_LAYER_SUFFIX = '.overlay.zip'
+# Hex digits of the base content digest used in the base archive name
+BASE_NAME_DIGEST_LENGTH = 16
+
+
+@dataclass
+class LayeredBoard:
+    """Package inputs of one board of a layered package."""
+    name: str
+    projects: List
+    repo_list: List[str]
+    example_list: List[str]
+    board_filter: List[str]
+
+
+class LayeredPackageWriter:
+    """Independent utility splitting staged board package trees into base and overlay archives."""
+
+    def __init__(self, output_dir: str, policy: Optional[CompressionPolicy] = None,
+                 logger: Callable[[str, str], None] = None, timestamp: Optional[int] = None):
+        self.output_dir = output_dir
+        self.policy = policy or CompressionPolicy()
+        self.logger = logger or self._default_logger
+        self.timestamp = timestamp
+
+    def _default_logger(self, message: str, level: str = 'inf'):
+        """Default logger that does nothing."""
+        pass
+
+    def write(self, staged: Dict[str, str], sources: Optional[Dict[str, PackageIndex]] = None) -> Dict:
+        """
+        Write the layer archives and the layers manifest of staged board packages.
+
+        Args:
+            staged: Staging directories of the board package trees, keyed by board name
+            sources: Empty indexes with the projects and board filter of each board package,
+                completed with the members for the package index of the board
+
+        Returns:
+            Layers manifest as written to layers.json
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        trees = {board: scan_package_tree(stage_dir) for board, stage_dir in staged.items()}
+        # The package digest is the digest of the package index, which does not list itself
+        package_digests = {board: get_members_digest(members.values()) for board, members in trees.items()}
+        for board, stage_dir in staged.items():
+            source = (sources or {}).get(board) or PackageIndex({})
+            index = PackageIndex(trees[board], source.projects, source.board_filter)
+            trees[board][PACKAGE_INDEX_NAME] = self._write_package_index(stage_dir, index)
+
+        # The base holds the members identical in every board package
+        boards = sorted(trees)
+        base_members = [member for path, member in trees[boards[0]].items()
+                        if all(trees[board].get(path) == member for board in boards[1:])]
+        base_paths = {member.path for member in base_members}
+        base_digest = get_members_digest(base_members)
+        base_name = f"{BASE_LAYER_PREFIX}{base_digest[:BASE_NAME_DIGEST_LENGTH]}.zip"
+        base_path = os.path.join(self.output_dir, base_name)
+        if os.path.exists(base_path):
+            self.logger(f"Base layer {base_name} already present, reusing it", 'inf')
+        else:
+            self._write_layer(base_path, staged[boards[0]], base_members)
+        base_bytes = sum(member.size for member in base_members)
+        self.logger(f"Base layer {base_name}: {len(base_members)} members, "
+                    f"{base_bytes / (1024 * 1024):.1f} MB uncompressed", 'inf')
+
+        manifest = {
+            'format_version': LAYERS_FORMAT_VERSION,
+            'base': {
+                'archive': base_name,
+                'digest': base_digest,
+                'members': len(base_members),
+                'bytes': base_bytes,
+            },
+            'boards': {},
+        }
+        for board in boards:
+            overlay_members = [member for path, member in trees[board].items() if path not in base_paths]
+            overlay_name = f"{board}{OVERLAY_LAYER_SUFFIX}"
+            self._write_layer(os.path.join(self.output_dir, overlay_name), staged[board], overlay_members)
+            overlay_bytes = sum(member.size for member in overlay_members)
+            manifest['boards'][board] = {
+                'overlay': overlay_name,
+                'digest': get_members_digest(overlay_members),
+                'members': len(overlay_members),
+                'bytes': overlay_bytes,
+                'package_digest': package_digests[board],
+                'package_members': len(trees[board]),
+            }
+            self.logger(f"Overlay layer {overlay_name}: {len(overlay_members)} members, "
+                        f"{overlay_bytes / (1024 * 1024):.1f} MB uncompressed", 'inf')
+
+        manifest_path = os.path.join(self.output_dir, LAYERS_MANIFEST_NAME)
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+            f.write('\n')
+        self.logger(f"Layers manifest written to {manifest_path}", 'inf')
+        return manifest
+
+    def _write_package_index(self, stage_dir: str, index: PackageIndex) -> PackageMember:
+        """Write the index of a board package into its staged tree, the assembled package carries it."""
+        index_path = os.path.join(stage_dir, PACKAGE_INDEX_NAME)
+        index.write(index_path)
+        return PackageMember(PACKAGE_INDEX_NAME, MEMBER_FILE, hash_file(index_path), os.path.getsize(index_path))
+
+    def _write_layer(self, archive_path: str, stage_dir: str, members: List[PackageMember]) -> None:
+        """Write the members of a layer from a staged tree, in sorted order."""
+        partial_path = archive_path + '.tmp'
+        with create_archive_writer(partial_path, self.policy, self.logger, self.timestamp) as writer:
+            for member in members:
+                src_path = os.path.join(stage_dir, *member.path.split('/'))
+                if member.kind == MEMBER_SYMLINK:
+                    writer.add_symlink(src_path, member.path)
+                elif member.kind == MEMBER_DIRECTORY:
+                    writer.add_directory(src_path, member.path)
+                else:
+                    writer.add_file(src_path, member.path, member.size)
+        os.replace(partial_path, archive_path)
+
+
+class LayeredPackageAssembler:
+    """Independent utility reconstructing the full package of a board from its layers."""
+
+    def __init__(self, manifest_path: str, logger: Callable[[str, str], None] = None):
+        self.manifest_path = manifest_path
+        self.layers_dir = os.path.dirname(os.path.abspath(manifest_path))
+        self.logger = logger or self._default_logger
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        version = self.manifest.get('format_version')
+        if version != LAYERS_FORMAT_VERSION:
+            raise RuntimeError(f"Unsupported layers manifest format version {version} in {manifest_path}")
+
+    def _default_logger(self, message: str, level: str = 'inf'):
+        """Default logger that does nothing."""
+        pass
+
+    def get_boards(self) -> List[str]:
+        """Get the boards of the layered package."""
+        return sorted(self.manifest['boards'])
+
+    def get_layer_paths(self, board: str) -> List[str]:
+        """Get the base and overlay archive paths of a board."""
+        if board not in self.manifest['boards']:
+            raise RuntimeError(f"Board {board} is not part of the layered package, "
+                               f"available boards: {', '.join(self.get_boards())}")
+        paths = [os.path.join(self.layers_dir, self.manifest['base']['archive']),
+                 os.path.join(self.layers_dir, self.manifest['boards'][board]['overlay'])]
+        for path in paths:
+            if not os.path.isfile(path):
+                raise RuntimeError(f"Layer archive {path} not found")
+        return paths
+
+    def assemble(self, board: str, output_path: str) -> int:
+        """
+        Reconstruct the full package of a board.
+
+        Args:
+            board: Board of the layered package
+            output_path: Zip archive to write, or directory to extract into
+                when the path does not end with .zip
+
+        Returns:
+            Number of members of the package
+
+        Raises:
+            RuntimeError: If the layers do not hold the package the manifest describes
+        """
+        layer_paths = self.get_layer_paths(board)
+        expected = self.manifest['boards'][board]['package_members']
+        expected_digest = self.manifest['boards'][board]['package_digest']
+        with zipfile.ZipFile(layer_paths[0]) as base, zipfile.ZipFile(layer_paths[1]) as overlay:
+            members = {}
+            for layer in (base, overlay):
+                for info in layer.infolist():
+                    members[info.filename.rstrip('/')] = (layer, info)
+            if len(members) != expected:
+                raise RuntimeError(f"Layers of board {board} hold {len(members)} members, "
+                                   f"the manifest lists {expected}; the base archive does not match")
+
+            if output_path.lower().endswith('.zip'):
+                assembled = self._write_zip(members, output_path, expected_digest)
+            else:
+                assembled = self._extract(members, output_path)
+        # The package digest does not cover the package index, which lists it
+        digest = get_members_digest(member for member in assembled if member.path != PACKAGE_INDEX_NAME)
+        if digest != expected_digest:
+            raise RuntimeError(f"Assembled package of board {board} does not match the package digest of the "
+                               f"manifest; the layers are corrupt or do not belong together")
+        self.logger(f"Assembled package of board {board}: {len(members)} members in {output_path}", 'inf')
+        return len(members)
+
+    def _write_zip(self, members: Dict, output_path: str, expected_digest: str) -> List[PackageMember]:
+        """Write the members to a zip archive, which replaces the output only if it matches the package digest."""
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        partial_path = output_path + '.tmp'
+        assembled = []
+        try:
+            with zipfile.ZipFile(partial_path, 'w') as output:
+                for path in sorted(members):
+                    layer, info = members[path]
+                    # The member header is kept, including compression method and permissions
+                    if info.is_dir():
+                        output.writestr(info, b'', compress_type=info.compress_type)
+                        assembled.append(PackageMember(path, MEMBER_DIRECTORY, '', 0))
+                        continue
+                    # Writing resets the sizes and CRC of the header, the layer still reads through them
+                    with layer.open(info) as src, output.open(copy.copy(info), 'w') as dst:
+                        reader = HashingReader(src)
+                        shutil.copyfileobj(reader, dst, ZIP_COPY_CHUNK_SIZE)
+                    kind = MEMBER_SYMLINK if stat.S_ISLNK(info.external_attr >> 16) else MEMBER_FILE
+                    assembled.append(PackageMember(path, kind, reader.hexdigest(), info.file_size))
+            if get_members_digest(m for m in assembled if m.path != PACKAGE_INDEX_NAME) == expected_digest:
+                os.replace(partial_path, output_path)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+        return assembled
+
+    def _extract(self, members: Dict, output_dir: str) -> List[PackageMember]:
+        """Extract the members to a directory, getting them as extracted."""
+        assembled = []
+        for path in sorted(members):
+            layer, info = members[path]
+            target = os.path.join(output_dir, *path.split('/'))
+            extract_zip_member(layer, info, target)
+            if os.path.islink(target):
+                link_target = os.readlink(target).encode('utf-8')
+                assembled.append(PackageMember(path, MEMBER_SYMLINK, hashlib.sha256(link_target).hexdigest(),
+                                               len(link_target)))
+            elif os.path.isdir(target):
+                assembled.append(PackageMember(path, MEMBER_DIRECTORY, '', 0))
+            else:
+                assembled.append(PackageMember(path, MEMBER_FILE, hash_file(target), os.path.getsize(target)))
+        return assembled
@@ -0,0 +1,367 @@
+# Copyright 2025 NXP
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Package planning utility.
+
+This module computes what a package would contain without copying or
+compressing anything. It applies the same repository selection, board
+exclusion, example selection and path filtering rules as PackageCreator, but
+over directory and git tree metadata only, and estimates the compressed size
+and the time needed to create the package.
+"""
+
+import os
+import json
+import subprocess
+import yaml
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from .package_creator import (DOC_PACKAGE_PATH, EXAMPLE_SHARED_DIRS, EXAMPLE_YML_NAME, EXAMPLE_YML_PRUNED_DIRS,
+                              PackageCreator, PackageOptions)
+from .board_matcher import BoardKeyMatcher
+from .archive_writer import DEFAULT_ARCHIVE_FORMAT, get_archive_format
+from .compression_policy import COMPRESSED_EXTENSIONS, DEFAULT_COMPRESSION_PRESET, MIN_DEFLATE_SIZE, PRESET_SETTINGS
+from .package_index import MEMBER_DIRECTORY, MEMBER_FILE, PACKAGE_INDEX_NAME, PackageIndex, PackageMember
+from .workspace_context import WorkspaceContext
+from .workspace_cache import CACHE_DIR_NAME
+
+
+# Typical deflate ratios (compressed / original size) by file extension
+COMPRESSION_RATIO_BY_EXTENSION = {
+    '.c': 0.22, '.h': 0.18, '.s': 0.25, '.cpp': 0.22, '.hpp': 0.2, '.py': 0.3,
+    '.cmake': 0.25, '.txt': 0.3, '.md': 0.35, '.rst': 0.35, '.yml': 0.15, '.yaml': 0.15,
+    '.json': 0.15, '.xml': 0.12, '.html': 0.25, '.ld': 0.2, '.icf': 0.2, '.scf': 0.2,
+    '.a': 0.35, '.lib': 0.35, '.o': 0.4, '.bin': 0.7, '.elf': 0.45, '.hex': 0.45,
+    '.png': 1.0, '.jpg': 1.0, '.jpeg': 1.0, '.gif': 1.0, '.pdf': 0.9, '.zip': 1.0,
+    '.gz': 1.0, '.xz': 1.0, '.zst': 1.0, '.7z': 1.0, '.exe': 0.5, '.dll': 0.5,
+}
+DEFAULT_COMPRESSION_RATIO = 0.4
+# Deflate ratios of the compression presets relative to the typical ratios above
+PRESET_RATIO_FACTORS = {'fast': 1.15, 'balanced': 1.0, 'smallest': 0.97}
+# Ratios of the solid tarball formats relative to the deflate ratios, per compression preset
+SOLID_RATIO_FACTORS = {
+    'tar.zst': {'fast': 0.9, 'balanced': 0.75, 'smallest': 0.7},
+    'tar.xz': {'fast': 0.8, 'balanced': 0.7, 'smallest': 0.68},
+}
+# Fixed size of the local header and central directory record of a zip member
+ZIP_MEMBER_OVERHEAD = 76
+# Compressed size of the tar header of a member
+TAR_MEMBER_OVERHEAD = 24
+# Digest of the planned members in the estimated package index
+PLAN_INDEX_DIGEST = '0' * 64
+# Rough throughput used for the time estimate
+PLAN_COPY_BYTES_PER_SECOND = 80 * 1024 * 1024
+PLAN_ARCHIVE_BYTES_PER_SECOND = 25 * 1024 * 1024
+PLAN_EXAMPLE_YML_PER_SECOND = 300
+PLAN_DOC_SECONDS_PER_BOARD = 180
+PLAN_DOC_BYTES_PER_BOARD = 8 * 1024 * 1024
+
+
+@dataclass
+class PlannedProject:
+    """Planned package content of one project."""
+    name: str
+    path: str
+    files: int = 0
+    bytes: int = 0
+    estimated_compressed_bytes: int = 0
+
+
+@dataclass
+class PackagePlan:
+    """Planned package content and estimates."""
+    output_path: str
+    members: List[Tuple[str, int]] = field(default_factory=list)  # (archive path, size in bytes)
+    projects: Dict[str, PlannedProject] = field(default_factory=dict)
+    excluded_boards: List[str] = field(default_factory=list)
+    doc_boards: List[str] = field(default_factory=list)
+    example_yml_files: int = 0
+    estimated_compressed_bytes: int = 0
+    estimated_seconds: float = 0.0
+
+    @property
+    def total_files(self) -> int:
+        return len(self.members)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(size for _, size in self.members)
+
+    def to_dict(self) -> Dict:
+        """Get the plan as a JSON serializable dictionary."""
+        return {
+            'output': self.output_path,
+            'total_files': self.total_files,
+            'total_bytes': self.total_bytes,
+            'estimated_compressed_bytes': self.estimated_compressed_bytes,
+            'estimated_seconds': round(self.estimated_seconds, 1),
+            'excluded_boards': self.excluded_boards,
+            'doc_boards': self.doc_boards,
+            'projects': [vars(p) for p in self.projects.values()],
+            'members': [{'path': path, 'size': size} for path, size in self.members],
+        }
+
+
+class PackagePlanner:
+    """Independent utility for planning filtered SDK packages from metadata only."""
+
+    def __init__(self, workspace_root: str, logger: Callable[[str, str], None] = None,
+                 context: Optional[WorkspaceContext] = None):
+        self.workspace_root = workspace_root
+        self.logger = logger or self._default_logger
+        # Filtering rules are shared with the package creator
+        self.creator = PackageCreator(workspace_root, self.logger, context)
+
+    def _default_logger(self, message: str, level: str = 'inf'):
+        """Default logger that does nothing."""
+        pass
+
+    def plan_package(self, output_path: str, projects: List, repo_list: List[str],
+                     example_list: List[str], options: PackageOptions) -> PackagePlan:
+        """
+        Plan a filtered package with the specified options.
+
+        Args:
+            output_path: Package path the plan is made for
+            projects: Projects to package
+            repo_list: Repositories kept in the package
+            example_list: Examples kept in the package
+            options: Package options
+
+        Returns:
+            PackagePlan with the planned members and estimates
+        """
+        self.logger(f"Planning package: {output_path}", 'inf')
+        creator = self.creator
+        creator._board_matcher = BoardKeyMatcher(options.board_filter, options.legacy_board_match)
+        excluded_boards = creator._get_excluded_boards(options.board_filter)
+        target_paths, parent_paths = creator._get_example_target_paths(example_list)
+        removed_prefixes = self._get_removed_project_prefixes(repo_list, options)
+
+        plan = PackagePlan(output_path, excluded_boards=sorted(excluded_boards))
+        archive_format = get_archive_format(output_path)
+
+        def keep(rel_path: str) -> bool:
+            if any(rel_path.startswith(prefix) for prefix in removed_prefixes):
+                return False
+            if rel_path.startswith('mcuxsdk/examples/'):
+                return self._is_example_kept(rel_path[len('mcuxsdk/examples/'):], target_paths, parent_paths)
+            return True
+
+        sources = [('workspace', meta_dir, None) for meta_dir in ('.west', 'manifests')]
+        sources += [(project.name, project.path, project) for project in projects]
+        source_files = [[(rel_path, size) for rel_path, size
+                         in self._list_source_files(path, project, excluded_boards, options.include_git)
+                         if keep(rel_path)]
+                        for _, path, project in sources]
+        if options.board_filter and not options.keep_unsupported_examples:
+            unsupported_prefixes = self._get_unsupported_example_prefixes(
+                [rel_path for files in source_files for rel_path, _ in files], options.board_filter)
+            source_files = [[(rel_path, size) for rel_path, size in files
+                             if not rel_path.startswith(unsupported_prefixes)]
+                            for files in source_files]
+
+        for (name, path, _), files in zip(sources, source_files):
+            planned = PlannedProject(name, path)
+            for rel_path, size in files:
+                plan.members.append((rel_path, size))
+                planned.files += 1
+                planned.bytes += size
+                planned.estimated_compressed_bytes += self.estimate_compressed_size(
+                    rel_path, size, options.compression, archive_format)
+                if os.path.basename(rel_path) == EXAMPLE_YML_NAME:
+                    plan.example_yml_files += 1
+            plan.projects[name] = planned
+
+        if options.generate_docs:
+            plan.doc_boards = list(options.board_filter)
+            for board_name in plan.doc_boards:
+                plan.members.append((f"mcuxsdk/docs/mcuxsdk-{board_name}.pdf", PLAN_DOC_BYTES_PER_BOARD))
+
+        # The package index is the last member, listing all others
+        index_size = self._estimate_index_size(plan, projects, options)
+        plan.members.append((PACKAGE_INDEX_NAME, index_size))
+
+        plan.estimated_compressed_bytes = sum(p.estimated_compressed_bytes for p in plan.projects.values())
+        plan.estimated_compressed_bytes += len(plan.doc_boards) * PLAN_DOC_BYTES_PER_BOARD
+        plan.estimated_compressed_bytes += self.estimate_compressed_size(
+            PACKAGE_INDEX_NAME, index_size, options.compression, archive_format)
+        plan.estimated_seconds = self._estimate_seconds(plan)
+        return plan
+
+    def _get_removed_project_prefixes(self, repo_list: List[str], options: PackageOptions) -> List[str]:
+        """Get path prefixes of package content removed after staging."""
+        normalize = self.creator.context.normalize_path
+        # Projects holding the docs directory are kept for the generated PDFs, the docs project is not
+        prefixes = [f"{project.path}/" for project in self.creator.context.projects
+                    if project.name not in repo_list and project.path != "manifests"
+                    and not (options.generate_docs and DOC_PACKAGE_PATH.startswith(normalize(project.path) + '/'))]
+        prefixes.append(f".west/{CACHE_DIR_NAME}/")
+        if not options.generate_docs:
+            prefixes.append("mcuxsdk/docs/")
+        return prefixes
+
+    def _get_unsupported_example_prefixes(self, rel_paths: List[str], board_filter: List[str]) -> Tuple[str, ...]:
+        """
+        Get the path prefixes of the example directories removed as left without target boards.
+
+        The example.yml files the package creator filters are read from the
+        workspace, and their directories selected like
+        PackageCreator._remove_unsupported_example_dirs does.
+        """
+        matcher = self.creator._get_board_matcher(board_filter)
+        yml_paths = [rel_path for rel_path in rel_paths
+                     if os.path.basename(rel_path) == EXAMPLE_YML_NAME and rel_path.startswith('mcuxsdk/')
+                     and not rel_path.startswith(f"{DOC_PACKAGE_PATH}/")
+                     and not EXAMPLE_YML_PRUNED_DIRS.intersection(rel_path.split('/')[:-1])]
+        unsupported = [rel_path for rel_path in yml_paths if self._is_example_yml_unsupported(rel_path, matcher)]
+        kept_dirs = {os.path.dirname(rel_path) for rel_path in set(yml_paths) - set(unsupported)}
+        prefixes = []
+        for rel_path in unsupported:
+            example_dir = os.path.dirname(rel_path)
+            if (not example_dir.startswith('mcuxsdk/examples/')
+                    or example_dir[len('mcuxsdk/examples/'):].split('/', 1)[0] in EXAMPLE_SHARED_DIRS):
+                continue
+            if any(kept == example_dir or kept.startswith(f"{example_dir}/") for kept in kept_dirs):
+                continue
+            prefixes.append(f"{example_dir}/")
+        if prefixes:
+            self.logger(f"Planning without {len(prefixes)} example directories without target boards", 'dbg')
+        return tuple(prefixes)
+
+    def _is_example_yml_unsupported(self, rel_path: str, matcher: BoardKeyMatcher) -> bool:
+        """Check whether filtering an example.yml file for the target boards leaves no example in it."""
+        try:
+            with open(os.path.join(self.workspace_root, rel_path), 'r', encoding='utf-8') as f:
+                yaml_data = yaml.safe_load(f)
+        except (yaml.YAMLError, IOError) as e:
+            self.logger(f"Error processing example.yml file {rel_path}: {e}", 'wrn')
+            return False
+        if not yaml_data or not isinstance(yaml_data, dict):
+            return False
+
+        unsupported = set()
+        for example_name, example_config in yaml_data.items():
+            if not isinstance(example_config, dict) or not isinstance(example_config.get('boards'), dict):
+                continue
+            if example_config['boards'] and not matcher.filter_boards(example_config['boards']):
+                unsupported.add(example_name)
+        return bool(unsupported) and not any(isinstance(value, dict) for name, value in yaml_data.items()
+                                             if name not in unsupported)
+
+    def _estimate_index_size(self, plan: PackagePlan, projects: List, options: PackageOptions) -> int:
+        """Estimate the size of the package index from the planned members and their parent directories."""
+        members = {}
+        for rel_path, size in plan.members:
+            members[rel_path] = PackageMember(rel_path, MEMBER_FILE, PLAN_INDEX_DIGEST, size)
+            parent = rel_path.rpartition('/')[0]
+            while parent and parent not in members:
+                members[parent] = PackageMember(parent, MEMBER_DIRECTORY, '', 0)
+                parent = parent.rpartition('/')[0]
+        index = PackageIndex(members, self.creator._get_index_projects(projects), options.board_filter)
+        return len(index.to_json())
+
+    @staticmethod
+    def _is_example_kept(rel_path: str, target_paths: Set[str], parent_paths: Set[str]) -> bool:
+        """Check whether a file below mcuxsdk/examples survives the example filter."""
+        parts = rel_path.split('/')
+        for i in range(1, len(parts)):
+            dir_path = '/'.join(parts[:i])
+            if dir_path in target_paths:
+                return True
+            if dir_path not in parent_paths:
+                return False
+        # Files directly inside kept parent directories are not removed
+        return True
+
+    def _list_source_files(self, path: str, project, excluded_boards: Set[str],
+                           include_git: bool) -> List[Tuple[str, int]]:
+        """List the files staged for a project as (workspace relative path, size) tuples."""
+        src_dir = os.path.join(self.workspace_root, path)
+        if not os.path.exists(src_dir):
+            self.logger(f"Source directory not found: {src_dir}", 'wrn')
+            return []
+
+        creator = self.creator
+        files = []
+        if project is not None and creator._uses_git_tree_copy(project):
+            try:
+                tracked_files = creator._get_git_tree_files(src_dir)
+            except subprocess.CalledProcessError as e:
+                self.logger(f"Git ls-tree command failed for {src_dir}: {e}", 'wrn')
+                tracked_files = []
+            for rel_file_path in tracked_files:
+                src_file = os.path.join(src_dir, rel_file_path)
+                if not os.path.exists(src_file):
+                    continue
+                if creator._should_exclude_path(rel_file_path, excluded_boards, include_git):
+                    continue
+                files.append((f"{path}/{rel_file_path}", self._member_size(src_file)))
+            if include_git:
+                files.extend(self._walk_files(os.path.join(src_dir, '.git'), f"{path}/.git", set(), True))
+        else:
+            boards = creator._get_project_excluded_boards(project, excluded_boards) if project else excluded_boards
+            files.extend(self._walk_files(src_dir, path, boards, include_git))
+        return files
+
+    def _walk_files(self, src_dir: str, arc_prefix: str, excluded_boards: Set[str],
+                    include_git: bool, rel_path: str = "") -> List[Tuple[str, int]]:
+        """Walk a directory with the filtering of PackageCreator._copy_with_filtering."""
+        files = []
+        try:
+            entries = list(os.scandir(src_dir))
+        except (OSError, PermissionError) as e:
+            self.logger(f"Cannot read directory {src_dir}: {e}", 'wrn')
+            return files
+
+        for entry in entries:
+            item_rel_path = os.path.join(rel_path, entry.name) if rel_path else entry.name
+            if self.creator._should_exclude_path(item_rel_path, excluded_boards, include_git):
+                continue
+            arc_path = f"{arc_prefix}/{item_rel_path.replace(os.sep, '/')}"
+            if entry.is_symlink() or entry.is_file(follow_symlinks=False):
+                files.append((arc_path, self._member_size(entry.path)))
+            elif entry.is_dir(follow_symlinks=False):
+                files.extend(self._walk_files(entry.path, arc_prefix, excluded_boards, include_git, item_rel_path))
+        return files
+
+    @staticmethod
+    def _member_size(path: str) -> int:
+        """Size of a package member; symbolic links are stored as their target path."""
+        if os.path.islink(path):
+            return len(os.readlink(path).encode('utf-8'))
+        return os.path.getsize(path)
+
+    @staticmethod
+    def estimate_compressed_size(rel_path: str, size: int, preset: str = DEFAULT_COMPRESSION_PRESET,
+                                 archive_format: str = DEFAULT_ARCHIVE_FORMAT) -> int:
+        """Estimate the size of a member in the archive, for a compression preset and archive format."""
+        extension = os.path.splitext(rel_path)[1].lower()
+        ratio = COMPRESSION_RATIO_BY_EXTENSION.get(extension, DEFAULT_COMPRESSION_RATIO)
+        if archive_format in SOLID_RATIO_FACTORS:
+            return int(size * min(1.0, ratio * SOLID_RATIO_FACTORS[archive_format][preset])) + TAR_MEMBER_OVERHEAD
+        # Members the compression policy stores without deflating
+        if size < MIN_DEFLATE_SIZE or (extension in COMPRESSED_EXTENSIONS and PRESET_SETTINGS[preset]['store_compressed']):
+            ratio = 1.0
+        return int(size * min(1.0, ratio * PRESET_RATIO_FACTORS[preset])) + ZIP_MEMBER_OVERHEAD + 2 * len(rel_path)
+
+    @staticmethod
+    def _estimate_seconds(plan: PackagePlan) -> float:
+        """Estimate the package creation time, excluding repository updates."""
+        total_bytes = plan.total_bytes
+        seconds = total_bytes / PLAN_COPY_BYTES_PER_SECOND
+        seconds += plan.example_yml_files / PLAN_EXAMPLE_YML_PER_SECOND
+        archive_seconds = total_bytes / PLAN_ARCHIVE_BYTES_PER_SECOND
+        doc_seconds = len(plan.doc_boards) * PLAN_DOC_SECONDS_PER_BOARD
+        # Documentation builds overlap with the archive phase
+        return seconds + max(archive_seconds, doc_seconds)
+
+    def write_plan(self, plan: PackagePlan, plan_path: str) -> None:
+        """Write the plan, including the member list, as JSON."""
+        plan_dir = os.path.dirname(plan_path)
+        if plan_dir:
+            os.makedirs(plan_dir, exist_ok=True)
+        with open(plan_path, 'w', encoding='utf-8') as f:
+            json.dump(plan.to_dict(), f, indent=2)
+        self.logger(f"Package plan written to: {plan_path}", 'inf')
@@ -0,0 +1,179 @@
+# Copyright 2025 NXP
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Phase profiling utility.
+
+This module records the phases and sub-phases of a packaging run (wall time,
+files and bytes processed, peak RSS) and writes them as a Chrome trace JSON
+file, which can be opened in chrome://tracing or Perfetto, or compared across
+releases with ordinary JSON tooling.
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def get_peak_rss_kb() -> Optional[int]:
+    """
+    Get the peak resident set size of this process and its waited-for children.
+
+    Returns:
+        Peak RSS in KiB, or None if it cannot be determined on this platform
+    """
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is reported in bytes on macOS and in KiB elsewhere
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+class PhaseRecord:
+    """Counters of one running phase."""
+
+    __slots__ = ('name', 'category', 'args', 'files', 'bytes')
+
+    def __init__(self, name: str, category: str, args: Dict[str, Any]):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.files = 0
+        self.bytes = 0
+
+    def add(self, files: int = 0, bytes: int = 0) -> None:
+        """Add processed files and bytes to the phase."""
+        self.files += files
+        self.bytes += bytes
+
+
+class PhaseProfiler:
+    """
+    Records nested phases per thread and writes them as a Chrome trace.
+
+    A disabled profiler records nothing, so instrumented code can call it
+    unconditionally.
+    """
+
+    def __init__(self, logger: Callable[[str, str], None] = None, enabled: bool = True):
+        self.logger = logger or self._default_logger
+        self.enabled = enabled
+        self.metadata: Dict[str, Any] = {}
+        self._events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._thread_ids: Dict[int, int] = {}
+        self._origin = time.perf_counter()
+
+    def _default_logger(self, message: str, level: str = 'inf'):
+        """Default logger that does nothing."""
+        pass
+
+    def _stack(self) -> List[PhaseRecord]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _thread_id(self) -> int:
+        # Small stable ids keep the trace viewer readable
+        ident = threading.get_ident()
+        with self._lock:
+            return self._thread_ids.setdefault(ident, len(self._thread_ids) + 1)
+
+    @contextmanager
+    def phase(self, name: str, category: str = 'phase', **args) -> Iterator[PhaseRecord]:
+        """
+        Record a phase for the duration of the with-block.
+
+        Args:
+            name: Phase name, e.g. "copy" or "docs:frdmmcxw71"
+            category: Trace category of the phase
+            **args: Extra values stored with the phase
+
+        Yields:
+            PhaseRecord to which processed files and bytes can be added
+        """
+        record = PhaseRecord(name, category, args)
+        if not self.enabled:
+            yield record
+            return
+
+        stack = self._stack()
+        stack.append(record)
+        start = time.perf_counter()
+        error = None
+        try:
+            yield record
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            end = time.perf_counter()
+            stack.pop()
+            if stack:
+                # Sub-phase counters are included in the totals of the enclosing phase
+                stack[-1].add(record.files, record.bytes)
+            event_args = dict(record.args)
+            event_args.update(files=record.files, bytes=record.bytes, peak_rss_kb=get_peak_rss_kb())
+            if error:
+                event_args['error'] = error
+            event = {
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': round((start - self._origin) * 1e6),
+                'dur': round((end - start) * 1e6),
+                'pid': os.getpid(),
+                'tid': self._thread_id(),
+                'args': event_args,
+            }
+            with self._lock:
+                self._events.append(event)
+
+    def add(self, files: int = 0, bytes: int = 0) -> None:
+        """Add processed files and bytes to the innermost phase of the calling thread."""
+        if self.enabled:
+            stack = self._stack()
+            if stack:
+                stack[-1].add(files, bytes)
+
+    def get_events(self) -> List[Dict[str, Any]]:
+        """Get the recorded phase events ordered by start time."""
+        with self._lock:
+            return sorted(self._events, key=lambda e: (e['ts'], -e['dur']))
+
+    def write(self, output_path: str) -> None:
+        """Write the recorded phases as a Chrome trace JSON file."""
+        if not self.enabled:
+            return
+
+        events = self.get_events()
+        trace = {
+            'traceEvents': events + [
+                {'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid,
+                 'args': {'name': 'main' if tid == 1 else f'worker-{tid}'}}
+                for tid in sorted(set(self._thread_ids.values()))
+            ],
+            'displayTimeUnit': 'ms',
+            'otherData': dict(self.metadata, python=platform.python_version(), platform=sys.platform,
+                              peak_rss_kb=get_peak_rss_kb()),
+        }
+
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(trace, f, indent=1)
+        self.logger(f"Profile with {len(events)} phases written to: {output_path}", 'inf')
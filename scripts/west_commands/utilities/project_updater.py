@@ -0,0 +1,293 @@
+# Copyright 2025 NXP
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Project updater utility.
+
+This module updates the board filtered projects of a workspace (core and
+examples) as blobless partial clones with a sparse checkout. The sparse
+patterns are derived from the resolved board filter and example list with the
+same rules the package creator uses to filter these projects, so the files of
+other boards and of unselected examples are neither downloaded nor written to
+disk. Blobs of the selected paths are fetched on demand by git when they are
+checked out.
+
+It also seeds projects without network access from a directory of git
+bundles or bare mirror repositories, checking out the manifest revisions the
+way west update does.
+"""
+
+import os
+import time
+import subprocess
+from typing import Callable, List, Optional, Set
+from .board_matcher import BoardKeyMatcher
+from .package_creator import PackageCreator
+
+
+# Projects updated sparsely, the ones the package creator filters by board
+SPARSE_PROJECTS = ('core', 'mcu-sdk-examples')
+EXAMPLES_PROJECT = 'mcu-sdk-examples'
+# Path of the board directories in the examples project, the list of known boards
+BOARDS_TREE_PATH = '_boards'
+PARTIAL_CLONE_FILTER = 'blob:none'
+DEFAULT_REMOTE_NAME = 'origin'
+# Ref west uses for the manifest revision of a project
+MANIFEST_REV_REF = 'refs/heads/manifest-rev'
+# Seed sources looked up per project name and repository name, in this order
+SEED_SOURCE_SUFFIXES = ('.bundle', '.git', '')
+# Where all branches and tags of a seed source are fetched when a commit cannot be fetched directly
+SEED_REFSPECS = ('+refs/heads/*:refs/seed/heads/*', '+refs/tags/*:refs/seed/tags/*')
+
+
+class ProjectUpdater:
+    """Independent utility for sparse and offline updates of workspace projects."""
+
+    def __init__(self, workspace_root: str, logger: Callable[[str, str], None] = None):
+        self.workspace_root = workspace_root
+        self.logger = logger or self._default_logger
+
+    def _default_logger(self, message: str, level: str = 'inf'):
+        """Default logger that does nothing."""
+        pass
+
+    def update_sparse(self, projects: List, board_filter: List[str], example_list: List[str],
+                      legacy_board_match: bool = False, depth: int = 1) -> Set[str]:
+        """
+        Update projects as blobless partial clones with board-aware sparse checkouts.
+
+        All projects are fetched first, commits and trees only, so that the
+        board list can be read from the fetched examples tree even in a new
+        workspace. Then the sparse patterns are applied and the revisions
+        checked out, which downloads the blobs of the selected paths.
+
+        Args:
+            projects: Projects to update, usually the ones in SPARSE_PROJECTS
+            board_filter: Boards kept, including dependencies
+            example_list: Examples kept, relative to the examples project
+            legacy_board_match: Whether board names are matched as in earlier releases
+            depth: History depth fetched, 0 for the full history
+
+        Returns:
+            Names of the boards left out of the checkouts
+        """
+        if not projects:
+            return set()
+
+        self.logger(f"Updating {len(projects)} repositories with partial clone and sparse checkout: "
+                    f"{[p.name for p in projects]}", 'inf')
+        commits = {}
+        for project in projects:
+            start_time = time.time()
+            repo_dir = self._prepare_repository(project)
+            commits[project.name] = self._fetch(repo_dir, project, depth)
+            self.logger(f"Fetched {project.name} at {commits[project.name][:12]} in "
+                        f"{time.time() - start_time:.2f} seconds", 'dbg')
+
+        excluded_boards = self.get_excluded_boards(projects, commits, board_filter, legacy_board_match)
+        self.logger(f"Sparse checkout excludes {len(excluded_boards)} boards", 'inf')
+
+        for project in projects:
+            start_time = time.time()
+            repo_dir = os.path.join(self.workspace_root, project.path)
+            patterns = self.get_sparse_patterns(project.name, excluded_boards, example_list)
+            self._checkout(repo_dir, commits[project.name], patterns)
+            self.logger(f"Checked out {project.name} ({len(patterns)} sparse patterns) in "
+                        f"{time.time() - start_time:.2f} seconds", 'inf')
+        return excluded_boards
+
+    def _git(self, repo_dir: str, args: List[str], stdin: Optional[str] = None) -> str:
+        """Run a git command in a repository and return its output."""
+        cmd = ['git'] + args
+        self.logger(f"Running command: {' '.join(cmd)} (in {repo_dir})", 'dbg')
+        try:
+            result = subprocess.run(cmd, cwd=repo_dir, input=stdin, check=True, capture_output=True, text=True)
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"'{' '.join(cmd)}' failed in {repo_dir}: {(e.stderr or '').strip()}") from e
+        return result.stdout
+
+    def _prepare_repository(self, project) -> str:
+        """Create the repository of a project if needed and point its remote to the project URL."""
+        repo_dir = os.path.join(self.workspace_root, project.path)
+        remote = getattr(project, 'remote_name', None) or DEFAULT_REMOTE_NAME
+        os.makedirs(repo_dir, exist_ok=True)
+        if not os.path.exists(os.path.join(repo_dir, '.git')):
+            self.logger(f"Initializing repository for {project.name}: {repo_dir}", 'dbg')
+            self._git(repo_dir, ['init', '-q'])
+
+        remotes = self._git(repo_dir, ['remote']).split()
+        if remote not in remotes:
+            self._git(repo_dir, ['remote', 'add', remote, project.url])
+        elif self._git(repo_dir, ['remote', 'get-url', remote]).strip() != project.url:
+            self._git(repo_dir, ['remote', 'set-url', remote, project.url])
+        return repo_dir
+
+    def _fetch(self, repo_dir: str, project, depth: int) -> str:
+        """Fetch the manifest revision without blobs and record it as manifest-rev."""
+        remote = getattr(project, 'remote_name', None) or DEFAULT_REMOTE_NAME
+        revision = project.revision or 'HEAD'
+        args = ['fetch', '-q', f'--filter={PARTIAL_CLONE_FILTER}']
+        if depth:
+            args.append(f'--depth={depth}')
+        self._git(repo_dir, args + [remote, revision])
+        commit = self._git(repo_dir, ['rev-parse', 'FETCH_HEAD^{commit}']).strip()
+        self._git(repo_dir, ['update-ref', MANIFEST_REV_REF, commit])
+        return commit
+
+    def get_excluded_boards(self, projects: List, commits: dict, board_filter: List[str],
+                            legacy_board_match: bool = False) -> Set[str]:
+        """Get the boards to leave out, listed from the fetched examples tree."""
+        if not board_filter:
+            return set()
+        examples = next((p for p in projects if p.name == EXAMPLES_PROJECT), None)
+        if examples is not None:
+            repo_dir = os.path.join(self.workspace_root, examples.path)
+            output = self._git(repo_dir, ['ls-tree', '-d', '--name-only', commits[examples.name],
+                                          f'{BOARDS_TREE_PATH}/'])
+            boards = [os.path.basename(line) for line in output.splitlines() if line]
+            matcher = BoardKeyMatcher(board_filter, legacy_board_match)
+            return {board for board in boards if not matcher.matches_board(board)}
+        # Examples not updated here, use the checked out board list like the package creator
+        creator = PackageCreator(self.workspace_root, self.logger)
+        creator._board_matcher = BoardKeyMatcher(board_filter, legacy_board_match)
+        return creator._get_excluded_boards(board_filter)
+
+    @staticmethod
+    def get_sparse_patterns(project_name: str, excluded_boards: Set[str], example_list: List[str]) -> List[str]:
+        """
+        Get the sparse checkout patterns (non-cone, gitignore syntax) of a project.
+
+        Everything is included except path components named after excluded
+        boards; in the examples project only the selected examples, their
+        parent directories' files, _boards and _common are included.
+        """
+        patterns = ['/*']
+        if project_name == EXAMPLES_PROJECT:
+            target_paths, parent_paths = PackageCreator._get_example_target_paths(example_list)
+            patterns.append('!/*/')
+            for parent_path in sorted(parent_paths):
+                patterns += [f'/{parent_path}/*', f'!/{parent_path}/*/']
+            patterns += [f'/{target_path}/' for target_path in sorted(target_paths)]
+        # Later patterns take precedence, board exclusions apply at every depth
+        patterns += [f'!{board}' for board in sorted(excluded_boards)]
+        return patterns
+
+    def get_sparse_projects(self, projects: List) -> List:
+        """Get the projects whose checkout is sparse, e.g. left so by an earlier sparse update."""
+        sparse = []
+        for project in projects:
+            repo_dir = os.path.join(self.workspace_root, project.path)
+            if not os.path.exists(os.path.join(repo_dir, '.git')):
+                continue
+            try:
+                enabled = self._git(repo_dir, ['config', '--bool', '--get', 'core.sparseCheckout']).strip()
+            except RuntimeError:
+                # Not set
+                continue
+            if enabled == 'true':
+                sparse.append(project)
+        return sparse
+
+    def disable_sparse(self, projects: List) -> List[str]:
+        """
+        Restore the full checkout of projects with a sparse checkout.
+
+        The patterns of a sparse update select the files of its boards, a later
+        full update of other boards would otherwise keep applying them. Missing
+        blobs of partial clones are fetched by git.
+
+        Returns:
+            Names of the projects whose checkout was restored
+        """
+        restored = []
+        for project in self.get_sparse_projects(projects):
+            start_time = time.time()
+            self._git(os.path.join(self.workspace_root, project.path), ['sparse-checkout', 'disable'])
+            self.logger(f"Restored full checkout of {project.name} in {time.time() - start_time:.2f} seconds", 'inf')
+            restored.append(project.name)
+        return restored
+
+    def _checkout(self, repo_dir: str, commit: str, patterns: List[str]) -> None:
+        """Apply the sparse patterns and check the commit out."""
+        sparse_file = os.path.join(repo_dir, '.git', 'info', 'sparse-checkout')
+        os.makedirs(os.path.dirname(sparse_file), exist_ok=True)
+        with open(sparse_file, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(patterns) + '\n')
+        # Keeps the patterns written above, and overrides the per-worktree settings
+        # left by 'git sparse-checkout disable'
+        self._git(repo_dir, ['sparse-checkout', 'init', '--no-cone'])
+        self._git(repo_dir, ['checkout', '-q', '--detach', commit])
+        # Re-apply the patterns to a commit that was already checked out
+        self._git(repo_dir, ['sparse-checkout', 'reapply'])
+
+    @staticmethod
+    def find_seed_source(seed_dir: str, project) -> Optional[str]:
+        """
+        Find the bundle or bare mirror of a project in a seed directory.
+
+        Candidates are <name>.bundle, <name>.git and <name>, for the project
+        name and for the repository name at the end of the project URL.
+        """
+        names = [project.name]
+        url = getattr(project, 'url', None)
+        if url:
+            repo_name = url.rstrip('/').split('/')[-1]
+            if repo_name.endswith('.git'):
+                repo_name = repo_name[:-4]
+            if repo_name and repo_name not in names:
+                names.append(repo_name)
+        for name in names:
+            for suffix in SEED_SOURCE_SUFFIXES:
+                candidate = os.path.join(seed_dir, name + suffix)
+                if suffix == '.bundle' and os.path.isfile(candidate):
+                    return candidate
+                if suffix != '.bundle' and os.path.isdir(candidate) and \
+                        os.path.exists(os.path.join(candidate, 'objects')):
+                    return candidate
+        return None
+
+    def seed_projects(self, projects: List, seed_dir: str) -> List:
+        """
+        Update projects from local git bundles or bare mirrors instead of the network.
+
+        The manifest revision of each project is fetched from its seed source,
+        recorded as manifest-rev and checked out on a detached HEAD.
+
+        Args:
+            projects: Projects to update
+            seed_dir: Directory with per-project bundles or bare mirrors
+
+        Returns:
+            Projects without a seed source, left untouched
+        """
+        missing = []
+        for project in projects:
+            source = self.find_seed_source(seed_dir, project)
+            if source is None:
+                missing.append(project)
+                continue
+            start_time = time.time()
+            repo_dir = self._prepare_repository(project)
+            commit = self._fetch_seed(repo_dir, project, source)
+            self._git(repo_dir, ['update-ref', MANIFEST_REV_REF, commit])
+            self._git(repo_dir, ['checkout', '-q', '--detach', commit])
+            self.logger(f"Seeded {project.name} at {commit[:12]} from {os.path.basename(source)} in "
+                        f"{time.time() - start_time:.2f} seconds", 'inf')
+        return missing
+
+    def _fetch_seed(self, repo_dir: str, project, source: str) -> str:
+        """Fetch the manifest revision of a project from a seed source and return its commit."""
+        revision = project.revision or 'HEAD'
+        try:
+            self._git(repo_dir, ['fetch', '-q', '--tags', source, revision])
+            return self._git(repo_dir, ['rev-parse', 'FETCH_HEAD^{commit}']).strip()
+        except RuntimeError as e:
+            # Bundles and mirrors only serve their refs, fetch them all and look the revision up
+            self.logger(f"Fetching {revision} from {source} failed, fetching all refs: {e}", 'dbg')
+        self._git(repo_dir, ['fetch', '-q', source] + list(SEED_REFSPECS))
+        for candidate in (revision, f'refs/seed/heads/{revision}', f'refs/seed/tags/{revision}'):
+            try:
+                return self._git(repo_dir, ['rev-parse', '--verify', '-q', f'{candidate}^{{commit}}']).strip()
+            except RuntimeError:
+                continue
+        raise RuntimeError(f"Revision {revision} of {project.name} not found in {source}")
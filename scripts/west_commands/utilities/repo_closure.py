@@ -0,0 +1,247 @@
+# Copyright 2025 NXP
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Repository closure analysis utility.
+
+This module derives the repositories the selected examples of a package
+actually use from their build metadata, instead of the hand maintained
+repo_list of the board configuration. The build files of every example and of
+its board ports (CMakeLists.txt, *.cmake, Kconfig, prj.conf, example.yml) are
+scanned for:
+
+- paths below ${SdkRootDirPath}, mapped to the project with the longest
+  matching manifest path
+- MCUX_COMPONENT_ Kconfig symbols, mapped to the project whose Kconfig files
+  define them, following select and depends on to other components
+
+Only middleware, RTOS and nested component projects can be left out; the
+projects every package needs (core, CMSIS, devices, components, examples, tool
+data, documentation) are always kept. Candidate projects that are not checked
+out can only be matched by path; they are kept when the examples use components
+no checked out project defines.
+"""
+
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple
+from .workspace_context import WorkspaceContext
+
+
+EXAMPLES_PATH = 'mcuxsdk/examples'
+SDK_ROOT_PATH = 'mcuxsdk'
+# Projects below these paths are used by examples on demand, all others are always kept
+OPTIONAL_PROJECT_PATH_PREFIXES = ('mcuxsdk/middleware/', 'mcuxsdk/rtos/', 'mcuxsdk/components/')
+BUILD_FILE_NAMES = ('CMakeLists.txt', 'prj.conf', 'example.yml')
+BUILD_FILE_SUFFIXES = ('.cmake', '.conf')
+KCONFIG_FILE_PREFIX = 'Kconfig'
+SDK_PATH_PATTERN = re.compile(r'\$\{SdkRootDirPath\}/([^\s"\'()${}]+)')
+COMPONENT_PATTERN = re.compile(r'MCUX_COMPONENT_([\w.\-]+)')
+KCONFIG_DEFINITION_PATTERN = re.compile(r'^\s*(?:menu)?config\s+MCUX_COMPONENT_([\w.\-]+)')
+KCONFIG_REFERENCE_PATTERN = re.compile(r'^\s*(?:select|imply|depends\s+on)\s')
+
+
+@dataclass
+class RepoClosure:
+    """Result of a repository closure analysis."""
+    repos: List[str]  # Repositories of the minimal closure, in configuration order
+    required: List[str]  # Repositories of the configuration the examples use, in configuration order
+    unused: List[str]  # Repositories of the configuration no example uses
+    always_kept: List[str]  # Repositories kept regardless of the examples
+    missing: List[str]  # Projects the examples use that the configuration does not list
+    reasons: Dict[str, List[str]] = field(default_factory=dict)  # First references found per repository
+    scanned_files: int = 0
+
+
+class RepoClosureAnalyzer:
+    """Independent utility deriving the repositories used by examples from their build metadata."""
+
+    # Number of references kept per repository for the report
+    MAX_REASONS = 3
+
+    def __init__(self, workspace_root: str, context: WorkspaceContext,
+                 logger: Callable[[str, str], None] = None):
+        self.workspace_root = workspace_root
+        self.context = context
+        self.logger = logger or self._default_logger
+
+    def _default_logger(self, message: str, level: str = 'inf'):
+        """Default logger that does nothing."""
+        pass
+
+    @staticmethod
+    def is_optional_project(path: str) -> bool:
+        """Check whether a project path is one examples use on demand."""
+        path = WorkspaceContext.normalize_path(path) + '/'
+        return path.startswith(OPTIONAL_PROJECT_PATH_PREFIXES) and path not in OPTIONAL_PROJECT_PATH_PREFIXES
+
+    def analyze(self, repo_list: List[str], example_list: List[str], board_filter: List[str]) -> RepoClosure:
+        """
+        Analyze the repositories used by examples.
+
+        Args:
+            repo_list: Repositories of the configuration
+            example_list: Examples of the package, relative to the examples project
+            board_filter: Boards of the package, whose example ports are scanned too
+
+        Returns:
+            Closure with the used and unused repositories of the configuration
+        """
+        start_time = time.time()
+        candidates = []
+        always_kept = []
+        missing_repos = []
+        for repo in repo_list:
+            project = self.context.get_project(repo)
+            if project is None or not self.is_optional_project(project.path):
+                always_kept.append(repo)
+            elif not self._is_checked_out(repo):
+                missing_repos.append(repo)
+            else:
+                candidates.append(repo)
+
+        # Components of the kept projects may select components of candidate projects
+        components = self._index_components([repo for repo in repo_list if self._is_checked_out(repo)])
+        reasons: Dict[str, List[str]] = {}
+        scanned_files = 0
+        pending_components: List[Tuple[str, str]] = []
+        for example_dir, label in self._get_example_dirs(example_list, board_filter):
+            for file_path in self._find_build_files(example_dir):
+                scanned_files += 1
+                source = f"{label}/{os.path.relpath(file_path, example_dir).replace(os.sep, '/')}"
+                content = self._read_text(file_path)
+                for ref_path in SDK_PATH_PATTERN.findall(content):
+                    project = self._find_project_for_path(f"{SDK_ROOT_PATH}/{ref_path}")
+                    if project is not None:
+                        self._add_reason(reasons, project.name, f"{source}: ${{SdkRootDirPath}}/{ref_path}")
+                pending_components.extend((component, source) for component in COMPONENT_PATTERN.findall(content))
+
+        # Follow the components through their select and depends on references
+        seen = set()
+        unresolved_components = set()
+        while pending_components:
+            component, source = pending_components.pop()
+            if component not in components:
+                unresolved_components.add(component)
+                continue
+            if component in seen:
+                continue
+            seen.add(component)
+            project_name, references = components[component]
+            self._add_reason(reasons, project_name, f"{source}: MCUX_COMPONENT_{component}")
+            pending_components.extend((ref, f"MCUX_COMPONENT_{component}") for ref in references)
+
+        # Projects that are not checked out may define the components no checked out project defines
+        if missing_repos and unresolved_components:
+            self.logger(f"Keeping {missing_repos}, not checked out while examples use undefined components: "
+                        f"{sorted(unresolved_components)[:self.MAX_REASONS]}", 'wrn')
+            always_kept = [repo for repo in repo_list if repo in always_kept or repo in missing_repos]
+        elif missing_repos:
+            candidates = [repo for repo in repo_list if repo in candidates or repo in missing_repos]
+
+        listed = set(repo_list)
+        unused = {repo for repo in candidates if repo not in reasons}
+        closure = RepoClosure(
+            repos=[repo for repo in repo_list if repo not in unused],
+            required=[repo for repo in candidates if repo in reasons],
+            unused=[repo for repo in candidates if repo in unused],
+            always_kept=always_kept,
+            missing=sorted(name for name in reasons
+                           if name not in listed and self.is_optional_project(self.context.get_project(name).path)),
+            reasons=reasons,
+            scanned_files=scanned_files
+        )
+        self.logger(f"Repository closure: {len(closure.required)} of {len(candidates)} candidate repositories used "
+                    f"by {len(example_list)} examples ({scanned_files} build files, {len(components)} components) "
+                    f"in {time.time() - start_time:.2f} seconds", 'inf')
+        return closure
+
+    def _is_checked_out(self, repo: str) -> bool:
+        project = self.context.get_project(repo)
+        return project is not None and os.path.isdir(os.path.join(self.workspace_root, project.path))
+
+    def _add_reason(self, reasons: Dict[str, List[str]], repo: str, reason: str) -> None:
+        repo_reasons = reasons.setdefault(repo, [])
+        if len(repo_reasons) < self.MAX_REASONS and reason not in repo_reasons:
+            repo_reasons.append(reason)
+
+    def _get_example_dirs(self, example_list: List[str], board_filter: List[str]) -> List[Tuple[str, str]]:
+        """Get the existing directories of the examples and of their board ports, with labels."""
+        examples_root = os.path.join(self.workspace_root, EXAMPLES_PATH)
+        example_dirs = []
+        for example in example_list:
+            example = example.replace('\\', '/').strip('/')
+            candidates = [(os.path.join(examples_root, example), example)]
+            candidates += [(os.path.join(examples_root, '_boards', board, example), f"_boards/{board}/{example}")
+                           for board in board_filter]
+            example_dirs.extend((path, label) for path, label in candidates if os.path.isdir(path))
+        return example_dirs
+
+    @staticmethod
+    def _find_build_files(directory: str) -> List[str]:
+        """Find the build metadata files below a directory."""
+        build_files = []
+        for root, dirs, files in os.walk(directory):
+            dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+            build_files.extend(os.path.join(root, name) for name in sorted(files)
+                               if name in BUILD_FILE_NAMES or name.endswith(BUILD_FILE_SUFFIXES)
+                               or name.startswith(KCONFIG_FILE_PREFIX))
+        return build_files
+
+    def _read_text(self, file_path: str) -> str:
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                return f.read()
+        except OSError as e:
+            self.logger(f"Cannot read build file {file_path}: {e}", 'wrn')
+            return ''
+
+    def _find_project_for_path(self, path: str):
+        """Get the project with the longest manifest path containing a workspace path."""
+        path = WorkspaceContext.normalize_path(os.path.normpath(path).replace(os.sep, '/'))
+        while path:
+            project = self.context.get_project_by_path(path)
+            if project is not None:
+                return project
+            path = path.rpartition('/')[0]
+        return None
+
+    def _index_components(self, repos: List[str]) -> Dict[str, Tuple[str, List[str]]]:
+        """
+        Index the Kconfig components defined by projects.
+
+        Projects nested in others are skipped while walking their parent.
+
+        Returns:
+            Dictionary mapping component names to the defining project and the
+            components its definition selects or depends on
+        """
+        components = {}
+        for repo in repos:
+            repo_path = WorkspaceContext.normalize_path(self.context.get_project(repo).path)
+            repo_dir = os.path.join(self.workspace_root, repo_path)
+            for root, dirs, files in os.walk(repo_dir):
+                rel_root = os.path.relpath(root, self.workspace_root).replace(os.sep, '/')
+                dirs[:] = [d for d in dirs if not d.startswith('.')
+                           and self.context.get_project_by_path(f"{rel_root}/{d}") is None]
+                for name in files:
+                    if name.startswith(KCONFIG_FILE_PREFIX):
+                        self._parse_kconfig(os.path.join(root, name), repo, components)
+        return components
+
+    def _parse_kconfig(self, file_path: str, repo: str, components: Dict[str, Tuple[str, List[str]]]) -> None:
+        """Add the component definitions of a Kconfig file."""
+        current = None
+        for line in self._read_text(file_path).splitlines():
+            match = KCONFIG_DEFINITION_PATTERN.match(line)
+            if match:
+                current = match.group(1)
+                # Nested projects may define a component again, the first definition wins
+                components.setdefault(current, (repo, []))
+                continue
+            if not line[:1].isspace():
+                current = None
+            elif current and components[current][0] == repo and KCONFIG_REFERENCE_PATTERN.match(line):
+                components[current][1].extend(COMPONENT_PATTERN.findall(line))
@@ -0,0 +1,179 @@
+# Copyright 2025 NXP
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Workspace-level persistent cache utility.
+
+This module provides a small JSON cache stored under the west workspace
+metadata directory (.west/) so that expensive, derived data can be reused
+across separate west command invocations.
+"""
+
+import os
+import json
+import tempfile
+import subprocess
+from typing import Any, Callable, Dict, Optional
+
+
+CACHE_DIR_NAME = 'mcuxsdk-cache'
+CACHE_FORMAT_VERSION = 1
+
+
+class WorkspaceCache:
+    """Independent JSON cache stored in <workspace>/.west/mcuxsdk-cache."""
+
+    def __init__(self, workspace_root: str, logger: Callable[[str, str], None] = None):
+        self.workspace_root = workspace_root
+        self.cache_dir = os.path.join(workspace_root, '.west', CACHE_DIR_NAME)
+        self.logger = logger or self._default_logger
+
+    def _default_logger(self, message: str, level: str = 'inf'):
+        """Default logger that does nothing."""
+        pass
+
+    def path(self, *parts: str) -> str:
+        """Get the absolute path of an entry inside the cache directory."""
+        return os.path.join(self.cache_dir, *parts)
+
+    def load_json(self, name: str) -> Optional[Dict[str, Any]]:
+        """Load a cached JSON payload, or None if missing, unreadable or stale format."""
+        cache_file = self.path(f'{name}.json')
+        if not os.path.isfile(cache_file):
+            self.logger(f"No cache entry found: {cache_file}", 'dbg')
+            return None
+
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                content = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger(f"Ignoring unreadable cache entry {cache_file}: {e}", 'dbg')
+            return None
+
+        if not isinstance(content, dict) or content.get('version') != CACHE_FORMAT_VERSION:
+            self.logger(f"Ignoring cache entry with unsupported format: {cache_file}", 'dbg')
+            return None
+
+        return content.get('payload')
+
+    def store_json(self, name: str, payload: Dict[str, Any]) -> bool:
+        """Atomically store a JSON payload. Failures are logged and never raised."""
+        cache_file = self.path(f'{name}.json')
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=f'.{os.path.basename(name)}.', suffix='.tmp',
+                                            dir=os.path.dirname(cache_file))
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump({'version': CACHE_FORMAT_VERSION, 'payload': payload}, f)
+                os.replace(tmp_path, cache_file)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            self.logger(f"Stored cache entry: {cache_file}", 'dbg')
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            self.logger(f"Failed to store cache entry {cache_file}: {e}", 'wrn')
+            return False
+
+    def invalidate(self, name: str) -> None:
+        """Remove a cached JSON payload if present."""
+        cache_file = self.path(f'{name}.json')
+        try:
+            os.remove(cache_file)
+            self.logger(f"Removed cache entry: {cache_file}", 'dbg')
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.logger(f"Failed to remove cache entry {cache_file}: {e}", 'wrn')
+
+
+def read_git_head(repo_dir: str) -> Optional[str]:
+    """
+    Get the commit checked out in a git repository.
+
+    The HEAD is read directly from the git metadata when possible, which avoids
+    spawning a git process. West checks projects out on a detached HEAD, so this
+    is normally a single small file read.
+
+    Args:
+        repo_dir: Working tree directory of the repository
+
+    Returns:
+        Commit SHA of HEAD, or None if it cannot be determined
+    """
+    git_path = os.path.join(repo_dir, '.git')
+
+    try:
+        if os.path.isfile(git_path):
+            # Worktree or submodule: .git is a file pointing to the real git dir
+            with open(git_path, 'r', encoding='utf-8') as f:
+                content = f.read().strip()
+            if not content.startswith('gitdir:'):
+                return None
+            git_dir = content[len('gitdir:'):].strip()
+            if not os.path.isabs(git_dir):
+                git_dir = os.path.normpath(os.path.join(repo_dir, git_dir))
+        elif os.path.isdir(git_path):
+            git_dir = git_path
+        else:
+            return None
+
+        with open(os.path.join(git_dir, 'HEAD'), 'r', encoding='utf-8') as f:
+            head = f.read().strip()
+
+        if not head.startswith('ref:'):
+            return head or None
+
+        ref_name = head[len('ref:'):].strip()
+        ref_file = os.path.join(git_dir, *ref_name.split('/'))
+        if os.path.isfile(ref_file):
+            with open(ref_file, 'r', encoding='utf-8') as f:
+                return f.read().strip() or None
+
+        packed_refs = os.path.join(git_dir, 'packed-refs')
+        if os.path.isfile(packed_refs):
+            with open(packed_refs, 'r', encoding='utf-8') as f:
+                for line in f:
+                    parts = line.strip().split(' ', 1)
+                    if len(parts) == 2 and parts[1] == ref_name:
+                        return parts[0]
+    except OSError:
+        pass
+
+    # Fall back to git for layouts not handled above
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=repo_dir,
+                                capture_output=True, text=True, check=True)
+        return result.stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def directory_stamp(directory: str, extensions: tuple = None) -> Optional[Dict[str, Any]]:
+    """
+    Get a cheap change stamp for a directory and its direct entries.
+
+    The stamp records the directory mtime plus mtime and size of every direct
+    entry (optionally restricted to some extensions). It changes whenever files
+    are added, removed or modified.
+
+    Args:
+        directory: Directory to stamp
+        extensions: Optional tuple of file extensions to include
+
+    Returns:
+        JSON-serializable stamp, or None if the directory cannot be read
+    """
+    try:
+        stamp = {'mtime_ns': os.stat(directory).st_mtime_ns, 'entries': {}}
+        with os.scandir(directory) as it:
+            for entry in it:
+                if extensions and not entry.name.endswith(extensions):
+                    continue
+                st = entry.stat()
+                stamp['entries'][entry.name] = [st.st_mtime_ns, st.st_size]
+        return stamp
+    except OSError:
+        return None
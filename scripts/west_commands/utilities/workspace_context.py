@@ -0,0 +1,132 @@
+# Copyright 2025 NXP
+# SPDX-License-Identifier: BSD-3-Clause
+
+"""
+Workspace context utility.
+
+This module provides a shared, per-process view of the resolved west manifest
+with prebuilt project lookup maps, so that the manifest import tree is resolved
+only once and reused by configuration loading, packaging and SBOM collection.
+Contexts can also be built from lightweight project records, without a manifest.
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class ProjectRecord:
+    """Lightweight copy of a resolved manifest project."""
+    name: str
+    path: str
+    revision: Optional[str] = None
+    url: Optional[str] = None
+    groups: List[str] = field(default_factory=list)
+    userdata: Any = None
+    active: bool = True
+
+    @classmethod
+    def from_project(cls, project, active: bool) -> 'ProjectRecord':
+        """Create a record from a west manifest Project."""
+        return cls(
+            name=project.name,
+            path=project.path,
+            revision=project.revision,
+            url=getattr(project, 'url', None),
+            groups=list(getattr(project, 'groups', None) or []),
+            userdata=getattr(project, 'userdata', None),
+            active=active
+        )
+
+
+class WorkspaceContext:
+    """Shared view of a resolved west manifest with prebuilt lookup maps."""
+
+    # Per-process cache of contexts, keyed by absolute workspace root
+    _instances: Dict[str, 'WorkspaceContext'] = {}
+
+    def __init__(self, workspace_root: str, manifest_dir: str, projects: List,
+                 active: Dict[str, bool], group_filter: List[str] = None, manifest=None,
+                 logger: Callable[[str, str], None] = None):
+        self.workspace_root = workspace_root
+        self.manifest_dir = manifest_dir
+        self.manifest = manifest  # None when built from project records
+        self.logger = logger or self._default_logger
+
+        self.projects = list(projects)
+        self.group_filter = list(group_filter or [])
+        self.projects_by_name = {p.name: p for p in self.projects}
+        self.projects_by_path = {self.normalize_path(p.path): p for p in self.projects}
+        self._active = dict(active)
+
+        self.logger(f"Workspace context ready: {len(self.projects)} projects, "
+                    f"{sum(1 for a in self._active.values() if a)} active", 'dbg')
+
+    def _default_logger(self, message: str, level: str = 'inf'):
+        """Default logger that does nothing."""
+        pass
+
+    @classmethod
+    def from_manifest(cls, manifest, logger: Callable[[str, str], None] = None) -> 'WorkspaceContext':
+        """
+        Get the context for an already resolved manifest.
+
+        West resolves the manifest before running extension commands, so commands
+        should pass their self.manifest here instead of loading it again.
+        """
+        workspace_root = os.path.abspath(manifest.topdir)
+        context = cls._instances.get(workspace_root)
+        if context is None or context.manifest is not manifest:
+            manifest_dir = os.path.dirname(manifest.path)
+            projects = list(manifest.projects)
+            active = {p.name: manifest.is_active(p) for p in projects}
+            group_filter = list(getattr(manifest, 'group_filter', None) or [])
+            context = cls(workspace_root, manifest_dir, projects, active, group_filter, manifest, logger)
+            cls._instances[workspace_root] = context
+        return context
+
+    @classmethod
+    def from_topdir(cls, topdir: Optional[str] = None,
+                    logger: Callable[[str, str], None] = None) -> 'WorkspaceContext':
+        """Get the context for a workspace, resolving its manifest at most once per process."""
+        if topdir is not None:
+            context = cls._instances.get(os.path.abspath(topdir))
+            if context is not None:
+                return context
+
+        from west.manifest import Manifest
+
+        if logger:
+            logger(f"Resolving west manifest for workspace: {topdir or os.getcwd()}", 'dbg')
+        manifest = Manifest.from_topdir(topdir=topdir)
+        return cls.from_manifest(manifest, logger)
+
+    @staticmethod
+    def normalize_path(path: str) -> str:
+        """Normalize a project path for lookups (posix separators, no trailing slash)."""
+        return path.replace('\\', '/').strip('/')
+
+    def get_project(self, name: str):
+        """Get a project by name, or None if it is not defined in the manifest."""
+        return self.projects_by_name.get(name)
+
+    def get_project_by_path(self, path: str):
+        """Get a project by its workspace-relative path, or None if no project has that path."""
+        return self.projects_by_path.get(self.normalize_path(path))
+
+    def get_revision(self, name: str) -> Optional[str]:
+        """Get the manifest revision of a project, or None if the project is not defined."""
+        project = self.projects_by_name.get(name)
+        return project.revision if project is not None else None
+
+    def is_active(self, project: Any) -> bool:
+        """Check whether a project (object or name) is enabled by the group-filter."""
+        name = project if isinstance(project, str) else project.name
+        return self._active.get(name, False)
+
+    def get_projects(self, names: List[str], active_only: bool = False) -> List:
+        """Get projects matching the given names, in manifest order."""
+        wanted = set(names)
+        return [p for p in self.projects
+                if p.name in wanted and (not active_only or self._active.get(p.name, False))]